@@ -1,23 +1,26 @@
 #!/usr/bin/env python3
 
 import os
-import pickle
 import time
+from collections import Counter
 from pathlib import Path
 
 import numpy as np
 
-from crossword.objects import Crossword
+from benchmark.word_list import INDEX_PATH, save_index
+from crossword.objects import Crossword, WordList
 from crossword.solver import Solver
 
 DIRECTORY = "benchmark"
 
 start = time.perf_counter()
 
-word_list_cache = Path(DIRECTORY, f"./benchmark_word_list.pkl")
+word_list_cache = INDEX_PATH
+if not word_list_cache.exists():
+    print(f"Building WordList cache {word_list_cache}")
+    save_index(word_list_cache)
 print(f"Loading WordList from cache {word_list_cache}")
-with word_list_cache.open('rb') as f:
-        word_list = pickle.load(f)
+word_list = WordList.from_file(word_list_cache)
 
 print(f"  WordList in {round(-start + (time.perf_counter()), 2)}s")
 
@@ -34,6 +37,7 @@ crossword_unsolvable.build_possibility_matrix(word_list)
 solver = Solver()
 times_to_solve: dict[Crossword, float] = {}
 scores: dict[Crossword, float] = {}
+stop_reasons: dict[Crossword, Counter[str]] = {}
 
 solved_time = 0.0
 avg_score = 0.0
@@ -41,19 +45,22 @@ unsolvable_time = 0.0
 for crossword in [crossword_solvable, crossword_unsolvable]:
     times_to_solve[crossword] = []
     scores[crossword] = []
+    stop_reasons[crossword] = Counter()
     for i in range(20):
         crossword.reset()
         crossword.build_possibility_matrix(word_list)
 
         start = time.perf_counter()
-        word_spaces = solver.solve(crossword, word_list, randomize=1.0, max_failed_words=200)
+        result = solver.solve(crossword, word_list, randomize=1.0, max_failed_words=200)
         time_to_solve = -start + (time.perf_counter())
         times_to_solve[crossword].append(time_to_solve)
-        scores[crossword].append(solver.score)
-        if crossword == crossword_solvable:
-            assert(crossword.is_success())
+        scores[crossword].append(result.score)
+        stop_reasons[crossword][result.reason.value] += 1
 
+    print(f"  {crossword.grid_file.stem} stopped: {dict(stop_reasons[crossword])}")
     valid_scores = [s for s in scores[crossword] if s is not None]
+    if crossword == crossword_solvable:
+        assert len(valid_scores) > 0, f"{crossword.grid_file.stem} was not solved"
     if len(valid_scores) > 0:
         solved_time = round(np.mean(times_to_solve[crossword]), 3)
         avg_score = np.mean(valid_scores)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from crossword.objects import WordList
+from crossword.objects.language import alphabet_set
+
+LANGUAGE = 'cs'
+DICTIONARY = Path("input", "Czech.dic")
+INDEX_PATH = Path("benchmark", "benchmark_word_list.idx")
+
+
+def build_word_list() -> WordList:
+    """Build the WordList of the stems of the dictionary."""
+    start = time.perf_counter()
+    allowed_characters = alphabet_set(LANGUAGE, only_characters=True)
+    with DICTIONARY.open('r', encoding='utf-8') as dictionary_file:
+        labels = sorted({
+            stem for stem in (line.split('/')[0].strip().lower() for line in dictionary_file)
+            if stem and all(char in allowed_characters for char in stem)
+        })
+
+    words_df = pd.DataFrame({
+        'word_label_text': labels,
+        'word_description_text': labels,
+        'word_concept_id': range(len(labels)),
+    })
+    print(f"  words_df {words_df.shape} loaded in {round(-start + (time.perf_counter()), 2)}s")
+
+    start = time.perf_counter()
+    word_list = WordList(words_df=words_df, language=LANGUAGE)
+    print(f"  WordList built in {round(-start + (time.perf_counter()), 2)}s")
+    return word_list
+
+
+def save_index(index_path: Path = INDEX_PATH) -> None:
+    """Build the WordList and store its index where the benchmark opens it."""
+    word_list = build_word_list()
+    start = time.perf_counter()
+    word_list.save(index_path)
+    print(f"  WordList saved to {index_path} in {round(-start + (time.perf_counter()), 2)}s")
+
+
+if __name__ == "__main__":
+    save_index()
+
+    start = time.perf_counter()
+    WordList.from_file(INDEX_PATH)
+    print(f"  WordList opened in {round(-start + (time.perf_counter()), 4)}s")
@@ -0,0 +1,82 @@
+"""
+Module: bitmap
+Packed bitmaps of word rows, stored as little-endian 64-bit words (bit i of the bitmap is bit i % 64 of word i // 64).
+"""
+import numpy as np
+import numpy.typing as npt
+
+Bitmap = npt.NDArray[np.uint64]  # type: ignore
+
+
+def pack(flags: npt.NDArray[np.bool_]) -> Bitmap:
+    """
+    Pack boolean flags along the last axis to bitmaps.
+
+    Args:
+        flags: boolean array, the last axis being the rows
+
+    Returns:
+        uint64 array with the last axis of ceil(rows / 64) words
+    """
+    packed = np.packbits(flags, axis=-1, bitorder='little')
+    word_bytes = -(-packed.shape[-1] // 8) * 8  # type: ignore
+    padded = np.zeros(packed.shape[:-1] + (word_bytes,), dtype=np.uint8)  # type: ignore
+    padded[..., :packed.shape[-1]] = packed
+    return padded.view(np.dtype('<u8')).astype(np.uint64, copy=False)
+
+
+def bit_indices(words: Bitmap, word_positions: npt.NDArray[np.intp]) -> npt.NDArray[np.intp]:
+    """
+    Sorted indices of set bits.
+
+    Args:
+        words: words of a bitmap
+        word_positions: position of each of the words in the bitmap
+
+    Returns:
+        Indices of the set bits, ascending
+    """
+    bits = np.unpackbits(words.astype(np.dtype('<u8'), copy=False).view(np.uint8), bitorder='little')
+    set_bits = bits.nonzero()[0]
+    return word_positions[set_bits >> 6] * 64 + (set_bits & 63)  # type: ignore
+
+
+def and_indices(bitmaps: Bitmap) -> npt.NDArray[np.intp]:
+    """
+    Indices of bits set in all the bitmaps.
+
+    Args:
+        bitmaps: (bitmaps x words) array, ordered from the sparsest bitmap
+
+    Returns:
+        Indices of the set bits, ascending
+    """
+    # Only the non-empty words of the sparsest bitmap can have a bit set in the result
+    word_positions = bitmaps[0].nonzero()[0]  # type: ignore
+    words = np.bitwise_and.reduce(bitmaps[:, word_positions], axis=0)  # type: ignore
+    return bit_indices(words, word_positions)  # type: ignore
+
+
+def empty(size: int) -> Bitmap:
+    """Returns the bitmap of size bits, none of them set."""
+    return np.zeros(-(-size // 64), dtype=np.uint64)
+
+
+def set_bit(words: Bitmap, index: int) -> None:
+    """Set the bit of the index in place."""
+    words[index >> 6] |= np.uint64(1) << np.uint64(index & 63)  # type: ignore
+
+
+def unset_bits(words: Bitmap, indices: npt.NDArray[np.intp]) -> npt.NDArray[np.bool_]:
+    """
+    Flags of the indices whose bits are not set.
+
+    Args:
+        words: words of a bitmap
+        indices: bit indices to test, any order
+
+    Returns:
+        Boolean array, True for the indices whose bits are not set
+    """
+    bits = np.left_shift(np.uint64(1), (indices & 63).astype(np.uint64))  # type: ignore
+    return np.bitwise_and(~words[indices >> 6], bits) != 0  # type: ignore
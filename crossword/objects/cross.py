@@ -75,6 +75,13 @@ class Cross:
             return None
         return self.word_space_vertical.my_char_on_cross(self)
 
+    def update_patterns(self) -> None:
+        """Set the char bound to this cross in the patterns of both word spaces."""
+        assert self.word_space_horizontal is not None and self.word_space_vertical is not None
+        char = self.bound_value()
+        self.word_space_horizontal.pattern.set_char(self.index_in_horizontal, char)
+        self.word_space_vertical.pattern.set_char(self.index_in_vertical, char)
+
     def is_fully_bound(self) -> bool:
         """Returns True if both word spaces are bound to this cross."""
         return self.bound_value_left() is not None and self.bound_value_right() is not None
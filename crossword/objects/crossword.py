@@ -7,6 +7,8 @@ from typing import Optional
 
 import numpy as np
 
+from .snapshot import CrosswordSnapshot
+from .topology import Topology
 from .word_list import WordList
 from .word_space import Direction, WordSpace
 
@@ -74,6 +76,28 @@ class Crossword:
         """Returns a deep copy of the crossword."""
         return copy.deepcopy(self)
 
+    def snapshot(self, score=None) -> CrosswordSnapshot:
+        """Returns the words bound to the word spaces as word indices, a compact alternative to get_copy."""
+        return CrosswordSnapshot.capture(self.word_spaces, score)  # type: ignore
+
+    def restore(self, snapshot: CrosswordSnapshot, word_list: WordList) -> None:
+        """Bind the words of the snapshot instead of the bound ones, the possibilities are not updated."""
+        words = snapshot.words(self.word_spaces, word_list)
+        self.reset()
+        for word_space, word in zip(self.word_spaces, words):
+            if word is not None:
+                word_space.bind(word)
+
+    def snapshot_json(self, snapshot: CrosswordSnapshot, word_list: WordList):
+        """Exports the words of the snapshot as as_json(export_occupied_by=True) would once they are restored."""
+        words = snapshot.words(self.word_spaces, word_list)
+        return {
+            'width': self.width,
+            'height': self.height,
+            'word_spaces': [word_space.to_json_with(word, export_occupied_by=True)
+                            for word_space, word in zip(self.word_spaces, words)]
+        }
+
     @staticmethod
     def from_grid(crossword_grid_file: Path) -> 'Crossword':
         """Creates a Crossword object from a grid file."""
@@ -180,6 +204,16 @@ class Crossword:
             word_space_pair[0].add_cross(word_space_pair[1])
             word_space_pair[1].add_cross(word_space_pair[0])
 
+    def topology(self) -> Topology:
+        """Returns the compiled crosses of the word spaces, compiled again if a cross was added since."""
+        links = [word_space.links for word_space in self.word_spaces]
+        topology = links[0].topology if links and links[0] is not None else None
+        if topology is None or len(topology.word_spaces) != len(links) or \
+                any(link is None or link.topology is not topology or link.index != index
+                    for index, link in enumerate(links)):
+            return Topology.compile(self.word_spaces).attach()
+        return topology
+
     def is_success(self):
         """Check if all word spaces are occupied by words."""
         for ws in self.word_spaces:
@@ -189,10 +223,16 @@ class Crossword:
 
     def evaluate_score(self):
         """Evaluate scores of all word spaces."""
+        words = [ws.occupied_by for ws in self.word_spaces]
+        word_list = words[0].word_list if words else None
+        if word_list is not None and all(word.word_list is word_list for word in words):
+            # Words of a single word list, gather their scores at once
+            return float(word_list.word_scores(np.array([word.index for word in words])).sum())
+
         score = 0
-        for ws in self.word_spaces:
-            if not np.isnan(ws.occupied_by.get_score()):
-                score += ws.occupied_by.get_score()
+        for word in words:
+            if not np.isnan(word.get_score()):
+                score += word.get_score()
         return score
 
     def reset(self):
@@ -201,8 +241,17 @@ class Crossword:
             word_space.unbind()
             word_space.reset_failed_words()
 
+    def word_lengths(self) -> set[int]:
+        """Returns the lengths of the word spaces."""
+        return {word_space.length for word_space in self.word_spaces}
+
+    def preload(self, word_list: WordList) -> None:
+        """Load the indexes of the word list for exactly the word lengths of the crossword."""
+        word_list.length_indexes.preload(self.word_lengths())
+
     def build_possibility_matrix(self, word_list: WordList) -> None:
         """Builds the possibility matrix for each word space using the provided word list."""
+        self.preload(word_list)
         for word_space in self.word_spaces:
             word_space.build_possibility_matrix(word_list)
 
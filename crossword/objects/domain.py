@@ -0,0 +1,95 @@
+"""
+Module: domain
+Defines the Domain class, the candidate words of a word space maintained incrementally with an undo trail.
+"""
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from .bitmap import Bitmap
+from .length_index import LengthIndex
+from .pattern import Pattern
+from .word_list import WordList
+
+
+def _extends(chars: list[Optional[str]], previous_chars: list[Optional[str]]) -> bool:
+    """Returns True if all the previous chars are bound on the same positions in chars."""
+    return all(previous is None or previous == char for previous, char in zip(previous_chars, chars))
+
+
+class Domain:
+    """
+    Rows of the LengthIndex matching the pattern of a word space, as a bitmap.
+
+    Binding chars narrows the bitmap by the position bitmaps of the new chars, the previous state is pushed
+    to the trail together with the possibility matrix of the word space. Unbinding them pops the trail,
+    so backtracking restores the candidates and the possibility matrix without recomputing them.
+    """
+
+    def __init__(self) -> None:
+        self.length_index: Optional[LengthIndex] = None
+        # Chars of the pattern the rows match, None before the first update
+        self.chars: Optional[list[Optional[str]]] = None
+        self.rows: Optional[Bitmap] = None
+        # Previous states, each of them extended by the next one: chars, rows and the possibility matrix
+        self.trail: list[tuple[list[Optional[str]], Bitmap, npt.NDArray[np.int32]]] = []
+
+    def reset(self) -> None:
+        """Forget the rows and the trail."""
+        self.length_index = None
+        self.chars = None
+        self.rows = None
+        self.trail = []
+
+    def restore(self, length_index: LengthIndex, length: int, rows: Bitmap) -> None:
+        """Start from the rows of the unbound pattern of the length, forgetting the trail."""
+        self.length_index = length_index
+        self.chars = [None] * length
+        self.rows = rows
+        self.trail = []
+
+    def update(self, pattern: Pattern, word_list: WordList,
+               possibility_matrix: npt.NDArray[np.int32]) -> Optional[npt.NDArray[np.int32]]:
+        """
+        Move the domain to the pattern.
+
+        Args:
+            pattern: current pattern of the word space
+            word_list: word list the rows belong to
+            possibility_matrix: possibility matrix of the word space at the previous update
+
+        Returns:
+            Possibility matrix of the pattern if it is unchanged or restored from the trail,
+            None if the rows were narrowed and the possibility matrix has to be updated
+        """
+        length_index = word_list.length_index(len(pattern.chars))
+        if length_index is not self.length_index:
+            self.reset()
+            self.length_index = length_index
+
+        # Unbinding, pop the states with chars that are not bound anymore
+        while self.chars is not None and not _extends(pattern.chars, self.chars):
+            if self.trail:
+                self.chars, self.rows, possibility_matrix = self.trail.pop()
+            else:
+                self.chars, self.rows = None, None
+        if self.chars == pattern.chars:
+            return possibility_matrix
+
+        # Binding, narrow the rows by the chars bound since
+        if self.chars is None or self.rows is None:
+            previous_chars: list[Optional[str]] = [None] * len(pattern.chars)
+            rows = length_index.all_rows()
+        else:
+            self.trail.append((self.chars, self.rows, possibility_matrix))
+            previous_chars, rows = self.chars, self.rows
+        positions = [index for index, (previous, char) in enumerate(zip(previous_chars, pattern.chars))
+                     if previous is None and char is not None]
+        char_codes = [word_list.char_to_index.get(pattern.chars[index] or '', -1) for index in positions]
+        if min(char_codes, default=0) < 0:
+            rows = np.zeros_like(rows)
+        else:
+            rows = length_index.narrow(rows, positions, char_codes)
+        self.chars, self.rows = list(pattern.chars), rows
+        return None
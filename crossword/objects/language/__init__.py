@@ -1,3 +1,4 @@
 from .alphabet import alphabet, alphabet_set
-from .split import split
+from .hunspell import Affixes, hunspell_words, read_dictionary
+from .split import split, split_codes
 from .suitability import is_crossword_suitable
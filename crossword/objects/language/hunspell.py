@@ -0,0 +1,174 @@
+"""
+Module: hunspell
+Reads Hunspell dictionaries (.dic word stems with affix flags and the .aff affix rules) entry by entry,
+expanding the affix flags to the word forms on the fly.
+
+Prefixes, suffixes and their cross product are supported. Continuation classes of affixes (twofold affixes),
+compounding and morphological fields are ignored.
+"""
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .suitability import is_crossword_suitable
+
+
+@dataclass(frozen=True)
+class AffixRule:
+    """Replaces strip by add on the word boundary of words matching the condition."""
+    strip: str
+    add: str
+    condition: re.Pattern[str]
+
+
+@dataclass(frozen=True)
+class AffixClass:
+    """Affix rules of a single flag."""
+    is_prefix: bool
+    cross_product: bool
+    rules: tuple[AffixRule, ...]
+
+    def apply(self, word: str) -> Iterator[str]:
+        """Yields the word forms of every rule applicable to the word."""
+        for rule in self.rules:
+            if rule.condition.search(word) is None:
+                continue
+            if self.is_prefix and word.startswith(rule.strip):
+                yield rule.add + word[len(rule.strip):]
+            elif not self.is_prefix and word.endswith(rule.strip):
+                yield word[:len(word) - len(rule.strip)] + rule.add
+
+
+@dataclass(frozen=True)
+class Affixes:
+    """Affix classes of a Hunspell .aff file by their flag."""
+    encoding: str
+    flag_type: str
+    classes: dict[str, AffixClass]
+
+    @staticmethod
+    def read(path: Path) -> 'Affixes':
+        """
+        Read a Hunspell .aff file.
+
+        Raises:
+            ValueError: If an affix rule is malformed.
+        """
+        encoding = Affixes._encoding(path)
+        flag_type = 'char'
+        headers: dict[str, tuple[bool, bool]] = {}
+        rules: dict[str, list[AffixRule]] = {}
+        with path.open('r', encoding=encoding) as aff_file:
+            for line in aff_file:
+                fields = line.split('#', 1)[0].split() if not line.startswith('#') else []
+                if len(fields) >= 2 and fields[0] == 'FLAG':
+                    flag_type = fields[1]
+                if len(fields) < 4 or fields[0] not in ('PFX', 'SFX'):
+                    continue
+                is_prefix, flag = fields[0] == 'PFX', fields[1]
+                if flag not in headers:
+                    # The first line of a class: PFX flag cross_product rule_count
+                    headers[flag] = (is_prefix, fields[2] == 'Y')
+                    rules[flag] = []
+                    continue
+                if len(fields) < 5:
+                    raise ValueError(f"Malformed affix rule in {path}: {line.strip()}")
+                rules[flag].append(Affixes._rule(is_prefix, fields[2], fields[3], fields[4]))
+
+        return Affixes(encoding, flag_type, {
+            flag: AffixClass(is_prefix, cross_product, tuple(rules[flag]))
+            for flag, (is_prefix, cross_product) in headers.items()
+        })
+
+    @staticmethod
+    def _encoding(path: Path) -> str:
+        """Returns the encoding of the .aff file (and its .dic file) given by the SET option."""
+        with path.open('r', encoding='latin-1') as aff_file:
+            for line in aff_file:
+                fields = line.split()
+                if len(fields) >= 2 and fields[0] == 'SET':
+                    return fields[1]
+        return 'utf-8'
+
+    @staticmethod
+    def _rule(is_prefix: bool, strip: str, add: str, condition: str) -> AffixRule:
+        # '0' stands for an empty string, continuation classes after '/' are not supported
+        add = add.split('/', 1)[0]
+        return AffixRule(
+            strip='' if strip == '0' else strip,
+            add='' if add == '0' else add,
+            condition=re.compile(f'^(?:{condition})' if is_prefix else f'(?:{condition})$'),
+        )
+
+    def split_flags(self, flags: str) -> list[str]:
+        """Split the flags of a .dic entry according to the FLAG option."""
+        if self.flag_type == 'long':
+            return [flags[index:index + 2] for index in range(0, len(flags), 2)]
+        if self.flag_type == 'num':
+            return flags.split(',')
+        return list(flags)
+
+    def expand(self, stem: str, flags: str) -> list[str]:
+        """Returns the stem and all its forms given by the flags, without duplicates."""
+        affix_classes = [self.classes[flag] for flag in self.split_flags(flags) if flag in self.classes]
+        forms = [stem]
+        cross_suffixed = []
+        for affix_class in affix_classes:
+            if not affix_class.is_prefix:
+                for form in affix_class.apply(stem):
+                    forms.append(form)
+                    if affix_class.cross_product:
+                        cross_suffixed.append(form)
+        for affix_class in affix_classes:
+            if affix_class.is_prefix:
+                forms.extend(affix_class.apply(stem))
+                if affix_class.cross_product:
+                    for suffixed in cross_suffixed:
+                        forms.extend(affix_class.apply(suffixed))
+        return list(dict.fromkeys(forms))  # type: ignore
+
+
+def read_dictionary(dic_path: Path, encoding: str = 'utf-8') -> Iterator[tuple[str, str]]:
+    """
+    Reads a Hunspell .dic file entry by entry.
+
+    Args:
+        dic_path: .dic file
+        encoding: encoding of the file, given by the .aff file
+
+    Returns:
+        Iterator of tuples (stem, affix flags)
+    """
+    with dic_path.open('r', encoding=encoding) as dic_file:
+        for line_number, line in enumerate(dic_file):
+            fields = line.split()
+            # The first line may hold the approximate number of entries
+            if len(fields) == 0 or (line_number == 0 and fields[0].isdigit()):
+                continue
+            stem, _, flags = fields[0].replace('\\/', '\0').partition('/')
+            yield stem.replace('\0', '/'), flags
+
+
+def hunspell_words(dic_path: Path, aff_path: Optional[Path], locale_code: str,
+                   max_length: int = 20) -> Iterator[tuple[str, str, int]]:
+    """
+    Reads the crossword suitable words of a Hunspell dictionary, lazily entry by entry.
+
+    Args:
+        dic_path: .dic file
+        aff_path: .aff file, None to read only the stems
+        locale_code: ISO 639-1 language specification (e.g. 'en', 'cs')
+        max_length: maximal number of atoms of a word, see is_crossword_suitable
+
+    Returns:
+        Iterator of tuples (word label, description, concept id), the description is the stem and the concept id
+        is the number of the entry, so all forms of a stem share them
+    """
+    affixes = Affixes.read(aff_path) if aff_path is not None else None
+    entries = read_dictionary(dic_path, affixes.encoding if affixes is not None else 'utf-8')
+    for concept_id, (stem, flags) in enumerate(entries):
+        forms = affixes.expand(stem, flags) if affixes is not None else [stem]
+        for form in forms:
+            if is_crossword_suitable(form, locale_code, max_length):
+                yield form, stem, concept_id
@@ -1,9 +1,69 @@
-from typing import List, Union
+import re
+from typing import Dict, Iterable, List, Tuple
 
-from .alphabet import alphabet
+import numpy as np
+import numpy.typing as npt
 
+from .alphabet import Memoize, alphabet
 
-def split(word: str, locale_code: str) -> Union[List[str]]:
+# Joins words for the bulk split, it is not a letter of any alphabet
+WORD_SEPARATOR = '\n'
+
+
+class Splitter:
+    """
+    Splits words to the locale alphabet atoms, longest atom first (e.g. Czech 'ch' before 'c').
+    """
+
+    def __init__(self, locale_code: str):
+        self.alphabet = alphabet(locale_code)
+        self.codes: Dict[str, int] = {char: code for code, char in enumerate(self.alphabet)}
+        # Alternatives are tried in order, so the longest atoms go first
+        atoms = sorted(self.alphabet, key=len, reverse=True)
+        self.pattern = re.compile('|'.join(re.escape(atom) for atom in atoms))
+        self.bulk_pattern = re.compile('|'.join([re.escape(atom) for atom in atoms] + [WORD_SEPARATOR]))
+
+    def split(self, word: str) -> List[str]:
+        """Split one word, see split."""
+        word_characters: List[str] = self.pattern.findall(word)
+        # findall skips unknown letters, so they are missing in the atoms
+        if sum(map(len, word_characters)) != len(word):
+            raise ValueError(f"Unknown letter encountered in word: {word[self._known_prefix(word):]}")
+        return word_characters
+
+    def split_codes(self, words: Iterable[str]) -> Tuple[npt.NDArray[np.int16], npt.NDArray[np.int32]]:
+        """Split many words at once, see split_codes."""
+        words = list(words)
+        if len(words) == 0:
+            return np.zeros(0, dtype=np.int16), np.zeros(0, dtype=np.int32)
+        text = WORD_SEPARATOR.join(words)
+        atoms: List[str] = self.bulk_pattern.findall(text)
+        if sum(map(len, atoms)) != len(text) or atoms.count(WORD_SEPARATOR) != len(words) - 1:
+            # Raise the error of the first word with an unknown letter
+            for word in words:
+                self.split(word)
+
+        codes = np.fromiter((self.codes.get(atom, -1) for atom in atoms), dtype=np.int16, count=len(atoms))  # type: ignore
+        # Separators delimit the words, the first word starts at -1 and the last one ends past the end
+        separators = np.concatenate([[-1], np.flatnonzero(codes < 0), [len(codes)]])
+        lengths = (np.diff(separators) - 1).astype(np.int32)  # type: ignore
+        return codes[codes >= 0], lengths
+
+    def _known_prefix(self, word: str) -> int:
+        """Length of the word prefix made of alphabet atoms."""
+        position = 0
+        while (match := self.pattern.match(word, position)) is not None:
+            position = match.end()
+        return position
+
+
+@Memoize
+def splitter(locale_code: str) -> Splitter:
+    """Returns the splitter of the locale, it is built once per locale."""
+    return Splitter(locale_code)
+
+
+def split(word: str, locale_code: str) -> List[str]:
     """
     Split one word according to locale alphabet
 
@@ -12,17 +72,26 @@ def split(word: str, locale_code: str) -> Union[List[str]]:
         locale_code: ISO 639-1 language specification (e.g. 'en', 'cs')
 
     Returns:
-        List of locale own language atoms (characters) or False if unknown letter encoutered
+        List of locale own language atoms (characters)
+
+    Raises:
+        ValueError: If an unknown letter is encountered
+    """
+    return splitter(locale_code).split(word)
+
+
+def split_codes(words: Iterable[str], locale_code: str) -> Tuple[npt.NDArray[np.int16], npt.NDArray[np.int32]]:
+    """
+    Split many words according to locale alphabet
+
+    Args:
+        words: strings to split, e.g. a pandas Series
+        locale_code: ISO 639-1 language specification (e.g. 'en', 'cs')
+
+    Returns:
+        Alphabet indices of the atoms of all words one after another, and the number of atoms of every word
+
+    Raises:
+        ValueError: If an unknown letter is encountered
     """
-    word_characters = []
-    while len(word) > 0:
-        found_match = False
-        for alphabet_char in sorted(alphabet(locale_code), key=len, reverse=True):
-            if word.startswith(alphabet_char):
-                word_characters.append(alphabet_char)
-                word = word[len(alphabet_char):]
-                found_match = True
-                break
-        if not found_match:
-            raise ValueError(f"Unknown letter encountered in word: {word}")
-    return word_characters
+    return splitter(locale_code).split_codes(words)
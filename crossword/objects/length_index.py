@@ -0,0 +1,172 @@
+"""
+Module: length_index
+Defines the LengthIndex class holding the words of a single length and their positional index,
+and LengthIndexes, the length indexes of a WordList loaded on first access.
+"""
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Mapping, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from .bitmap import Bitmap, and_indices, bit_indices, pack
+
+
+@dataclass(frozen=True)
+class LengthIndex:
+    """
+    Words of a single length as rows of a character code matrix, with a positional bitmap index over the rows.
+    """
+    # Word index (row of the words DataFrame) of every row
+    word_indices: npt.NDArray[np.int32]
+    # (rows x length) alphabet indices of the characters
+    char_matrix: npt.NDArray[np.int16]
+    # (length x alphabet x rows/64) bitmaps, [position, char] has bit i set if row i has the char on the position
+    position_bitmaps: Bitmap
+    # (length x alphabet) number of rows having the char on the position
+    position_counts: npt.NDArray[np.int32]
+    # (length x alphabet x length x alphabet) [bound position, bound char, position, char] number of rows
+    # having both chars on their positions
+    pair_counts: npt.NDArray[np.int32]
+
+    @staticmethod
+    def build(word_indices: npt.NDArray[np.int32], char_matrix: npt.NDArray[np.int16],
+              alphabet_length: int) -> 'LengthIndex':
+        """Build the positional index of the char matrix rows."""
+        word_indices.flags.writeable = False
+        return LengthIndex(
+            word_indices=word_indices,
+            char_matrix=char_matrix,
+            position_bitmaps=LengthIndex.pack_positions(char_matrix, alphabet_length),
+            position_counts=LengthIndex.count_positions(char_matrix, alphabet_length),
+            pair_counts=LengthIndex.count_pairs(char_matrix, alphabet_length),
+        )
+
+    # The parts of the index are built by the following methods, so they can be built from chunks of rows as well.
+    # Counts of chunks add up, bitmaps of chunks of a multiple of 64 rows are concatenated along the last axis.
+
+    @staticmethod
+    def pack_positions(char_matrix: npt.NDArray[np.int16], alphabet_length: int) -> Bitmap:
+        """Returns the (length x alphabet x rows/64) position bitmaps of the char matrix rows."""
+        alphabet_codes = np.arange(alphabet_length, dtype=np.int16)
+        # (position, char, row) one-hot flags, packed along the rows
+        return np.stack([
+            pack(char_matrix[:, char_index] == alphabet_codes[:, np.newaxis])  # type: ignore
+            for char_index in range(char_matrix.shape[1])
+        ])
+
+    @staticmethod
+    def count_positions(char_matrix: npt.NDArray[np.int16], alphabet_length: int) -> npt.NDArray[np.int32]:
+        """Returns the (length x alphabet) counts of the chars on every position of the char matrix rows."""
+        return np.stack([
+            np.bincount(char_matrix[:, char_index], minlength=alphabet_length)  # type: ignore
+            for char_index in range(char_matrix.shape[1])
+        ]).astype(np.int32)
+
+    @staticmethod
+    def count_pairs(char_matrix: npt.NDArray[np.int16], alphabet_length: int) -> npt.NDArray[np.int32]:
+        """Returns the (length x alphabet x length x alphabet) counts of pairs of chars of the char matrix rows."""
+        word_len = char_matrix.shape[1]
+        char_codes = char_matrix.astype(np.intp)
+        # Flat (position, char) key of every char of the matrix
+        position_keys = np.arange(word_len) * alphabet_length + char_codes  # type: ignore
+        return np.stack([
+            np.bincount(
+                (char_codes[:, bound_index, np.newaxis] * (word_len * alphabet_length) + position_keys).ravel(),  # type: ignore
+                minlength=alphabet_length * word_len * alphabet_length  # type: ignore
+            ).reshape((alphabet_length, word_len, alphabet_length))  # type: ignore
+            for bound_index in range(word_len)
+        ]).astype(np.int32)
+
+    def rows_matching(self, positions: npt.NDArray[np.intp], char_codes: npt.NDArray[np.intp]) -> npt.NDArray[np.intp]:
+        """
+        Returns rows that have the chars on the positions.
+        """
+        # Intersect from the rarest (position, char) pair
+        by_count = np.argsort(self.position_counts[positions, char_codes])
+        return and_indices(self.position_bitmaps[positions[by_count], char_codes[by_count]])
+
+    def all_rows(self) -> Bitmap:
+        """Returns the bitmap of all rows."""
+        return pack(np.ones(len(self.word_indices), dtype=np.bool_))
+
+    def narrow(self, rows: Bitmap, positions: list[int], char_codes: list[int]) -> Bitmap:
+        """Returns the bitmap of the rows that also have the chars on the positions."""
+        for position, char_code in zip(positions, char_codes):
+            rows = rows & self.position_bitmaps[position, char_code]  # type: ignore
+        return rows
+
+    @staticmethod
+    def bitmap_rows(rows: Bitmap) -> npt.NDArray[np.intp]:
+        """Returns the rows set in the bitmap, ascending."""
+        word_positions = rows.nonzero()[0]  # type: ignore
+        return bit_indices(rows[word_positions], word_positions)  # type: ignore
+
+    def precomputed_counts(self, positions: npt.NDArray[np.intp], char_codes: npt.NDArray[np.intp],
+                           char_indices: npt.NDArray[np.intp]) -> Optional[npt.NDArray[np.int32]]:
+        """
+        Returns (char indices x alphabet) counts of the chars on char_indices of rows that have the chars
+        on the positions, None if more than one position is bound.
+        """
+        if len(positions) == 0:
+            return self.position_counts[char_indices]
+        if len(positions) == 1:
+            return self.pair_counts[positions[0], char_codes[0], char_indices]  # type: ignore
+        return None
+
+    def char_counts(self, rows: npt.NDArray[np.intp], char_indices: npt.NDArray[np.intp]) -> npt.NDArray[np.int32]:
+        """
+        Returns (char indices x alphabet) counts of the chars on char_indices of the rows.
+        """
+        alphabet_length = self.position_counts.shape[1]
+        # Offset the codes of every char index to its own block, so a single bincount counts all of them
+        codes = self.char_matrix[rows[:, np.newaxis], char_indices] + np.arange(len(char_indices)) * alphabet_length  # type: ignore
+        return np.bincount(
+            codes.ravel(),  # type: ignore
+            minlength=len(char_indices) * alphabet_length  # type: ignore
+        ).reshape((len(char_indices), alphabet_length)).astype(np.int32)
+
+
+class LengthIndexes(Mapping[int, LengthIndex]):
+    """
+    Length indexes by the word length, each one is loaded on its first access.
+    A grid uses only a few word lengths, the indexes of the others take neither memory nor time to build.
+    """
+
+    def __init__(self, lengths: Iterable[int], load: Callable[[int], LengthIndex]):
+        """
+        Args:
+            lengths: word lengths of the words
+            load: returns the index of a word length
+        """
+        self.lengths = frozenset(lengths)
+        self._load = load
+        self._loaded: dict[int, LengthIndex] = {}
+
+    def __getitem__(self, length: int) -> LengthIndex:
+        length_index = self._loaded.get(length)
+        if length_index is None:
+            if length not in self.lengths:
+                raise KeyError(length)
+            length_index = self._loaded[length] = self._load(length)
+        return length_index
+
+    def __contains__(self, length: object) -> bool:
+        # Without loading the index, unlike Mapping.__contains__
+        return length in self.lengths
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(sorted(self.lengths))
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def loaded(self) -> list[int]:
+        """Returns the word lengths of the loaded indexes."""
+        return sorted(self._loaded)
+
+    def preload(self, lengths: Iterable[int]) -> None:
+        """Load the indexes of the word lengths, lengths without words are skipped."""
+        for length in self.lengths.intersection(lengths):
+            if length not in self._loaded:
+                self._loaded[length] = self._load(length)
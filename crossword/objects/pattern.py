@@ -0,0 +1,66 @@
+"""
+Module: pattern
+Defines the Pattern class, bound characters of a word space kept as a compact hashable key.
+
+The key is a tuple of an int and the bound characters in position order. Bit i of the int is set when position i
+is bound, the highest set bit is the word length.
+"""
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from .mask import Mask
+from .word import Word
+
+PatternKey = tuple[int, tuple[str, ...]]
+
+
+def pattern_key(mask: Mask, chars: Word) -> PatternKey:
+    """Returns the key of the mask and the bound characters."""
+    bits = 1 << mask.length
+    for index, bound in enumerate(mask.mask):
+        if bound:
+            bits |= 1 << index
+    return bits, tuple(chars.char_list)
+
+
+def key_length(key: PatternKey) -> int:
+    """Returns the word length of the key."""
+    return key[0].bit_length() - 1
+
+
+def key_positions(key: PatternKey) -> npt.NDArray[np.intp]:
+    """Returns the bound positions of the key."""
+    bits, chars = key
+    return np.fromiter((index for index in range(key_length(key)) if bits >> index & 1),  # type: ignore
+                       dtype=np.intp, count=len(chars))
+
+
+class Pattern:
+    """
+    Bound characters of a word space, updated one position at a time.
+    The key is built once per change, so repeated lookups neither allocate nor hash strings.
+    """
+
+    def __init__(self, length: int):
+        self.chars: list[Optional[str]] = [None] * length
+        self.bits = 1 << length
+        self._key: Optional[PatternKey] = None
+
+    def set_char(self, index: int, char: Optional[str]) -> None:
+        """Bind the char to the position, None unbinds it."""
+        if self.chars[index] == char:
+            return
+        self.chars[index] = char
+        if char is None:
+            self.bits &= ~(1 << index)
+        else:
+            self.bits |= 1 << index
+        self._key = None
+
+    def key(self) -> PatternKey:
+        """Returns the key of the currently bound characters."""
+        if self._key is None:
+            self._key = (self.bits, tuple(char for char in self.chars if char is not None))
+        return self._key
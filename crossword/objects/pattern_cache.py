@@ -0,0 +1,98 @@
+"""
+Module: pattern_cache
+Defines the PatternCache class, a size-bounded cache of WordList lookup results.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable
+
+import numpy as np
+import numpy.typing as npt
+
+CacheValue = npt.NDArray[np.generic]  # type: ignore
+
+DEFAULT_MAX_BYTES = 64 * 2 ** 20
+# Estimated memory taken by an entry besides the array data (key, entry tuple, array header)
+ENTRY_OVERHEAD_BYTES = 256
+
+
+@dataclass
+class CacheStats:
+    """Counters of a PatternCache."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def hit_rate(self) -> float:
+        """Returns the share of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+
+class PatternCache:
+    """
+    Least recently used cache of arrays, bounded by the estimated memory of the entries.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        if max_bytes < 0:
+            raise ValueError(f"Cache size must not be negative, got {max_bytes}")
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.stats = CacheStats()
+        # Ordered from the least recently used, value and its size in bytes
+        self._entries: OrderedDict[Hashable, tuple[CacheValue, int]] = OrderedDict()
+
+    def get(self, key: Hashable, compute: Callable[[], CacheValue]) -> CacheValue:
+        """
+        Returns the cached value of the key, computes and caches it on a miss.
+        Cached arrays are read-only, as they are shared by all callers.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry[0]
+
+        self.stats.misses += 1
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def put(self, key: Hashable, value: CacheValue) -> None:
+        """Cache the value of the key, evicting the least recently used entries over the size limit."""
+        # Views of the index arrays take no memory of their own
+        size = ENTRY_OVERHEAD_BYTES + (value.nbytes if value.flags.owndata else 0)
+        if key in self._entries:
+            self.size_bytes -= self._entries.pop(key)[1]
+        if size > self.max_bytes:
+            return
+
+        value.flags.writeable = False
+        self._entries[key] = (value, size)
+        self.size_bytes += size
+        self._evict()
+
+    def resize(self, max_bytes: int) -> None:
+        """Change the size limit, evicting entries over it."""
+        if max_bytes < 0:
+            raise ValueError(f"Cache size must not be negative, got {max_bytes}")
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def clear(self) -> None:
+        """Remove all entries, the counters are kept."""
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def _evict(self) -> None:
+        while self.size_bytes > self.max_bytes:
+            _key, (_value, size) = self._entries.popitem(last=False)
+            self.size_bytes -= size
+            self.stats.evictions += 1
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
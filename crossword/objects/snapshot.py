@@ -0,0 +1,102 @@
+"""
+Module: snapshot
+Defines CrosswordSnapshot, the words of a crossword as word indices, and PropagationCache, the possibilities
+of unbound crosswords kept to be restored instead of rebuilt.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from .bitmap import Bitmap
+from .length_index import LengthIndexes
+from .word import Word
+from .word_list import WordList
+from .word_space import WordSpace
+
+
+@dataclass(frozen=True)
+class CrosswordSnapshot:
+    """Words bound to the word spaces of a crossword, as their indices in the word list, -1 if unbound."""
+    # Ids of the word spaces, in the order of the crossword
+    ids: tuple[str, ...]
+    word_indices: npt.NDArray[np.int32]
+    score: Optional[float] = None
+
+    @staticmethod
+    def capture(word_spaces: list[WordSpace], score: Optional[float] = None) -> 'CrosswordSnapshot':
+        """Returns the snapshot of the words bound to the word spaces."""
+        words = [word_space.occupied_by for word_space in word_spaces]
+        return CrosswordSnapshot(
+            ids=tuple(word_space.id() for word_space in word_spaces),
+            word_indices=np.array([word.index if word is not None else -1 for word in words],  # type: ignore
+                                  dtype=np.int32),
+            score=score
+        )
+
+    def words(self, word_spaces: list[WordSpace], word_list: WordList) -> list[Optional[Word]]:
+        """
+        Returns the words of the snapshot for the word spaces.
+
+        Raises:
+            ValueError: If the word spaces are not those of the snapshot.
+        """
+        if tuple(word_space.id() for word_space in word_spaces) != self.ids:
+            raise ValueError("Snapshot of different word spaces")
+        return [word_list.word(int(word_index)) if word_index >= 0 else None  # type: ignore
+                for word_index in self.word_indices.tolist()]  # type: ignore
+
+
+@dataclass(frozen=True)
+class PropagationState:
+    """Possibility matrices and candidate rows of the word spaces of an unbound crossword."""
+    length_indexes: LengthIndexes
+    possibility_matrices: list[npt.NDArray[np.int32]]
+    rows: list[Bitmap]
+
+
+class PropagationCache:
+    """
+    Least recently used states of unbound crosswords by their word spaces.
+
+    Possibilities depend on the chars of the words only, so a state is shared by the word lists
+    with the same length indexes, whatever their scores. Restoring a state takes O(#word spaces),
+    the matrices and the rows are shared, they are never changed in place.
+    """
+
+    def __init__(self, capacity: int = 32) -> None:
+        self.capacity = capacity
+        self.states: OrderedDict[tuple[str, ...], PropagationState] = OrderedDict()
+
+    def build(self, word_spaces: list[WordSpace], word_list: WordList) -> bool:
+        """
+        Unbind the word spaces and start them from the cached possibilities, build and cache them if missing.
+
+        Returns:
+            True if the possibilities were restored from the cache
+        """
+        key = tuple(word_space.id() for word_space in word_spaces)
+        for word_space in word_spaces:
+            word_space.unbind()
+            word_space.reset_failed_words()
+        state = self.states.get(key)
+        if state is not None and state.length_indexes is word_list.length_indexes:
+            self.states.move_to_end(key)
+            for word_space, possibility_matrix, rows in zip(word_spaces, state.possibility_matrices, state.rows):
+                word_space.restore_possibilities(word_list, possibility_matrix, rows)
+            return True
+
+        word_list.length_indexes.preload({word_space.length for word_space in word_spaces})
+        for word_space in word_spaces:
+            word_space.build_possibility_matrix(word_list)
+        self.states[key] = PropagationState(
+            length_indexes=word_list.length_indexes,
+            possibility_matrices=[word_space.possibility_matrix for word_space in word_spaces],  # type: ignore
+            rows=[word_space.domain.rows for word_space in word_spaces]  # type: ignore
+        )
+        self.states.move_to_end(key)
+        if len(self.states) > self.capacity:
+            self.states.popitem(last=False)
+        return False
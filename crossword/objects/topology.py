@@ -0,0 +1,135 @@
+"""
+Module: topology
+Defines the Topology class, the grid of a crossword compiled to int arrays, and Links, the view of the crosses
+of one word space the hot loops run on.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+if TYPE_CHECKING:
+    from .word_space import Coordinates, WordSpace
+
+
+@dataclass(frozen=True, eq=False)
+class Links:
+    """Crosses of a word space in the order of its crosses, as Python values read once from the topology."""
+    topology: Topology
+    # Index of the word space in the topology
+    index: int
+    neighbours: tuple[WordSpace, ...]
+    # Char index of every cross in the word space and in the neighbour
+    positions: tuple[int, ...]
+    other_positions: tuple[int, ...]
+    # Index of every cross among the crosses of the neighbour, the row of its possibility matrix
+    other_slots: tuple[int, ...]
+    coordinates: tuple[Coordinates, ...]
+
+
+# Columns of Topology.slots
+SLOT_CROSS, SLOT_NEIGHBOUR, SLOT_POSITION, SLOT_OTHER_POSITION, SLOT_OTHER_SLOT = range(5)
+
+
+@dataclass(frozen=True, eq=False)
+class Topology:
+    """
+    Word spaces and crosses of a grid as int arrays, immutable once compiled.
+
+    The crosses of word space i are the rows indptr[i]:indptr[i + 1] of slots, in the order
+    of WordSpace.crosses, so a row minus indptr[i] is the row of the cross in the possibility matrix.
+    """
+    word_spaces: tuple[WordSpace, ...]
+    # (crosses x 2) coordinates of every cross
+    cross_coordinates: npt.NDArray[np.int32]
+    indptr: npt.NDArray[np.int32]
+    # (slots x 5) cross, neighbour, char index in the word space and in the neighbour,
+    # and index of the cross among the crosses of the neighbour
+    slots: npt.NDArray[np.int32]
+
+    @staticmethod
+    def compile(word_spaces: Sequence[WordSpace]) -> Topology:
+        """
+        Compile the crosses of the word spaces.
+
+        Raises:
+            ValueError: If a word space crosses one that is not among them.
+        """
+        indices = {id(word_space): index for index, word_space in enumerate(word_spaces)}
+        cross_ids: dict[Coordinates, int] = {}
+        # Index of every cross among the crosses of every word space
+        local_slots: list[dict[Coordinates, int]] = [{} for _ in word_spaces]
+        slots: list[tuple[int, int, int, int, Coordinates]] = []
+        indptr = [0]
+        for index, word_space in enumerate(word_spaces):
+            for local_slot, cross in enumerate(word_space.crosses):
+                other = cross.other(word_space)
+                if id(other) not in indices or cross.coordinates is None:
+                    raise ValueError(f"{word_space} crosses {other} out of the topology")
+                cross_ids.setdefault(cross.coordinates, len(cross_ids))
+                local_slots[index][cross.coordinates] = local_slot
+                slots.append((cross_ids[cross.coordinates], indices[id(other)], cross.cross_index(word_space),
+                              cross.cross_index(other), cross.coordinates))
+            indptr.append(len(slots))
+
+        slot_rows = [(cross_id, neighbour, position, other_position, local_slots[neighbour][coordinates])
+                     for cross_id, neighbour, position, other_position, coordinates in slots]
+        return Topology(
+            word_spaces=tuple(word_spaces),
+            cross_coordinates=np.array(list(cross_ids), dtype=np.int32).reshape(-1, 2),  # type: ignore
+            indptr=np.array(indptr, dtype=np.int32),
+            slots=np.array(slot_rows, dtype=np.int32).reshape(-1, 5),  # type: ignore
+        )
+
+    def links(self, index: int) -> Links:
+        """Returns the crosses of the word space of the index."""
+        start, end = self.indptr[index:index + 2].tolist()  # type: ignore
+        columns: list[list[int]] = self.slots[start:end].T.tolist()  # type: ignore
+        return Links(
+            topology=self,
+            index=index,
+            neighbours=tuple(self.word_spaces[neighbour] for neighbour in columns[SLOT_NEIGHBOUR]),
+            positions=tuple(columns[SLOT_POSITION]),
+            other_positions=tuple(columns[SLOT_OTHER_POSITION]),
+            other_slots=tuple(columns[SLOT_OTHER_SLOT]),
+            coordinates=tuple((x, y) for x, y in self.cross_coordinates[columns[SLOT_CROSS]].tolist()),  # type: ignore
+        )
+
+    def attach(self) -> Topology:
+        """Make the word spaces run on this topology."""
+        for index, word_space in enumerate(self.word_spaces):
+            word_space.links = self.links(index)
+        return self
+
+    def detach(self) -> None:
+        """Make the word spaces compile their topology again, once their crosses changed."""
+        for word_space in self.word_spaces:
+            if word_space.links is not None and word_space.links.topology is self:
+                word_space.links = None
+
+    @staticmethod
+    def connected(word_space: WordSpace) -> list[WordSpace]:
+        """Returns the word spaces connected to the word space by crosses, the word space first."""
+        found = {id(word_space)}
+        connected = [word_space]
+        position = 0
+        while position < len(connected):
+            current = connected[position]
+            position += 1
+            for cross in current.crosses:
+                other = cross.other(current)
+                if id(other) not in found:
+                    found.add(id(other))
+                    connected.append(other)
+        return connected
+
+
+def grid_links(word_space: WordSpace) -> Links:
+    """Returns the crosses of the word space, the topology of its connected word spaces is compiled if missing."""
+    if word_space.links is None:
+        Topology.compile(Topology.connected(word_space)).attach()
+        assert word_space.links is not None
+    return word_space.links
@@ -3,8 +3,6 @@ from __future__ import annotations
 import copy
 from typing import TYPE_CHECKING, Optional
 
-import numpy as np
-
 from .charlist import CharList
 from .language import split
 
@@ -41,13 +39,7 @@ class Word(CharList):
             return self.score
         if self.word_list is None:
             return 0.0
-        word_row = self.word_list.words_df.loc[
-            self.word_list.words_df['word_concept_id'] == self.word_concept_id
-            ]  # type: ignore
-        if 'score' in word_row.columns and not np.isnan(word_row.iloc[0]['score']):
-            self.score = float(word_row.iloc[0]['score'])  # type: ignore
-        else:
-            self.score = 0.0
+        self.score = self.word_list.word_score(self.index)
         return self.score
 
     def __deepcopy__(self, memo: dict[int, object]):
@@ -1,14 +1,84 @@
+import copy
+import dataclasses
+import functools
 import hashlib
-from functools import lru_cache
-from typing import Iterator
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping, Optional
 
 import numpy as np
 import numpy.typing as npt
 import pandas as pd
 
-from .language import alphabet
+from .bitmap import Bitmap, unset_bits
+from .language import alphabet, split_codes
+from .length_index import LengthIndex, LengthIndexes
 from .mask import Mask
+from .pattern import PatternKey, key_length, key_positions, pattern_key
+from .pattern_cache import PatternCache
 from .word import Word
+from .word_list_file import ArrayDict, Metadata, read_arrays, write_arrays
+from .word_store import TextBuffer, WordStore
+
+
+def code_matrix(labels: Iterable[str], language: str) -> npt.NDArray[np.int16]:
+    """
+    Build a (words x longest word) matrix of alphabet indices of the split lowercase word labels,
+    -1 is used past the end of a word.
+    """
+    flat_codes, lengths = split_codes(labels, locale_code=language)
+    max_length = int(lengths.max()) if lengths.size > 0 else 0  # type: ignore
+
+    matrix = np.full((len(lengths), max_length), -1, dtype=np.int16)
+    # Boolean assignment fills the matrix in row-major order, i.e. word by word
+    matrix[np.arange(max_length) < lengths[:, np.newaxis]] = flat_codes
+    return matrix
+
+
+def _build_length_index(word_indices: dict[int, npt.NDArray[np.int32]], matrices: dict[int, npt.NDArray[np.int16]],
+                        alphabet_length: int, word_len: int) -> LengthIndex:
+    """Build the index of the words of the length from their code matrix, which the index takes over."""
+    return LengthIndex.build(word_indices[word_len], matrices.pop(word_len), alphabet_length)
+
+
+def _map_length_index(arrays: ArrayDict, layout: dict[int, tuple[int, int, int, int, int, int]],
+                      alphabet_length: int, word_len: int) -> LengthIndex:
+    """
+    Returns the index of the words of the length from the arrays of an index file, see WordList.save.
+    Layout holds the start of the words, their end and the offsets of their char, bitmap, count and pair count arrays.
+    """
+    word_start, word_end, char_offset, bitmap_offset, count_offset, pair_offset = layout[word_len]
+    word_count = word_end - word_start
+    bitmap_words = -(-word_count // 64)
+    return LengthIndex(
+        word_indices=arrays['word_indices'][word_start:word_end],  # type: ignore
+        char_matrix=arrays['char_matrices'][  # type: ignore
+            char_offset:char_offset + word_count * word_len
+        ].reshape(word_count, word_len),  # type: ignore
+        position_bitmaps=arrays['position_bitmaps'][  # type: ignore
+            bitmap_offset:bitmap_offset + word_len * alphabet_length * bitmap_words
+        ].reshape(word_len, alphabet_length, bitmap_words),  # type: ignore
+        position_counts=arrays['position_counts'][  # type: ignore
+            count_offset:count_offset + word_len * alphabet_length
+        ].reshape(word_len, alphabet_length),  # type: ignore
+        pair_counts=arrays['pair_counts'][  # type: ignore
+            pair_offset:pair_offset + (word_len * alphabet_length) ** 2
+        ].reshape(word_len, alphabet_length, word_len, alphabet_length),  # type: ignore
+    )
+
+
+@dataclasses.dataclass(frozen=True)
+class ScoreOrder:
+    """Rows of a length index by descending score, and the position of every row in them."""
+    rows: npt.NDArray[np.intp]
+    ranks: npt.NDArray[np.intp]
+
+    @staticmethod
+    def build(scores: npt.NDArray[np.float32]) -> 'ScoreOrder':
+        """Order the rows of the scores by descending score, ties in row order."""
+        rows = np.argsort(-scores, kind='stable')
+        ranks = np.empty_like(rows)
+        ranks[rows] = np.arange(len(rows))
+        return ScoreOrder(rows=rows, ranks=ranks)  # type: ignore
 
 
 class WordList:
@@ -16,131 +86,320 @@ class WordList:
     counter = 1
 
     def __init__(self, words_df: pd.DataFrame, language: str):
-        self.words_df = words_df
-        hash_array: pd.Series = pd.util.hash_pandas_object(self.words_df, index=True)  # type: ignore
+        hash_array: pd.Series = pd.util.hash_pandas_object(words_df, index=True)  # type: ignore
         self.dataframe_hash = hashlib.md5(hash_array.values.tobytes()).hexdigest()  # type: ignore
 
+        self.language = language
         self.alphabet = alphabet(language)
 
-        self.words_df['word_split'] = None
-
-        self.words_structure: dict[str, set[int]] = {}
-        self.word_indices_by_length_set: dict[int, set[int]] = {}
-
-        char_to_index: dict[str, int] = dict((ch, idx) for idx, ch in self.alphabet_with_index())
-
-        for word_index_hashable, row in self.words_df.iterrows():  # type: ignore
-            word_index: int = int(word_index_hashable)  # type: ignore
-            word_properties: dict[str, int | float | str] = row.to_dict()  # type: ignore
-
-            word = Word(
-                str(word_properties['word_label_text']),
-                str(word_properties['word_description_text']),
-                index=word_index,
-                language=language,
-                score=float(word_properties['score']) if 'score' in word_properties else None,
-                word_list=self,
-                word_concept_id=int(word_properties['word_concept_id'])  # type: ignore
-            )
-
-            word_len = len(word)
-            if word_len not in self.word_indices_by_length_set:
-                self.word_indices_by_length_set[word_len] = set()
-            self.word_indices_by_length_set[word_len].add(word_index)
-            for char_index, char in enumerate(word):
-                key = f"{word_len}_{char_index}_{char}"
-                if key not in self.words_structure:
-                    self.words_structure[key] = set()
-                self.words_structure[key].add(word_index)
-
-            self.words_df.at[word_index, 'word_split'] = word  # type: ignore
-            for index, char in enumerate(word):
-                if f'word_split_char_{index}' not in self.words_df.columns:
-                    split_vector: list[str | None] = [None] * self.words_df.shape[0]
-                    char_indices: list[int] = list(char_to_index.values())
-                    self.words_df[f'word_split_char_{index}'] = pd.Categorical(split_vector,
-                                                                               categories=char_indices)
-                self.words_df.at[word_index, f'word_split_char_{index}'] = char_to_index.get(char, None)  # type: ignore
-
-    def use_score_vector(self, score_vector):
-        """ Use a score vector to update the words DataFrame with scores. """
-        self.words_df.drop([x for x in ['score'] if x in self.words_df.columns], axis=1, inplace=True)
-        self.words_df = self.words_df.join(score_vector, on='word_concept_id', how='left', rsuffix='_right')
+        self.char_to_index: dict[str, int] = dict((ch, idx) for idx, ch in self.alphabet_with_index())
+
+        # Results of words_indices and candidate_char_vectors by the pattern
+        self.pattern_cache = PatternCache()
+        # Results of score_order by the length, specific to the scores
+        self.score_orders: dict[int, ScoreOrder] = {}
+        concept_ids = words_df['word_concept_id'].to_numpy(dtype=np.int64)  # type: ignore
+        self.store = WordStore(
+            labels=TextBuffer.encode(words_df['word_label_text'].astype(str).tolist()),  # type: ignore
+            descriptions=TextBuffer.encode(words_df['word_description_text'].astype(str).tolist()),  # type: ignore
+            concept_ids=concept_ids,  # type: ignore
+            concept_order=np.argsort(concept_ids, kind='stable').astype(np.int64),  # type: ignore
+            scores=words_df['score'].to_numpy(dtype=np.float32) if 'score' in words_df.columns else None,  # type: ignore
+        )
+
+        labels: pd.Series = words_df['word_label_text'].astype(str).str.lower()  # type: ignore
+        matrix = code_matrix(labels, language)  # type: ignore
+        lengths = (matrix >= 0).sum(axis=1)  # type: ignore
+        word_indices = {  # type: ignore
+            word_len: np.flatnonzero(lengths == word_len).astype(np.int32)  # type: ignore
+            # Words without a letter (empty labels) fit no word space, they are kept out of the length indexes
+            for word_len in np.unique(lengths).tolist() if word_len > 0  # type: ignore
+        }
+        # Code matrices of the words of every length, the one of all words is not kept by the loaders
+        matrices = {word_len: matrix[indices, :word_len] for word_len, indices in word_indices.items()}  # type: ignore
+        self.length_indexes = LengthIndexes(
+            word_indices, functools.partial(_build_length_index, word_indices, matrices, len(self.alphabet))  # type: ignore
+        )
+        self.word_lengths, self.word_rows = self._word_positions(word_indices)  # type: ignore
+
+    @classmethod
+    def from_file(cls, path: Path) -> 'WordList':
+        """
+        Open a WordList index stored by WordList.save.
+
+        The index arrays are memory-mapped, so opening is fast and the pages are shared by all processes
+        that open the same file.
+
+        Raises:
+            ValueError: If the file is not a WordList index or was stored with a different alphabet.
+        """
+        metadata, arrays = read_arrays(path)
+        word_list = cls.__new__(cls)
+        word_list._load_arrays(metadata, arrays)
+        return word_list
+
+    def _load_arrays(self, metadata: Metadata, arrays: ArrayDict) -> None:
+        """Set up the WordList from the arrays of an index file."""
+        self.dataframe_hash = str(metadata['dataframe_hash'])
+        self.language = str(metadata['language'])
+        self.alphabet = alphabet(self.language)
+        if metadata['alphabet'] != self.alphabet:
+            raise ValueError(f"WordList index was stored with a different alphabet of {self.language}")
+        self.char_to_index = dict((ch, idx) for idx, ch in self.alphabet_with_index())
+        self.store = WordStore(
+            labels=TextBuffer(arrays['label_offsets'], arrays['label_text']),  # type: ignore
+            descriptions=TextBuffer(arrays['description_offsets'], arrays['description_text']),  # type: ignore
+            concept_ids=arrays['concept_ids'],  # type: ignore
+            concept_order=arrays['concept_order'],  # type: ignore
+            scores=arrays['scores'] if metadata['has_score'] else None,  # type: ignore
+        )
+
+        # Per-length arrays are stored one after another, ordered by length
+        self.pattern_cache = PatternCache()
+        self.score_orders = {}
+        alphabet_length = len(self.alphabet)
+        layout: dict[int, tuple[int, int, int, int, int, int]] = {}
+        char_offset, bitmap_offset, count_offset, pair_offset = 0, 0, 0, 0
+        length_offsets: list[int] = arrays['length_offsets'].tolist()  # type: ignore
+        for word_len, word_start, word_end in zip(arrays['lengths'].tolist(),  # type: ignore
+                                                  length_offsets, length_offsets[1:]):
+            layout[word_len] = (word_start, word_end, char_offset, bitmap_offset, count_offset, pair_offset)  # type: ignore
+            char_offset += (word_end - word_start) * word_len  # type: ignore
+            bitmap_offset += word_len * alphabet_length * -(-(word_end - word_start) // 64)  # type: ignore
+            count_offset += word_len * alphabet_length  # type: ignore
+            pair_offset += (word_len * alphabet_length) ** 2  # type: ignore
+        self.length_indexes = LengthIndexes(
+            layout, functools.partial(_map_length_index, arrays, layout, alphabet_length)
+        )
+        self.word_lengths, self.word_rows = self._word_positions({
+            word_len: arrays['word_indices'][word_start:word_end]  # type: ignore
+            for word_len, (word_start, word_end, *_offsets) in layout.items()
+        })
+
+    def save(self, path: Path) -> None:
+        """Store the WordList index to a file, see WordList.from_file."""
+        length_indexes = [self.length_indexes[word_len] for word_len in sorted(self.length_indexes)]
+
+        write_arrays(path, {
+            'language': self.language,
+            'alphabet': self.alphabet,
+            'dataframe_hash': self.dataframe_hash,
+            'has_score': self.store.scores is not None,
+        }, {
+            'lengths': np.array(sorted(self.length_indexes), dtype=np.int32),  # type: ignore
+            'length_offsets': np.cumsum(  # type: ignore
+                [0] + [len(length_index.word_indices) for length_index in length_indexes]
+            ).astype(np.int64),
+            'word_indices': np.concatenate([length_index.word_indices for length_index in length_indexes]),
+            'char_matrices': np.concatenate([length_index.char_matrix.ravel() for length_index in length_indexes]),
+            'position_bitmaps': np.concatenate([
+                length_index.position_bitmaps.ravel() for length_index in length_indexes
+            ]),
+            'position_counts': np.concatenate([
+                length_index.position_counts.ravel() for length_index in length_indexes
+            ]),
+            'pair_counts': np.concatenate([length_index.pair_counts.ravel() for length_index in length_indexes]),
+            'label_offsets': self.store.labels.offsets,
+            'label_text': self.store.labels.text,
+            'description_offsets': self.store.descriptions.offsets,
+            'description_text': self.store.descriptions.text,
+            'concept_ids': self.store.concept_ids,
+            'concept_order': self.store.concept_order,
+            'scores': self.store.scores if self.store.scores is not None else np.zeros(0, dtype=np.float32),
+        })
+
+    def _word_positions(self, word_indices: Mapping[int, npt.NDArray[np.int32]]
+                        ) -> tuple[npt.NDArray[np.int16], npt.NDArray[np.int32]]:
+        """Length and row in the length index of every word, from the word indices of every length."""
+        word_lengths = np.zeros(len(self.store), dtype=np.int16)
+        word_rows = np.zeros(len(self.store), dtype=np.int32)
+        for word_len, length_word_indices in word_indices.items():
+            word_lengths[length_word_indices] = word_len
+            word_rows[length_word_indices] = np.arange(len(length_word_indices), dtype=np.int32)
+        return word_lengths, word_rows
+
+    def word(self, word_index: int) -> Word:
+        """ Returns a Word object of the word index. """
+        length_index = self.length_indexes[int(self.word_lengths[word_index])]  # type: ignore
+        char_codes: list[int] = length_index.char_matrix[self.word_rows[word_index]].tolist()  # type: ignore
+        return Word(
+            [self.alphabet[code] for code in char_codes],
+            self.store.descriptions[word_index],
+            index=word_index,
+            language=self.language,
+            score=float(self.store.scores[word_index]) if self.store.scores is not None else None,  # type: ignore
+            word_list=self,
+            word_concept_id=int(self.store.concept_ids[word_index])  # type: ignore
+        )
+
+    def word_score(self, word_index: int) -> float:
+        """ Returns the score of the word index, 0.0 if the word has none. """
+        return float(self.word_scores(np.array([word_index]))[0])  # type: ignore
+
+    def word_scores(self, word_indices: npt.NDArray[np.intp]) -> npt.NDArray[np.float32]:
+        """ Returns scores of the word indices, 0.0 for words without a score. """
+        if self.store.scores is None:
+            return np.zeros(len(word_indices), dtype=np.float32)
+        return np.nan_to_num(self.store.scores[word_indices], nan=0.0)
+
+    def chars_at(self, word_indices: npt.NDArray[np.int32], char_index: int) -> npt.NDArray[np.int16]:
+        """ Returns alphabet indices of the chars on char_index of the words, all words must have the same length. """
+        if len(word_indices) == 0:
+            return np.zeros(0, dtype=np.int16)
+        length_index = self.length_indexes[int(self.word_lengths[word_indices[0]])]  # type: ignore
+        return length_index.char_matrix[self.word_rows[word_indices], char_index]  # type: ignore
+
+    def score_array(self, score_vector: pd.Series | pd.DataFrame) -> npt.NDArray[np.float32]:  # type: ignore
+        """
+        Returns scores of all words from a score vector (scores indexed by word_concept_id, or a DataFrame
+        with a score column), NaN for words missing in it.
+        """
+        scores: pd.Series = score_vector['score'] if isinstance(score_vector, pd.DataFrame) else score_vector  # type: ignore
+        return self.store.concept_scores(
+            scores.index.to_numpy(dtype=np.int64),  # type: ignore
+            scores.to_numpy(dtype=np.float32)  # type: ignore
+        )
+
+    def use_score_vector(self, score_vector: pd.Series | pd.DataFrame) -> None:  # type: ignore
+        """ Use a score vector as scores of the words, see score_array. """
+        self.store = dataclasses.replace(self.store, scores=self.score_array(score_vector))  # type: ignore
+        self.score_orders = {}
+
+    def with_scores(self, score_vector: pd.Series | pd.DataFrame) -> 'WordList':  # type: ignore
+        """
+        Returns a WordList using a score vector as scores of the words, see score_array.
+        Everything but the scores, including the pattern cache, is shared with this WordList, which is left
+        unchanged, so a task can use its own scores of a WordList shared by all tasks.
+        """
+        word_list = copy.copy(self)
+        word_list.store = dataclasses.replace(self.store, scores=self.score_array(score_vector))  # type: ignore
+        word_list.score_orders = {}
+        return word_list
+
+    def score_order(self, length: int) -> Optional[ScoreOrder]:
+        """
+        Returns the rows of the length index of the length by descending score of their words, ties in row order,
+        None if the words have no scores. Computed once per length and scores, words without a score are taken
+        as of score 0.0.
+        """
+        if self.store.scores is None:
+            return None
+        score_order = self.score_orders.get(length)
+        if score_order is None:
+            score_order = ScoreOrder.build(self.word_scores(self.length_index(length).word_indices))  # type: ignore
+            self.score_orders[length] = score_order
+        return score_order
 
     def alphabet_with_index(self) -> Iterator[tuple[int, str]]:
         """ Returns an iterator of tuples (index, character) for the alphabet."""
         return enumerate(self.alphabet, start=0)
 
-    def words(self, mask: Mask, chars: Word, failed_indices: list[int] | None = None) -> pd.DataFrame:
-        """ Returns a DataFrame of words that match the given mask and characters, excluding failed indices."""
-        return self.words_df.take(self.words_indices_without_failed(mask, chars, failed_indices))
-
     def words_indices_without_failed(
             self,
             mask: Mask,
             chars: Word,
-            failed_indices: list[int] | None = None
+            failed_rows: Optional[Bitmap] = None
+    ) -> npt.NDArray[np.int32]:
+        """ Returns indices of words that match the given mask and characters, excluding failed rows."""
+        return self.pattern_words_without_failed(pattern_key(mask, chars), failed_rows)
+
+    def pattern_words_without_failed(
+            self,
+            key: PatternKey,
+            failed_rows: Optional[Bitmap] = None
     ) -> npt.NDArray[np.int32]:
-        """ Returns indices of words that match the given mask and characters, excluding failed indices."""
-        if failed_indices is None:
-            failed_indices = []
-        if len(failed_indices) == 0:
-            return self.words_indices(mask, chars)
+        """
+        Returns indices of words that match the pattern key, excluding failed rows.
 
-        word_indices = self.words_indices(mask, chars)
-        bitmap = np.isin(word_indices, failed_indices)
-        return word_indices[bitmap]
+        Args:
+            key: pattern key of the words
+            failed_rows: bitmap of the rows of the length index of the pattern to exclude, None to exclude none
+        """
+        word_indices = self.pattern_words(key)
+        if failed_rows is None or len(word_indices) == 0:
+            return word_indices
+        return word_indices[unset_bits(failed_rows, self.word_rows[word_indices])]  # type: ignore
 
-    @lru_cache(maxsize=10000)  # type: ignore
     def words_indices(self, mask: Mask, chars: Word) -> npt.NDArray[np.int32]:
         """ Returns indices of words that match the given mask and characters. """
-        if mask.length not in self.word_indices_by_length_set:
-            raise ValueError(f"No word suitable for the given space (length {mask.length})")
+        return self.pattern_words(pattern_key(mask, chars))
 
-        word_index_set = self.words_indices_sets(mask, chars)
+    def pattern_words(self, key: PatternKey) -> npt.NDArray[np.int32]:
+        """ Returns indices of words that match the pattern key. """
+        return self.pattern_cache.get(key, lambda: self._pattern_words(key))  # type: ignore
 
-        return np.fromiter(word_index_set, dtype=np.int32, count=len(word_index_set))
+    def _pattern_words(self, key: PatternKey) -> npt.NDArray[np.int32]:
+        length_index = self.length_index(key_length(key))
+        if len(key[1]) == 0:
+            # A view, so the pattern cache does not charge the array the length index holds anyway
+            return length_index.word_indices[:]
 
-    def words_indices_sets(self, mask: Mask, chars: Word) -> set[int]:
-        """
-        Returns a set of word indices that match the given mask and characters.
-        """
-        if mask.bind_count() == 0:
-            return self.word_indices_by_length_set[mask.length]
+        char_codes = self._char_codes(key[1])
+        if char_codes is None:
+            return np.zeros(0, dtype=np.int32)
+        return length_index.word_indices[length_index.rows_matching(key_positions(key), char_codes)]
+
+    def length_index(self, length: int) -> LengthIndex:
+        """ Returns the index of words of the length. """
+        if length not in self.length_indexes:
+            raise ValueError(f"No word suitable for the given space (length {length})")
+        return self.length_indexes[length]
 
-        mask_indexes = [mask_index for mask_index, is_masked in enumerate(mask.mask) if is_masked]
-        single_letter_sets: list[set[int]] = [
-            self.words_structure.get(f"{mask.length}_{mask_index}_{char}", set())
-            for mask_index, char in zip(mask_indexes, chars)
-        ]
-        return set.intersection(*single_letter_sets)
+    def _char_codes(self, chars: tuple[str, ...]) -> Optional[npt.NDArray[np.intp]]:
+        """ Returns alphabet indices of the chars, None if any of them is not in the alphabet. """
+        char_codes = np.fromiter((self.char_to_index.get(char, -1) for char in chars), dtype=np.intp,  # type: ignore
+                                 count=len(chars))
+        if (char_codes < 0).any():
+            return None
+        return char_codes
 
     def candidate_char_vectors(self, mask: Mask, chars: Word,
-                               cross_char_indices: list[int]) -> list[npt.NDArray[np.int32]]:
+                               cross_char_indices: tuple[int, ...]) -> npt.NDArray[np.int32]:
         """
-        Returns a list of vectors representing the counts of characters in the alphabet for each cross character index.
-        Each element corresponds to an alphabet index of a potentially assigned cross character
+        Returns a (cross character indices x alphabet) matrix of counts of characters in the alphabet
+        on each cross character index of the matching words.
         """
+        return self.pattern_char_vectors(pattern_key(mask, chars), cross_char_indices)
 
-        return [
-            self.candidate_char_vector(mask, chars, cross_char_index)
-            for cross_char_index in cross_char_indices
-        ]
+    def pattern_char_vectors(self, key: PatternKey, cross_char_indices: tuple[int, ...],
+                             rows: Optional[Bitmap] = None) -> npt.NDArray[np.int32]:
+        """
+        Returns a (cross character indices x alphabet) matrix of counts of characters in the alphabet
+        on each cross character index of the words matching the pattern key.
+        Patterns with at most one bound character are answered from the precomputed counts,
+        others are counted from the rows bitmap of the matching words if given (see Domain).
+        """
+        # Cannot collide with pattern_words keys, their first item is an int
+        return self.pattern_cache.get(  # type: ignore
+            (key, cross_char_indices),
+            lambda: self._pattern_char_vectors(key, cross_char_indices, rows)
+        )
+
+    def _pattern_char_vectors(self, key: PatternKey, cross_char_indices: tuple[int, ...],
+                              rows: Optional[Bitmap]) -> npt.NDArray[np.int32]:
+        length_index = self.length_index(key_length(key))
+        char_indices = np.array(cross_char_indices, dtype=np.intp)
+        char_codes = self._char_codes(key[1])
+        if char_codes is None:
+            return np.zeros((len(char_indices), len(self.alphabet)), dtype=np.int32)
+
+        counts = length_index.precomputed_counts(key_positions(key), char_codes, char_indices)
+        if counts is None and rows is not None:
+            counts = length_index.char_counts(length_index.bitmap_rows(rows), char_indices)
+        if counts is None:
+            counts = length_index.char_counts(self.word_rows[self.pattern_words(key)], char_indices)  # type: ignore
+        return counts
 
-    @lru_cache(maxsize=10000) # type: ignore
     def candidate_char_vector(self, mask: Mask, chars: Word, cross_char_index: int) -> npt.NDArray[np.int32]:
         """
         Returns a vector of counts of characters in the alphabet for a specific cross character index.
         """
-        column_name = f"word_split_char_{cross_char_index}"
-        words_indices = self.words_indices(mask, chars)
-        words_subset = self.words_df[column_name].iloc[words_indices] # type: ignore
-        # For categorical columns, value_counts preserves all categories
-        counts: npt.NDArray[np.int32] = np.bincount(
-            words_subset,  # type: ignore
-            minlength=len(self.alphabet)
-        )  # type: ignore
-        return counts
+        return self.candidate_char_vectors(mask, chars, (cross_char_index,))[0]  # type: ignore
+
+    def warm_up(self, patterns: Iterable[tuple[Mask, Word]]) -> None:
+        """ Fill the pattern cache with words matching the patterns. """
+        for mask, chars in patterns:
+            self.words_indices(mask, chars)
 
     def __hash__(self) -> int:
         return hash(self.dataframe_hash)
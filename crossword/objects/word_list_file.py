@@ -0,0 +1,122 @@
+"""
+Module: word_list_file
+Versioned on-disk format of the WordList index.
+
+The file starts with the magic bytes, the format version and the size of a JSON header (both uint32 little-endian).
+The header holds the WordList metadata and the dtype, shape and offset of every array.
+Arrays follow the header as flat C-ordered buffers aligned to 64 bytes, so they can be memory-mapped without copying.
+"""
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import numpy.typing as npt
+
+MAGIC = b'CWWORDS\0'
+FORMAT_VERSION = 3
+ALIGNMENT = 64
+
+ArrayDict = dict[str, npt.NDArray[np.generic]]  # type: ignore
+Metadata = dict[str, str | int | bool | list[str]]
+ArraySpecs = dict[str, tuple[np.dtype[np.generic], tuple[int, ...]]]  # type: ignore
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_arrays(path: Path, metadata: Metadata, arrays: ArrayDict) -> None:
+    """
+    Write metadata and arrays into a WordList index file.
+
+    Args:
+        path: file to write
+        metadata: JSON serializable WordList metadata
+        arrays: arrays to store, their dtype and shape are kept
+    """
+    specs: ArraySpecs = {name: (array.dtype, array.shape) for name, array in arrays.items()}  # type: ignore
+    with create_arrays(path, metadata, specs) as targets:  # type: ignore
+        for name, array in arrays.items():
+            targets[name][...] = array  # type: ignore
+
+
+@contextmanager
+def create_arrays(path: Path, metadata: Metadata, specs: ArraySpecs) -> Iterator[ArrayDict]:  # type: ignore
+    """
+    Create a WordList index file of arrays filled in place, so they do not need to fit in memory.
+
+    Args:
+        path: file to write, it appears only when the block exits without an error
+        metadata: JSON serializable WordList metadata
+        specs: dtype and shape of every array to store
+
+    Yields:
+        Writable zero-filled arrays memory-mapped from the file
+    """
+    array_specs: dict[str, dict[str, str | int | list[int]]] = {}
+    offset = 0
+    for name, (dtype, shape) in specs.items():
+        array_specs[name] = {
+            'dtype': dtype.newbyteorder('<').str,
+            'shape': list(shape),
+            'offset': offset,
+        }
+        offset = _aligned(offset + int(np.prod(shape, dtype=np.int64)) * dtype.itemsize)  # type: ignore
+
+    header = json.dumps({'metadata': metadata, 'arrays': array_specs}).encode('utf-8')  # type: ignore
+    data_start = _aligned(len(MAGIC) + 8 + len(header))
+
+    # Write aside and rename, so the file is never seen half-written by a process that maps it
+    partial_path = path.with_name(f'{path.name}.{os.getpid()}.partial')
+    with partial_path.open('wb') as index_file:
+        index_file.write(MAGIC)
+        index_file.write(np.array([FORMAT_VERSION, len(header)], dtype='<u4').tobytes())  # type: ignore
+        index_file.write(header)
+        index_file.truncate(data_start + offset)
+
+    try:
+        mapped = np.memmap(partial_path, dtype=np.uint8, mode='r+')  # type: ignore
+        arrays: ArrayDict = {}
+        for name, (dtype, shape) in specs.items():
+            start = data_start + int(array_specs[name]['offset'])  # type: ignore
+            size = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize  # type: ignore
+            arrays[name] = mapped[start:start + size].view(dtype.newbyteorder('<')).reshape(shape)  # type: ignore
+        yield arrays
+        mapped.flush()  # type: ignore
+    except BaseException:
+        partial_path.unlink()
+        raise
+    os.replace(partial_path, path)
+
+
+def read_arrays(path: Path) -> tuple[Metadata, ArrayDict]:
+    """
+    Memory-map a WordList index file.
+
+    Returns:
+        Metadata and read-only arrays backed by the file pages
+
+    Raises:
+        ValueError: If the file is not a WordList index or has a different format version.
+    """
+    with path.open('rb') as index_file:
+        if index_file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a WordList index file")
+        version, header_size = np.frombuffer(index_file.read(8), dtype='<u4').tolist()  # type: ignore
+        if version != FORMAT_VERSION:  # type: ignore
+            raise ValueError(f"{path} has format version {version}, expected {FORMAT_VERSION}")  # type: ignore
+        header = json.loads(index_file.read(header_size).decode('utf-8'))  # type: ignore
+
+    data_start = _aligned(len(MAGIC) + 8 + header_size)  # type: ignore
+    mapped = np.memmap(path, dtype=np.uint8, mode='r')  # type: ignore
+
+    arrays: ArrayDict = {}
+    for name, spec in header['arrays'].items():  # type: ignore
+        dtype = np.dtype(spec['dtype'])  # type: ignore
+        count = int(np.prod(spec['shape'], dtype=np.int64))  # type: ignore
+        start = data_start + spec['offset']  # type: ignore
+        arrays[name] = mapped[start:start + count * dtype.itemsize].view(dtype).reshape(spec['shape'])  # type: ignore
+    return header['metadata'], arrays  # type: ignore
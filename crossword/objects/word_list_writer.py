@@ -0,0 +1,267 @@
+"""
+Module: word_list_writer
+Writes a WordList index file from words streamed in chunks, see WordList.from_file.
+
+Words are split and appended to spill files, rows of every word length to their own files, while the per-length
+counts are summed in memory. The index file is then filled chunk by chunk from the spill files, so the memory taken
+is bounded by the chunk size, the alphabet and the longest word, not by the number of words.
+"""
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import numpy.typing as npt
+from more_itertools import chunked
+
+from .language import alphabet
+from .length_index import LengthIndex
+from .word_list import code_matrix
+from .word_list_file import ArraySpecs, create_arrays
+
+# Bitmaps of chunks are concatenated, so the chunk size must be a multiple of the 64 rows of a bitmap word
+DEFAULT_CHUNK_SIZE = 2 ** 16
+
+
+def _read(path: Path, dtype: type[np.generic], start: int, count: int) -> npt.NDArray[np.generic]:  # type: ignore
+    """Read count items from start of a spill file."""
+    return np.fromfile(path, dtype=dtype, count=count, offset=start * np.dtype(dtype).itemsize)  # type: ignore
+
+
+def _append(path: Path, array: npt.NDArray[np.generic]) -> None:  # type: ignore
+    with path.open('ab') as spill_file:
+        array.tofile(spill_file)  # type: ignore
+
+
+class _TextSpill:
+    """Texts appended to spill files, stored as a TextBuffer."""
+
+    def __init__(self, directory: Path, name: str):
+        self.text_path = directory / f'{name}.text'
+        self.ends_path = directory / f'{name}.ends'
+        self.text_path.touch()
+        self.ends_path.touch()
+        self.size = 0
+
+    def add(self, texts: list[str]) -> None:
+        """Append the texts."""
+        encoded = [text.encode('utf-8') for text in texts]
+        ends = self.size + np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)))  # type: ignore
+        with self.text_path.open('ab') as text_file:
+            text_file.write(b''.join(encoded))
+        _append(self.ends_path, ends)  # type: ignore
+        self.size = int(ends[-1]) if len(ends) > 0 else self.size  # type: ignore
+
+    def copy_to(self, offsets: npt.NDArray[np.int64], text: npt.NDArray[np.uint8], chunk_size: int) -> None:
+        """Copy the texts to the TextBuffer arrays."""
+        offsets[0] = 0
+        for start in range(0, len(offsets) - 1, chunk_size):
+            ends = _read(self.ends_path, np.int64, start, min(chunk_size, len(offsets) - 1 - start))  # type: ignore
+            offsets[start + 1:start + 1 + len(ends)] = ends  # type: ignore
+        for start in range(0, self.size, chunk_size * 64):
+            chunk = _read(self.text_path, np.uint8, start, min(chunk_size * 64, self.size - start))  # type: ignore
+            text[start:start + len(chunk)] = chunk  # type: ignore
+
+
+class _LengthSpill:
+    """Words of a single length appended to spill files, with the counts of the LengthIndex."""
+
+    def __init__(self, directory: Path, word_len: int, alphabet_length: int):
+        self.word_len = word_len
+        self.rows_path = directory / f'rows_{word_len}'
+        self.indices_path = directory / f'indices_{word_len}'
+        self.count = 0
+        self.position_counts = np.zeros((word_len, alphabet_length), dtype=np.int32)
+        self.pair_counts = np.zeros((word_len, alphabet_length, word_len, alphabet_length), dtype=np.int32)
+
+    def add(self, word_indices: npt.NDArray[np.int32], char_matrix: npt.NDArray[np.int16]) -> None:
+        """Append the words of the length."""
+        alphabet_length = self.position_counts.shape[1]
+        _append(self.rows_path, char_matrix)  # type: ignore
+        _append(self.indices_path, word_indices)  # type: ignore
+        self.position_counts += LengthIndex.count_positions(char_matrix, alphabet_length)
+        self.pair_counts += LengthIndex.count_pairs(char_matrix, alphabet_length)
+        self.count += len(word_indices)
+
+    def bitmap_words(self) -> int:
+        """Returns the number of words of a position bitmap."""
+        return -(-self.count // 64)
+
+    def copy_to(self, word_indices: npt.NDArray[np.int32], char_matrix: npt.NDArray[np.int16],
+                position_bitmaps: npt.NDArray[np.uint64], chunk_size: int) -> None:
+        """Copy the words to the arrays of the LengthIndex and build its bitmaps chunk by chunk."""
+        alphabet_length = self.position_counts.shape[1]
+        for start in range(0, self.count, chunk_size):
+            indices = _read(self.indices_path, np.int32, start, min(chunk_size, self.count - start))  # type: ignore
+            rows = _read(self.rows_path, np.int16, start * self.word_len, len(indices) * self.word_len)  # type: ignore
+            rows = rows.reshape((len(indices), self.word_len))  # type: ignore
+            word_indices[start:start + len(indices)] = indices  # type: ignore
+            char_matrix[start:start + len(indices)] = rows  # type: ignore
+            position_bitmaps[:, :, start // 64:start // 64 + -(-len(indices) // 64)] = LengthIndex.pack_positions(  # type: ignore
+                rows, alphabet_length  # type: ignore
+            )
+
+
+class WordListWriter:
+    """
+    Writes a WordList index file of words added in chunks, see write_word_list.
+    """
+
+    def __init__(self, language: str, directory: Path):
+        """
+        Args:
+            language: ISO 639-1 language specification (e.g. 'en', 'cs')
+            directory: empty directory for the spill files, its size grows with the number of words
+        """
+        self.language = language
+        self.alphabet = alphabet(language)
+        self.directory = directory
+        self.length_spills: dict[int, _LengthSpill] = {}
+        self.labels = _TextSpill(directory, 'labels')
+        self.descriptions = _TextSpill(directory, 'descriptions')
+        self.concepts_path = directory / 'concept_ids'
+        self.concepts_path.touch()
+        self.word_count = 0
+        # Identifies the words like the DataFrame hash of a WordList
+        self.digest = hashlib.md5()
+
+    def add(self, labels: list[str], descriptions: list[str], concept_ids: list[int]) -> None:
+        """
+        Append words.
+
+        Raises:
+            ValueError: If an unknown letter is encountered in a label.
+        """
+        matrix = code_matrix([label.lower() for label in labels], self.language)
+        lengths = (matrix >= 0).sum(axis=1)  # type: ignore
+        word_indices = np.arange(self.word_count, self.word_count + len(labels), dtype=np.int32)
+        # Words without a letter are kept out of the length indexes, see WordList
+        for word_len in np.unique(lengths[lengths > 0]).tolist():  # type: ignore
+            if word_len not in self.length_spills:  # type: ignore
+                self.length_spills[word_len] = _LengthSpill(self.directory, word_len, len(self.alphabet))  # type: ignore
+            rows = np.flatnonzero(lengths == word_len)  # type: ignore
+            self.length_spills[word_len].add(word_indices[rows], matrix[rows, :word_len])  # type: ignore
+
+        concepts = np.array(concept_ids, dtype=np.int64)
+        _append(self.concepts_path, concepts)  # type: ignore
+        self.labels.add(labels)
+        self.descriptions.add(descriptions)
+        for texts in (labels, descriptions):
+            self.digest.update('\0'.join(texts).encode('utf-8'))
+        self.digest.update(concepts.tobytes())
+        self.word_count += len(labels)
+
+    def write(self, path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        """
+        Write the index file of the added words, see WordList.from_file.
+
+        Concept ids are expected in ascending order (e.g. the entry numbers of a dictionary), other orders are sorted
+        in memory.
+        """
+        if chunk_size <= 0 or chunk_size % 64 != 0:
+            raise ValueError(f"Chunk size must be a positive multiple of 64, got {chunk_size}")
+        spills = [self.length_spills[word_len] for word_len in sorted(self.length_spills)]
+        alphabet_length = len(self.alphabet)
+
+        specs: ArraySpecs = {  # type: ignore
+            'lengths': (np.dtype(np.int32), (len(spills),)),
+            'length_offsets': (np.dtype(np.int64), (len(spills) + 1,)),
+            'word_indices': (np.dtype(np.int32), (sum(spill.count for spill in spills),)),
+            'char_matrices': (np.dtype(np.int16), (sum(spill.count * spill.word_len for spill in spills),)),
+            'position_bitmaps': (np.dtype(np.uint64), (sum(
+                spill.word_len * alphabet_length * spill.bitmap_words() for spill in spills
+            ),)),
+            'position_counts': (np.dtype(np.int32), (sum(spill.position_counts.size for spill in spills),)),
+            'pair_counts': (np.dtype(np.int32), (sum(spill.pair_counts.size for spill in spills),)),
+            'label_offsets': (np.dtype(np.int64), (self.word_count + 1,)),
+            'label_text': (np.dtype(np.uint8), (self.labels.size,)),
+            'description_offsets': (np.dtype(np.int64), (self.word_count + 1,)),
+            'description_text': (np.dtype(np.uint8), (self.descriptions.size,)),
+            'concept_ids': (np.dtype(np.int64), (self.word_count,)),
+            'concept_order': (np.dtype(np.int64), (self.word_count,)),
+            'scores': (np.dtype(np.float32), (0,)),
+        }
+        with create_arrays(path, {  # type: ignore
+            'language': self.language,
+            'alphabet': self.alphabet,
+            'dataframe_hash': self.digest.hexdigest(),
+            'has_score': False,
+        }, specs) as arrays:
+            arrays['lengths'][:] = [spill.word_len for spill in spills]  # type: ignore
+            arrays['length_offsets'][:] = np.cumsum([0] + [spill.count for spill in spills])  # type: ignore
+            self._copy_length_spills(spills, arrays['word_indices'], arrays['char_matrices'],  # type: ignore
+                                     arrays['position_bitmaps'], chunk_size)  # type: ignore
+            count_offset, pair_offset = 0, 0
+            for spill in spills:
+                position_counts = arrays['position_counts'][count_offset:count_offset + spill.position_counts.size]  # type: ignore
+                position_counts[:] = spill.position_counts.ravel()  # type: ignore
+                pair_counts = arrays['pair_counts'][pair_offset:pair_offset + spill.pair_counts.size]  # type: ignore
+                pair_counts[:] = spill.pair_counts.ravel()  # type: ignore
+                count_offset += spill.position_counts.size
+                pair_offset += spill.pair_counts.size
+            self.labels.copy_to(arrays['label_offsets'], arrays['label_text'], chunk_size)  # type: ignore
+            self.descriptions.copy_to(arrays['description_offsets'], arrays['description_text'],  # type: ignore
+                                      chunk_size)
+            self._copy_concepts(arrays['concept_ids'], arrays['concept_order'], chunk_size)  # type: ignore
+
+    def _copy_length_spills(self, spills: list[_LengthSpill], word_indices: npt.NDArray[np.int32],
+                            char_matrices: npt.NDArray[np.int16], position_bitmaps: npt.NDArray[np.uint64],
+                            chunk_size: int) -> None:
+        alphabet_length = len(self.alphabet)
+        word_offset, char_offset, bitmap_offset = 0, 0, 0
+        for spill in spills:
+            bitmap_size = spill.word_len * alphabet_length * spill.bitmap_words()
+            spill.copy_to(
+                word_indices[word_offset:word_offset + spill.count],
+                char_matrices[char_offset:char_offset + spill.count * spill.word_len].reshape(
+                    (spill.count, spill.word_len)
+                ),
+                position_bitmaps[bitmap_offset:bitmap_offset + bitmap_size].reshape(
+                    (spill.word_len, alphabet_length, spill.bitmap_words())
+                ),
+                chunk_size
+            )
+            word_offset += spill.count
+            char_offset += spill.count * spill.word_len
+            bitmap_offset += bitmap_size
+
+    def _copy_concepts(self, concept_ids: npt.NDArray[np.int64], concept_order: npt.NDArray[np.int64],
+                       chunk_size: int) -> None:
+        ascending = True
+        for start in range(0, self.word_count, chunk_size):
+            # Overlap the previous chunk by one id to compare the ids across chunks
+            chunk = _read(self.concepts_path, np.int64, max(start - 1, 0),  # type: ignore
+                          min(chunk_size, self.word_count - start) + min(start, 1))
+            concept_ids[start:start + chunk_size] = chunk[min(start, 1):]  # type: ignore
+            ascending = ascending and bool((np.diff(chunk) >= 0).all())  # type: ignore
+        if not ascending:
+            concept_order[:] = np.argsort(concept_ids, kind='stable')
+            return
+        for start in range(0, self.word_count, chunk_size):
+            concept_order[start:start + chunk_size] = np.arange(start, min(start + chunk_size, self.word_count))
+
+
+def write_word_list(path: Path, words: Iterable[tuple[str, str, int]], language: str,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+    """
+    Write a WordList index file of words read lazily, e.g. from hunspell_words.
+
+    Args:
+        path: index file to write, see WordList.from_file
+        words: tuples (word label, description, concept id)
+        language: ISO 639-1 language specification (e.g. 'en', 'cs')
+        chunk_size: number of words processed at once, a multiple of 64
+
+    Raises:
+        ValueError: If an unknown letter is encountered in a label.
+    """
+    if chunk_size <= 0 or chunk_size % 64 != 0:
+        raise ValueError(f"Chunk size must be a positive multiple of 64, got {chunk_size}")
+    # Spill files next to the index file, they take about as much space as the words in the index
+    with tempfile.TemporaryDirectory(dir=path.parent, prefix=f'.{path.name}.') as directory:
+        writer = WordListWriter(language, Path(directory))
+        for chunk in chunked(words, chunk_size):
+            labels, descriptions, concept_ids = zip(*chunk)  # type: ignore
+            writer.add(list(labels), list(descriptions), list(concept_ids))  # type: ignore
+        writer.write(path, chunk_size)
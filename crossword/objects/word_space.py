@@ -1,19 +1,33 @@
+import functools
 from enum import Enum
 from typing import Optional, TypeAlias, Union
 
 import numpy as np
 import numpy.typing as npt
-import pandas as pd
 
+from .bitmap import Bitmap, empty, set_bit, unset_bits
 from .cross import Cross
-from .mask import Mask
+from .domain import Domain
+from .length_index import LengthIndex
+from .pattern import Pattern
+from .topology import Links, grid_links
 from .word import Word
-from .word_list import WordList
+from .word_list import ScoreOrder, WordList
 
 Coordinates = tuple[int, int]
 JsonValue: TypeAlias = Union[str, int, float, bool, None,
 list['JsonValue'], Coordinates, dict[str, 'JsonValue'], Optional[list[str]]]
 
+# Best options a randomized find_best_option picks from
+BEST_OPTIONS = 8
+# Best scored options the best supported ones are chosen from, if the word list has scores
+SCORED_OPTIONS = 4
+# Rows of the first chunk of the walk in score order, the next chunks are twice as long
+SCORE_WALK_CHUNK = 64
+
+# Char index of a cross with a char to choose, and the possibilities of the crossing word space on it
+Crossing = tuple[int, npt.NDArray[np.int32]]
+
 
 class Direction(Enum):
     """Direction enum for WordSpace orientation."""
@@ -25,27 +39,44 @@ class WordSpace:
     """Single line of characters in crossroad that will be filled with a word."""
 
     counter: int = 1
+    # Crosses read from the compiled topology of the grid, set by Topology.attach and cleared by Topology.detach
+    links: Optional[Links] = None
 
     def __init__(self, start: Coordinates, length: int, direction: Direction) -> None:
         """Construct WordSpace without any word."""
-        # Specific to word list
-        self.failed_words_index_list: list[int] = []
+        # Specific to word list: bitmap of the failed rows of the length index, None if no word failed
+        self.failed_rows: Optional[Bitmap] = None
 
         self.crosses: list[Cross] = []
         self.occupied_by: Optional[Word] = None
         self.possibility_matrix: Optional[npt.NDArray[np.int32]] = None
 
         self.possibility_matrix_version: int = 0
-        self.max_possibilities_on_cross_value_version: int = -1
-        self.max_possibilities_on_cross_value: int = 0
+        # Chars bound to the crosses, kept up to date by bind and unbind
+        self.pattern = Pattern(length)
+        # Candidate words of the pattern, narrowed and restored by update_possibilities
+        self.domain = Domain()
 
         self.start: Coordinates = start
         self.length: int = length
         self.direction: Direction = direction
 
     def reset_failed_words(self) -> None:
-        """Reset failed words and invalidate cache."""
-        self.failed_words_index_list = []
+        """Reset failed words, the bitmap is dropped rather than cleared."""
+        self.failed_rows = None
+
+    def add_failed_word(self, word_list: WordList, word: Word) -> None:
+        """Exclude the word from the options of the word space until the failed words are reset."""
+        if self.failed_rows is None:
+            self.failed_rows = empty(len(word_list.length_index(self.length).word_indices))
+        set_bit(self.failed_rows, int(word_list.word_rows[word.index]))  # type: ignore
+
+    def failed_word_indices(self, word_list: WordList) -> list[int]:
+        """List indices of the failed words, ascending."""
+        if self.failed_rows is None:
+            return []
+        length_index = word_list.length_index(self.length)
+        return length_index.word_indices[length_index.bitmap_rows(self.failed_rows)].tolist()  # type: ignore
 
     def build_possibility_matrix(self, word_list: WordList) -> None:
         """Build possibility matrix for word selection."""
@@ -54,25 +85,40 @@ class WordSpace:
             shape=(len(self.crosses), len(word_list.alphabet)),
             dtype=np.int32
         )
+        self.domain.reset()
         self.update_possibilities(word_list)
 
     def update_possibilities(self, word_list: WordList) -> None:
-        """Update possibility matrix based on current state."""
+        """
+        Update possibility matrix based on current state.
+        Chars bound since the last update narrow the candidate words, unbound ones restore them with the matrix.
+        """
         if self.possibility_matrix is None:
             raise ValueError("Possibility matrix not initialized")
         self.possibility_matrix_version += 1
 
-        unbounded_crosses = self._get_unbounded_crosses()
+        restored = self.domain.update(self.pattern, word_list, self.possibility_matrix)
+        if restored is not None:
+            self.possibility_matrix = restored
+            return
 
-        cross_char_indices = [self._index_of_cross(cross) for cross in unbounded_crosses]
-        mask, chars = self._mask_current()
-        candidate_char_vectors = word_list.candidate_char_vectors(mask,
-                                                                  chars,
-                                                                  cross_char_indices)
+        # Rows and char indices of the crosses without a bound char
+        chars = self.pattern.chars
+        unbounded = [(row, position) for row, position in enumerate(grid_links(self).positions)
+                     if chars[position] is None]
 
-        for candidate_char_vector, cross in zip(candidate_char_vectors, unbounded_crosses):
-            cross_index = self.crosses.index(cross)
-            self.possibility_matrix[cross_index] = candidate_char_vector
+        # The previous matrix is kept on the trail of the domain
+        self.possibility_matrix = self.possibility_matrix.copy()
+        self.possibility_matrix[[row for row, _ in unbounded]] = word_list.pattern_char_vectors(
+            self.pattern.key(), tuple(position for _, position in unbounded), self.domain.rows
+        )
+
+    def restore_possibilities(self, word_list: WordList, possibility_matrix: npt.NDArray[np.int32],
+                              rows: Bitmap) -> None:
+        """Start the unbound WordSpace from its possibility matrix and candidate rows, as built before."""
+        self.possibility_matrix = possibility_matrix
+        self.possibility_matrix_version += 1
+        self.domain.restore(word_list.length_index(self.length), self.length, rows)
 
     def bind(self, word: Word) -> list['WordSpace']:
         """Add the word into WordSpace.
@@ -92,11 +138,13 @@ class WordSpace:
                 f"{word} {word.length} != {self.length}"
             )
 
-        affected = []
-        for cross in self.crosses:
-            if not cross.bound_value():
-                affected.append(cross.other(self))
+        links = grid_links(self)
+        affected = [neighbour for neighbour, position in zip(links.neighbours, links.positions)
+                    if self.pattern.chars[position] is None]
         self.occupied_by = word
+        for neighbour, position, other_position in zip(links.neighbours, links.positions, links.other_positions):
+            self.pattern.set_char(position, word[position])
+            neighbour.pattern.set_char(other_position, word[position])
         return affected
 
     def unbind(self) -> list['WordSpace']:
@@ -105,11 +153,15 @@ class WordSpace:
         Returns:
             List of affected WordSpaces that need updates.
         """
+        links = grid_links(self)
         affected = [self]
         self.occupied_by = None
-        for cross in self.crosses:
-            if not cross.bound_value():
-                affected.append(cross.other(self))
+        for neighbour, position, other_position in zip(links.neighbours, links.positions, links.other_positions):
+            char = neighbour.occupied_by[other_position] if neighbour.occupied_by is not None else None
+            self.pattern.set_char(position, char)
+            neighbour.pattern.set_char(other_position, char)
+            if char is None:
+                affected.append(neighbour)
         return affected
 
     def solving_priority(self) -> int:
@@ -120,34 +172,28 @@ class WordSpace:
             return 0
         return min(data)
 
-    def find_best_option(self, word_list: WordList, randomize: float = 0.0) -> Optional[Word]:
-        """Find the single best word option."""
-        best_options = self._find_best_options(word_list)
+    def find_best_option(self, word_list: WordList, randomize: float = 0.0,
+                         allowed: Optional[Bitmap] = None) -> Optional[Word]:
+        """
+        Find the single best word option, one of the BEST_OPTIONS best if randomized.
 
-        if best_options is not None:
-            sorted_options: pd.DataFrame = best_options.sort_values(by='score', ascending=False)
+        Args:
+            allowed: bitmap of the rows of the length index the option is chosen from, e.g. the candidates
+                kept by arc consistency, None to choose from all the bindable words
+        """
+        best_options = self._find_best_options(word_list, BEST_OPTIONS if randomize > 0.0 else 1, allowed)
 
+        if len(best_options) > 0:
             if randomize > 0.0:
-                index_to_take = min(np.random.poisson(lam=2), sorted_options.shape[0] - 1)
+                index_to_take = min(np.random.poisson(lam=2), len(best_options) - 1)
             else:
                 index_to_take = 0
-            word_split_column_index: int = sorted_options.columns.get_loc('word_split')  # type: ignore
-            value: Word = sorted_options.iat[index_to_take, word_split_column_index]  # type: ignore
-            return value
+            return word_list.word(int(best_options[index_to_take]))  # type: ignore
         return None
 
     def spaces(self) -> list[Coordinates]:
         """Return set of positions that this word goes through."""
-        spaces = []
-        if self.direction == Direction.HORIZONTAL:
-            for x in range(self.start[0], self.start[0] + self.length):
-                spaces.append((x, self.start[1]))
-        elif self.direction == Direction.VERTICAL:
-            for y in range(self.start[1], self.start[1] + self.length):
-                spaces.append((self.start[0], y))
-        else:
-            raise ValueError(f"Unknown WordSpace type: {self.direction}")
-        return spaces
+        return list(_cells(self.start, self.length, self.direction))
 
     def add_cross(self, other_word_space: 'WordSpace') -> None:
         """Add a cross with another WordSpace.
@@ -160,7 +206,12 @@ class WordSpace:
             raise ValueError("Tried to add cross not in spaces")
         if new_cross in self.crosses:
             raise ValueError("Tried to add already present cross")
+        # Topologies of the grid are compiled again from the crosses
+        for word_space in (self, other_word_space):
+            if word_space.links is not None:
+                word_space.links.topology.detach()
         self.crosses.append(new_cross)
+        new_cross.update_patterns()
 
     def my_char_on_cross(self, cross: Cross) -> Optional[str]:
         """Get character at cross position if word is bound."""
@@ -178,35 +229,37 @@ class WordSpace:
 
     def char_at(self, x: int, y: int) -> str:
         """Get character at specific coordinates."""
-        if (x, y) not in self.spaces():
+        cells = _cells(self.start, self.length, self.direction)
+        if (x, y) not in cells:
             raise ValueError(f"Coordinates {x}, {y} not in WordSpace {self.spaces()}")
         if not self.occupied_by:
             raise ValueError(f"WordSpace {self} is not occupied by any word")
-        return self.occupied_by[self.spaces().index((x, y))]
+        return self.occupied_by[cells.index((x, y))]
 
     def max_possibilities_on_cross(self, cross: Cross) -> int:
         """Get a maximum number of crossing words once a specific char is bound to the cross."""
         assert self.possibility_matrix is not None
-        if self.max_possibilities_on_cross_value_version == self.possibility_matrix_version:
-            return self.max_possibilities_on_cross_value
         possibilities: npt.NDArray[np.int32] = self.possibility_matrix[self.crosses.index(cross)]
-        self.max_possibilities_on_cross_value = int(np.max(possibilities))
-        return self.max_possibilities_on_cross_value
+        return int(np.max(possibilities))
 
     def to_json(self, export_occupied_by: bool = False) -> dict[str, JsonValue]:
         """Convert to JSON representation."""
+        return self.to_json_with(self.occupied_by, export_occupied_by)
+
+    def to_json_with(self, word: Optional[Word], export_occupied_by: bool = False) -> dict[str, JsonValue]:
+        """Convert to JSON representation with the word bound, see to_json."""
         return {
             'start': self.start,
             'length': self.length,
             'direction': self.direction.value,
             'occupied_by': (
-                self.occupied_by.to_json()
-                if self.occupied_by is not None and export_occupied_by
+                word.to_json()
+                if word is not None and export_occupied_by
                 else None
             ),
             'meaning': (
-                self.occupied_by.description
-                if self.occupied_by is not None
+                word.description
+                if word is not None
                 else None
             )
         }
@@ -219,92 +272,126 @@ class WordSpace:
         """Get zero-based char index of cross."""
         return cross.cross_index(self)
 
-    def _bindable(self, word_list: WordList) -> pd.DataFrame:
-        """List all words that can be filled to WordSpace at this moment."""
-        mask, chars = self._mask_current()
-        return word_list.words(mask, chars, failed_indices=self.failed_words_index_list)
-
-    def _mask_current(self, add_cross: Optional[Cross] = None, add_char: str = '') -> tuple[Mask, Word]:
-        """Return currently bound mask, optionally with one more bounded char."""
-        mask_list = [False] * self.length
-        char_list: list[Optional[str]] = [None] * self.length
-
-        for cross in self.crosses:
-            if cross.bound_value():
-                index = self._index_of_cross(cross)
-                mask_list[index] = True
-                char_list[index] = cross.bound_value()
-
-        if add_cross:
-            index = self._index_of_cross(add_cross)
-            mask_list[index] = True
-            char_list[index] = add_char
-
-        return Mask(mask=mask_list), Word([ch for ch in char_list if ch is not None])
+    def _bindable(self, word_list: WordList) -> npt.NDArray[np.int32]:
+        """List indices of all words that can be filled to WordSpace at this moment."""
+        return word_list.pattern_words_without_failed(self.pattern.key(), failed_rows=self.failed_rows)
 
     def _count_candidate_crossings(self) -> list[int]:
         """Count candidate crossings"""
-        return [cross.other(self).max_possibilities_on_cross(cross) for cross in self.crosses if
-                not cross.bound_value()]
-
-    def _get_unbounded_crosses(self) -> list[Cross]:
-        """List crosses that don't have certain Char bound.
-
-        Will return empty list if word is bound to this WordSpace.
+        links = grid_links(self)
+        return [int(np.max(neighbour.possibility_matrix[other_slot]))  # type: ignore
+                for neighbour, position, other_slot in zip(links.neighbours, links.positions, links.other_slots)
+                if self.pattern.chars[position] is None]
+
+    def _crossings(self) -> list[Crossing]:
+        """List the crosses with a char to choose, with the possibilities of the crossing word spaces."""
+        links = grid_links(self)
+        crossings: list[Crossing] = []
+        for neighbour, position, other_slot in zip(links.neighbours, links.positions, links.other_slots):
+            # Half bound or unbound crosses
+            if self.occupied_by is not None and neighbour.occupied_by is not None:
+                continue
+            assert neighbour.possibility_matrix is not None
+            crossings.append((position, neighbour.possibility_matrix[other_slot]))  # type: ignore
+        return crossings
+
+    @staticmethod
+    def _support(length_index: LengthIndex, rows: npt.NDArray[np.intp],
+                 crossings: list[Crossing]) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.int64]]:
         """
-        return [cross for cross in self.crosses if not cross.bound_value()]
-
-    def _get_half_bound_and_unbound_crosses(self) -> list[Cross]:
-        """List crosses that have at least one word bounded."""
-        return [cross for cross in self.crosses if cross.is_half_bound_or_unbound()]
-
-    def _find_best_options(self, word_list: WordList) -> Optional[pd.DataFrame]:
-        """Find best word options with scores.
+        Sum the possibilities the rows of the length index leave on the crosses.
 
         Returns:
-            DataFrame with best word options and their scores, or None if no options.
+            The rows leaving a possibility on every cross, in the same order, and the sums of the possibilities
         """
-        unbounded_crosses = self._get_half_bound_and_unbound_crosses()
-
-        words_dataframe = self._bindable(word_list)
-
-        # Create score matrix by mapping characters to scores
-        score_matrix = np.zeros(
-            shape=(words_dataframe.shape[0], len(unbounded_crosses)),
-            dtype=np.float32
-        )
-
-        for cross_index, cross in enumerate(unbounded_crosses):
-            other_word_space = cross.other(self)
-            assert other_word_space.possibility_matrix is not None
-
-            char_index = cross.cross_index(self)
-            other_cross_index = other_word_space.crosses.index(cross)
-            possibilities: npt.NDArray[np.int32] = other_word_space.possibility_matrix[other_cross_index]
-            # The word_split_char_{char_index} column contains indices of alphabet chars,
-            # that will be used as indices to possibilities (alphabet-length vector of distinct char counts)
-            score_matrix[:, cross_index] = possibilities[
-                words_dataframe[f"word_split_char_{char_index}"]]  # type: ignore
-
-        # Any character has score 0 -> don't consider it
-        positive_mask = (score_matrix > 0).all(axis=1)  # type: ignore
+        support = np.zeros(len(rows), dtype=np.int64)
+        # A plain view of a memory-mapped matrix, its gathers do not create memmap objects
+        char_matrix = np.asarray(length_index.char_matrix)
+        for char_index, possibilities in crossings:
+            # Alphabet indices of the chars are used as indices to possibilities
+            # (alphabet-length vector of distinct char counts)
+            counts = possibilities[char_matrix[rows, char_index]]  # type: ignore
+            # Any character has score 0 -> don't consider the row, nor gather its chars on the next crosses
+            positive = counts > 0
+            if not positive.all():
+                rows, support, counts = rows[positive], support[positive], counts[positive]
+            support += counts
+        return rows, support
+
+    def _option_scores(self, word_list: WordList,
+                       allowed: Optional[Bitmap] = None) -> tuple[npt.NDArray[np.int32], npt.NDArray[np.int64]]:
+        """
+        Score the bindable words, of the allowed rows if given, by the possibilities they leave on the crosses.
 
-        # Calculate total scores (sum across crosses for each word)
-        total_scores = score_matrix.sum(axis=1)  # type: ignore
+        Returns:
+            Indices of the words leaving a possibility on every cross, and the sums of the possibilities
+        """
+        length_index = word_list.length_index(self.length)
+        rows, support = self._support(length_index, self._bindable_rows(word_list, allowed), self._crossings())
+        return length_index.word_indices[rows], support  # type: ignore
+
+    def _bindable_rows(self, word_list: WordList, allowed: Optional[Bitmap] = None) -> npt.NDArray[np.intp]:
+        """Rows of the length index of the bindable words, only the allowed ones if given."""
+        rows: npt.NDArray[np.intp] = word_list.word_rows[self._bindable(word_list)]  # type: ignore
+        if allowed is None:
+            return rows
+        return rows[~unset_bits(allowed, rows)]  # type: ignore
+
+    def _candidate_rows(self, length_index: LengthIndex) -> Optional[Bitmap]:
+        """Bitmap of the rows of the domain that did not fail, None if the domain is not at the pattern."""
+        if self.domain.rows is None or self.domain.length_index is not length_index \
+                or self.domain.chars != self.pattern.chars:
+            return None
+        if self.failed_rows is None:
+            return self.domain.rows
+        return np.bitwise_and(self.domain.rows, np.invert(self.failed_rows))  # type: ignore
 
-        if total_scores.size > 30:  # type: ignore
-            threshold = np.percentile(total_scores, 95)  # type: ignore
-            best_mask = (total_scores >= threshold) & positive_mask  # type: ignore
-        else:
-            best_mask = positive_mask
+    def _scored_options(self, word_list: WordList, score_order: ScoreOrder, count: int,
+                        allowed: Optional[Bitmap] = None
+                        ) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.int64], LengthIndex]:
+        """
+        Find the SCORED_OPTIONS best scored options, as rows of the length index in score order, and their support.
 
-        positive_words_with_score = pd.DataFrame({
-            'word_split': words_dataframe['word_split'].values[best_mask],  # type: ignore
-            'score': total_scores[best_mask]  # type: ignore
-        })  # type: ignore
+        Dense candidates are walked lazily in score order, in growing chunks, until enough of them leave
+        a possibility on every cross. Sparse ones are listed and sorted by their score at once.
+        """
+        length_index = word_list.length_index(self.length)
+        wanted = max(count, SCORED_OPTIONS)
+        crossings = self._crossings()
+
+        candidates = self._candidate_rows(length_index)
+        if candidates is not None and allowed is not None:
+            candidates = np.bitwise_and(candidates, allowed)
+        candidate_count = -1 if candidates is None else int(np.bitwise_count(candidates).sum())  # type: ignore
+        if candidates is None or candidate_count * candidate_count <= wanted * len(score_order.rows):
+            rows = self._bindable_rows(word_list, allowed)
+            rows, support = self._support(length_index, rows[np.argsort(score_order.ranks[rows])], crossings)
+            return rows[:wanted], support[:wanted], length_index
+
+        chunks: list[tuple[npt.NDArray[np.intp], npt.NDArray[np.int64]]] = []
+        found, start, size = 0, 0, SCORE_WALK_CHUNK
+        while found < wanted and start < len(score_order.rows):
+            rows = score_order.rows[start:start + size]
+            chunks.append(self._support(length_index, rows[~unset_bits(candidates, rows)], crossings))
+            found += len(chunks[-1][0])
+            start, size = start + size, size * 2
+        rows, support = np.concatenate([rows for rows, _ in chunks]), np.concatenate([support for _, support in chunks])
+        return rows[:wanted], support[:wanted], length_index
+
+    def _find_best_options(self, word_list: WordList, count: int = 1,
+                           allowed: Optional[Bitmap] = None) -> npt.NDArray[np.int32]:
+        """
+        Find the indices of the count best word options, the best first, empty if there are none.
 
-        sorted_scores = positive_words_with_score.sort_values(by='score', ascending=False)
-        return sorted_scores.head(1) if not sorted_scores.empty else None
+        Options are ordered by the possibilities they leave on the crosses. If the word list has scores,
+        only the SCORED_OPTIONS best scored options are ordered so, ties in score order.
+        """
+        score_order = word_list.score_order(self.length)
+        if score_order is not None:
+            rows, support, length_index = self._scored_options(word_list, score_order, count, allowed)
+            return length_index.word_indices[rows[_best_first(support, count)]]  # type: ignore
+        word_indices, support = self._option_scores(word_list, allowed)
+        return word_indices[_best_first(support, count)]  # type: ignore
 
     def __str__(self) -> str:
         describing_string = (
@@ -324,3 +411,24 @@ class WordSpace:
 
     def __hash__(self) -> int:
         return hash((self.start, self.length, self.direction))
+
+
+def _best_first(scores: npt.NDArray[np.int64], count: int) -> npt.NDArray[np.intp]:
+    """Returns the positions of the count highest scores, the highest first, ties in the order of the positions."""
+    if len(scores) > count:
+        if count == 1:
+            return np.array([np.argmax(scores)])  # type: ignore
+        best = np.argpartition(-scores, count - 1)[:count]
+    else:
+        best = np.arange(len(scores))
+    return best[np.lexsort((best, -scores[best]))]  # type: ignore
+
+
+@functools.lru_cache(maxsize=4096)  # type: ignore
+def _cells(start: Coordinates, length: int, direction: Direction) -> tuple[Coordinates, ...]:
+    """Returns the positions a WordSpace goes through, computed once per WordSpace geometry."""
+    if direction == Direction.HORIZONTAL:
+        return tuple((x, start[1]) for x in range(start[0], start[0] + length))
+    if direction == Direction.VERTICAL:
+        return tuple((start[0], y) for y in range(start[1], start[1] + length))
+    raise ValueError(f"Unknown WordSpace type: {direction}")
@@ -0,0 +1,78 @@
+"""
+Module: word_store
+Defines compact per-word columns of a WordList.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+
+# Concept ids spanning less than this many times the number of words are mapped by a lookup table
+DENSE_CONCEPT_RANGE = 8
+
+
+@dataclass(frozen=True)
+class TextBuffer:
+    """
+    Texts stored in one UTF-8 buffer, text i is text[offsets[i]:offsets[i + 1]].
+    """
+    offsets: npt.NDArray[np.int64]
+    text: npt.NDArray[np.uint8]
+
+    @staticmethod
+    def encode(texts: list[str]) -> 'TextBuffer':
+        """Encode texts to a TextBuffer."""
+        encoded = [text.encode('utf-8') for text in texts]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(text) for text in encoded], out=offsets[1:])
+        return TextBuffer(offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8))
+
+    def __getitem__(self, index: int) -> str:
+        return self.text[self.offsets[index]:self.offsets[index + 1]].tobytes().decode('utf-8')  # type: ignore
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+@dataclass(frozen=True)
+class WordStore:
+    """
+    Per-word data of a WordList, indexed by the word index.
+    """
+    labels: TextBuffer
+    descriptions: TextBuffer
+    concept_ids: npt.NDArray[np.int64]
+    # Word indices ordered by the concept id, maps concept ids to words by a binary search
+    concept_order: npt.NDArray[np.int64]
+    # None if the word list has no scores
+    scores: Optional[npt.NDArray[np.float32]]
+
+    def concept_scores(self, concept_ids: npt.NDArray[np.int64],
+                       scores: npt.NDArray[np.float32]) -> npt.NDArray[np.float32]:
+        """
+        Returns scores of all words taken from the scores of their concepts, NaN for words of other concepts.
+        """
+        word_scores = np.full(len(self), np.nan, dtype=np.float32)
+        if len(self) == 0:
+            return word_scores
+        low, high = int(self.concept_ids[self.concept_order[0]]), int(self.concept_ids[self.concept_order[-1]])  # type: ignore
+
+        if high - low < DENSE_CONCEPT_RANGE * len(self):
+            # Compact ids, scatter the scores to a table indexed by the concept id and gather them by the words
+            known = (concept_ids >= low) & (concept_ids <= high)
+            concept_table = np.full(high - low + 1, np.nan, dtype=np.float32)
+            concept_table[concept_ids[known] - low] = scores[known]
+            return concept_table[self.concept_ids - low]
+
+        # Sparse ids, binary search the concepts in the words ordered by the concept id
+        sorted_ids = self.concept_ids[self.concept_order]
+        starts = np.searchsorted(sorted_ids, concept_ids, side='left')
+        counts = np.searchsorted(sorted_ids, concept_ids, side='right') - starts  # type: ignore
+        # Positions in sorted_ids of the words of every concept, one run per concept
+        positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())  # type: ignore
+        word_scores[self.concept_order[positions]] = np.repeat(scores, counts)  # type: ignore
+        return word_scores
+
+    def __len__(self) -> int:
+        return len(self.concept_ids)
@@ -0,0 +1,200 @@
+"""
+Module: arc_consistency
+Defines the ArcConsistency class, AC-3 propagation of the candidate words over all crosses of a crossword.
+"""
+from collections import deque
+from typing import Iterable, Optional
+
+import numpy as np
+
+from crossword.objects import WordList, WordSpace
+from crossword.objects.bitmap import Bitmap
+from crossword.objects.topology import grid_links
+
+
+class ArcConsistency:
+    """
+    Candidate rows of the unbound word spaces, kept arc consistent over their unbound crosses.
+
+    A candidate stays only if its char on every cross is supported by some candidate of the crossing word space.
+    The solver chooses the words of the unbound word spaces among these candidates, see candidates.
+    Supports are alphabet-sized bitsets per cross. The candidates before every assignment are kept on a trail,
+    so backtracking restores them.
+    """
+
+    def __init__(self) -> None:
+        self.word_list: Optional[WordList] = None
+        self.word_spaces: list[WordSpace] = []
+        self.indices: dict[WordSpace, int] = {}
+        # (neighbour, position in the word space, position in the neighbour) of every cross of a word space
+        self.neighbours: list[list[tuple[int, int, int]]] = []
+        self.position_bitmaps: list[Bitmap] = []
+        # Candidate rows (of the LengthIndex of its length) of every word space, None if it is bound
+        self.rows: list[Optional[Bitmap]] = []
+        # Supports of the rows of every word space by position, computed when needed and reset with the rows
+        self.supports: list[Optional[dict[int, int]]] = []
+        self.trail: list[tuple[list[Optional[Bitmap]], list[Optional[dict[int, int]]]]] = []
+        # Word space wiped out by the last propagation
+        self.wiped_out: Optional[WordSpace] = None
+
+    def establish(self, word_list: WordList, word_spaces: list[WordSpace]) -> bool:
+        """
+        Start from the domains of the unbound word spaces and make them arc consistent.
+
+        Returns:
+            False if a domain was wiped out
+        """
+        if word_list is not self.word_list or word_spaces != self.word_spaces:
+            self._attach(word_list, word_spaces)
+        self.trail = []
+        self.rows = [None] * len(word_spaces)
+        self.supports = [None] * len(word_spaces)
+        for index, word_space in enumerate(word_spaces):
+            if word_space.occupied_by is None:
+                word_space.update_possibilities(word_list)
+                self.rows[index] = word_space.domain.rows
+        return self._propagate(index for index, rows in enumerate(self.rows) if rows is not None)
+
+    def _attach(self, word_list: WordList, word_spaces: list[WordSpace]) -> None:
+        """Build the crosses and the position bitmaps of the word spaces."""
+        self.word_list = word_list
+        self.word_spaces = list(word_spaces)
+        self.indices = {word_space: index for index, word_space in enumerate(word_spaces)}
+        self.neighbours = [
+            [(self.indices[neighbour], position, other_position) for neighbour, position, other_position
+             in zip(links.neighbours, links.positions, links.other_positions)]
+            for links in (grid_links(word_space) for word_space in word_spaces)
+        ]
+        self.position_bitmaps = [
+            np.asarray(word_list.length_index(word_space.length).position_bitmaps) for word_space in word_spaces
+        ]
+
+    def assign(self, word_space: WordSpace, affected_spaces: Iterable[WordSpace]) -> bool:
+        """
+        Propagate a word bound to the word space, the possibilities of the affected spaces being already updated.
+
+        Returns:
+            False if a domain was wiped out
+        """
+        self.push()
+        self.rows[self.indices[word_space]] = None
+        changed = []
+        for affected_space in affected_spaces:
+            index = self.indices[affected_space]
+            previous_rows, domain_rows = self.rows[index], affected_space.domain.rows
+            if previous_rows is None or domain_rows is None:
+                continue
+            rows = previous_rows & domain_rows  # type: ignore
+            if not rows.any():  # type: ignore
+                self.wiped_out = affected_space
+                return False
+            self.rows[index], self.supports[index] = rows, None  # type: ignore
+            changed.append(index)
+        return self._propagate(changed)
+
+    def candidates(self, word_space: WordSpace) -> Optional[Bitmap]:
+        """Returns the arc consistent candidate rows of the word space, None if it is bound or not attached."""
+        index = self.indices.get(word_space)
+        return None if index is None else self.rows[index]
+
+    def push(self) -> None:
+        """Keep the candidates on the trail, for an assignment that is not propagated."""
+        self.trail.append((self.rows, self.supports))
+        self.rows, self.supports = list(self.rows), list(self.supports)
+
+    def unassign(self) -> None:
+        """Restore the candidates before the last assignment."""
+        if self.trail:
+            self.rows, self.supports = self.trail.pop()
+
+    def wipes_out_locally(self, word_spaces: Iterable[WordSpace]) -> bool:
+        """
+        Returns True if arc consistency over the crosses among the word spaces alone wipes one of them out,
+        starting from their domains, so only the letters bound on their crosses are to blame. The candidates are kept.
+        """
+        kept = self.rows, self.supports
+        self.rows, self.supports = [None] * len(self.word_spaces), [None] * len(self.word_spaces)
+        indices = []
+        try:
+            for word_space in word_spaces:
+                if word_space.occupied_by is None and word_space.domain.rows is not None:
+                    if not word_space.domain.rows.any():
+                        return True
+                    indices.append(self.indices[word_space])
+                    self.rows[indices[-1]] = word_space.domain.rows
+            return not self._propagate(indices)
+        finally:
+            self.rows, self.supports = kept
+
+    def wipe_out_region(self, word_space: WordSpace, rounds: int = 3) -> Optional[set[WordSpace]]:
+        """
+        Returns the unbound word spaces around the word space that wipe it out locally, see wipes_out_locally.
+
+        The wipe-out is proven on the word space alone, then with its unbound neighbours and then with theirs,
+        the letters bound on the crosses of the region are to blame.
+
+        Returns:
+            The region, None if no wipe-out is proven within the rounds
+        """
+        region = {word_space}
+        for _ in range(rounds):
+            if self.wipes_out_locally(region):
+                return region
+            region |= {neighbour for region_space in region for neighbour in grid_links(region_space).neighbours
+                       if neighbour.occupied_by is None}
+        return None
+
+    def _propagate(self, changed: Iterable[int]) -> bool:
+        """Revise the neighbours of changed word spaces until a fixpoint, False if a domain was wiped out."""
+        queue = deque(changed)
+        queued = set(queue)
+        while queue:
+            index = queue.popleft()
+            queued.discard(index)
+            for neighbour, position, neighbour_position in self.neighbours[index]:
+                if self.rows[neighbour] is None:
+                    continue
+                allowed = self._support(index, position)
+                present = self._support(neighbour, neighbour_position)
+                if present & ~allowed == 0:
+                    continue
+                if present & allowed == 0:
+                    self.wiped_out = self.word_spaces[neighbour]
+                    return False
+                self.rows[neighbour] = self._without_chars(neighbour, neighbour_position, present & ~allowed)
+                self.supports[neighbour] = None
+                if neighbour not in queued:
+                    queue.append(neighbour)
+                    queued.add(neighbour)
+        return True
+
+    def _support(self, index: int, position: int) -> int:
+        """Returns the bitset of chars (bit i for the char i of the alphabet) candidates have on the position."""
+        supports = self.supports[index]
+        if supports is None:
+            supports = self.supports[index] = {}
+        elif position in supports:
+            return supports[position]
+        rows = self.rows[index]
+        assert rows is not None
+        word_positions = rows.nonzero()[0]
+        position_bitmaps = self.position_bitmaps[index][position]  # type: ignore
+        has_char = (position_bitmaps[:, word_positions] & rows[word_positions]).any(axis=1)  # type: ignore
+        packed = np.packbits(has_char, bitorder='little')  # type: ignore
+        supports[position] = int.from_bytes(packed.tobytes(), 'little')  # type: ignore
+        return supports[position]
+
+    def _without_chars(self, index: int, position: int, chars: int) -> Bitmap:
+        """Returns the candidates without the chars of the bitset on the position."""
+        char_indices = []
+        while chars:
+            lowest = chars & -chars
+            char_indices.append(lowest.bit_length() - 1)
+            chars ^= lowest
+        rows = self.rows[index]
+        assert rows is not None
+        rows = rows.copy()
+        word_positions = rows.nonzero()[0]
+        rows[word_positions] &= ~np.bitwise_or.reduce(  # type: ignore
+            self.position_bitmaps[index][position][char_indices][:, word_positions], axis=0)  # type: ignore
+        return rows
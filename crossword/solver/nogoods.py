@@ -0,0 +1,156 @@
+"""
+Module: nogoods
+Defines the NogoodTable class, letters on crosses learned to lead to dead ends, kept across restarts of a grid.
+"""
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+import numpy as np
+
+from crossword.objects import WordList, WordSpace
+from crossword.objects.topology import grid_links
+from crossword.objects.word_space import Coordinates
+
+from .arc_consistency import ArcConsistency
+
+Letter = tuple[Coordinates, str]
+Nogood = frozenset[Letter]
+# A word space of a cross, the char index of the cross in it, and the other word space of the cross
+CrossSide = tuple[WordSpace, int, WordSpace]
+
+
+class NogoodTable:
+    """
+    Bounded table of nogoods: small sets of letters on crosses that leave some word space without options
+    or wipe out its candidates.
+
+    A nogood depends only on the grid and the word list, so the table is kept across solves
+    of the same grid and cleared when either changes. When full, the least recently hit nogood is dropped.
+    """
+
+    def __init__(self, capacity: int = 10000, max_letters: int = 6) -> None:
+        self.capacity = capacity
+        self.max_letters = max_letters
+        # Nogoods from the least to the most recently hit
+        self.nogoods: OrderedDict[Nogood, None] = OrderedDict()
+        self.by_letter: dict[Letter, set[Nogood]] = {}
+        self.word_list: Optional[WordList] = None
+        self.crosses: dict[Coordinates, CrossSide] = {}
+
+    def attach(self, word_list: WordList, word_spaces: Iterable[WordSpace]) -> None:
+        """Keep the nogoods learned on the same grid and word list, clear them otherwise."""
+        crosses: dict[Coordinates, CrossSide] = {}
+        for word_space in word_spaces:
+            links = grid_links(word_space)
+            for neighbour, position, coordinates in zip(links.neighbours, links.positions, links.coordinates):
+                crosses.setdefault(coordinates, (word_space, position, neighbour))
+        if word_list is not self.word_list or crosses.keys() != self.crosses.keys():
+            self.nogoods.clear()
+            self.by_letter.clear()
+        self.word_list = word_list
+        self.crosses = crosses
+
+    def learn_dead_end(self, word_space: WordSpace, word_list: WordList) -> bool:
+        """
+        Learn the letters that left the word space without options, unless they are too many.
+
+        Its options are given by the letters on its crosses (its pattern) and on the crosses of its unbound
+        neighbours (their possibilities). Failed words of the word space are not letters, they are ignored.
+
+        Returns:
+            True if a nogood was added
+        """
+        if not self._is_wiped_out(word_space, word_list):
+            return False
+        letters = set()
+        links = grid_links(word_space)
+        for neighbour, position, coordinates in zip(links.neighbours, links.positions, links.coordinates):
+            char = word_space.pattern.chars[position]
+            if neighbour.occupied_by is not None and char is not None:
+                letters.add((coordinates, char))
+                continue
+            letters.update(self._letters(neighbour))
+        if not letters or len(letters) > self.max_letters:
+            return False
+        return self.add(frozenset(letters))
+
+    def learn_wipe_out(self, word_space: WordSpace, consistency: ArcConsistency) -> bool:
+        """
+        Learn the letters that wiped out the candidates of the word space, unless they are too many.
+
+        The wipe-out is proven on the word space alone, then with its unbound neighbours and then with theirs,
+        the letters bound on the crosses of these word spaces are to blame.
+
+        Returns:
+            True if a nogood was added
+        """
+        region = {word_space}
+        for _ in range(3):
+            letters = {letter for region_space in region for letter in self._letters(region_space)}
+            if len(letters) > self.max_letters:
+                return False
+            if consistency.wipes_out_locally(region):
+                return bool(letters) and self.add(frozenset(letters))
+            region |= {neighbour for region_space in region for neighbour in grid_links(region_space).neighbours
+                       if neighbour.occupied_by is None}
+        return False
+
+    @staticmethod
+    def _is_wiped_out(word_space: WordSpace, word_list: WordList) -> bool:
+        """Returns True if no word fits the pattern with a possible char on every unbound cross."""
+        word_indices = word_list.pattern_words(word_space.pattern.key())
+        possible = np.ones(len(word_indices), dtype=np.bool_)
+        links = grid_links(word_space)
+        for neighbour, position, other_slot in zip(links.neighbours, links.positions, links.other_slots):
+            if neighbour.occupied_by is not None or neighbour.possibility_matrix is None:
+                continue
+            possibilities = neighbour.possibility_matrix[other_slot]  # type: ignore
+            chars = word_list.chars_at(word_indices, position)
+            possible &= possibilities[chars] > 0  # type: ignore
+        return not possible.any()
+
+    def add(self, nogood: Nogood) -> bool:
+        """Add the nogood, True if it was not known."""
+        if nogood in self.nogoods:
+            self.nogoods.move_to_end(nogood)
+            return False
+        self.nogoods[nogood] = None
+        for letter in nogood:
+            self.by_letter.setdefault(letter, set()).add(nogood)
+        if len(self.nogoods) > self.capacity:
+            dropped, _ = self.nogoods.popitem(last=False)
+            for letter in dropped:
+                self.by_letter[letter].discard(dropped)
+        return True
+
+    def violated(self, word_space: WordSpace) -> Optional[Nogood]:
+        """Returns a nogood all letters of which are bound, checking those with a letter of the word space."""
+        for letter in self._letters(word_space):
+            for nogood in self.by_letter.get(letter, ()):
+                if all(self._bound_char(coordinates) == char for coordinates, char in nogood):
+                    self.nogoods.move_to_end(nogood)
+                    return nogood
+        return None
+
+    def binders(self, nogood: Nogood) -> set[WordSpace]:
+        """Returns the bound word spaces on the crosses of the nogood."""
+        word_spaces = set()
+        for coordinates, _char in nogood:
+            word_space, _position, neighbour = self.crosses[coordinates]
+            for binder in (word_space, neighbour):
+                if binder.occupied_by is not None:
+                    word_spaces.add(binder)
+        return word_spaces
+
+    def _bound_char(self, coordinates: Coordinates) -> Optional[str]:
+        """Returns the char bound to the cross, read from the pattern of its word space."""
+        word_space, position, _neighbour = self.crosses[coordinates]
+        return word_space.pattern.chars[position]
+
+    @staticmethod
+    def _letters(word_space: WordSpace) -> list[Letter]:
+        """Returns the letters bound on the crosses of the word space."""
+        links = grid_links(word_space)
+        chars = word_space.pattern.chars
+        return [(coordinates, char) for coordinates, char
+                in zip(links.coordinates, (chars[position] for position in links.positions)) if char is not None]
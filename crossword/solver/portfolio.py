@@ -0,0 +1,145 @@
+"""
+Module: portfolio
+Defines the Portfolio class, differently seeded and configured solvers racing on one crossword in forked processes.
+"""
+import multiprocessing
+import random
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from crossword.objects import Crossword, WordList
+from crossword.objects.snapshot import CrosswordSnapshot
+
+from .restarts import RestartStrategy
+from .solver import Solver
+
+
+@dataclass(frozen=True)
+class SolverConfig:
+    """Configuration of a member of the portfolio, see Solver.solve_with_restarts."""
+    seed: int
+    arc_consistency: bool = False
+    randomize: float = 0.5
+    budget: int = 500
+    max_solutions: int = 1
+    strategy: RestartStrategy = RestartStrategy.LUBY
+    unit: int = 25
+
+
+# Snapshot of the solution and the counters of a member
+MemberResult = tuple[Optional[CrosswordSnapshot], dict[str, int]]
+
+# Seconds the results of the members stopping at the deadline are awaited after it
+DEADLINE_GRACE = 0.25
+
+# Crossword, word list and deadline of the running solve, inherited by the forked members
+_shared: dict[str, object] = {}
+
+
+def _solve_member(config: SolverConfig) -> MemberResult:
+    """Solve the shared crossword with the configuration, in a forked process."""
+    crossword, word_list, deadline = _shared['crossword'], _shared['word_list'], _shared['deadline']
+    assert isinstance(crossword, Crossword) and isinstance(word_list, WordList)
+    assert deadline is None or isinstance(deadline, float)
+    random.seed(config.seed)
+    np.random.seed(config.seed)
+    solver = Solver(arc_consistency=config.arc_consistency)
+    best = solver.solve_with_restarts(crossword, word_list, budget=config.budget,  # type: ignore
+                                      max_solutions=config.max_solutions, strategy=config.strategy,
+                                      unit=config.unit, randomize=config.randomize, deadline=deadline)
+    if best is None:  # type: ignore
+        return None, solver.counters
+    return crossword.snapshot(solver.score), solver.counters
+
+
+def _score(snapshot: CrosswordSnapshot) -> float:
+    return snapshot.score if snapshot.score is not None else float('-inf')
+
+
+class Portfolio:
+    """
+    Solvers of different seeds and configurations, each in a process of a pool.
+
+    Members are forked after the crossword and the word list are set, so they share the word list
+    (and its memory-mapped indexes) copy-on-write instead of loading or pickling it. Only the snapshot
+    of a solution is sent back and restored to the crossword of the caller.
+    """
+
+    def __init__(self, configs: list[SolverConfig], processes: Optional[int] = None) -> None:
+        if not configs:
+            raise ValueError("Portfolio needs at least one solver configuration")
+        self.configs = configs
+        self.processes = min(processes or multiprocessing.cpu_count(), len(configs))
+        self.score: Optional[float] = None
+        self.counters: dict[str, int] = {}
+        # Members that finished before the solve ended
+        self.finished = 0
+
+    @staticmethod
+    def diversified(count: int, budget: int = 500, max_solutions: int = 1,
+                    randomize: float = 0.5) -> list[SolverConfig]:
+        """
+        Returns count configurations of distinct seeds, every other one with arc consistency.
+
+        The failed-word budget is split among them (each gets at least 1), so the portfolio spends
+        as much as a single solver given the budget.
+        """
+        return [SolverConfig(seed=seed, arc_consistency=seed % 2 == 1,
+                             budget=max(budget // count + (seed < budget % count), 1),
+                             max_solutions=max_solutions, randomize=randomize) for seed in range(count)]
+
+    def solve(self, crossword: Crossword, word_list: WordList, timeout: Optional[float] = None,
+              first_success: bool = True) -> Optional[Crossword]:
+        """
+        Run the members until the first solution, or until all finish, and bind the best solution to the crossword.
+
+        Args:
+            crossword: The crossword puzzle grid, its possibility matrices built
+            word_list: List of available words to use
+            timeout: Seconds to wait for the members, the best solution found by then is taken.
+                Members stop at this deadline by themselves and send back their best solution.
+            first_success: Stop at the first solution instead of waiting for a better score
+
+        Returns:
+            The crossword filled with the best solution, None if no member found one
+
+        Raises:
+            ValueError: If processes cannot be forked on this platform.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        self.score, self.counters, self.finished = None, {}, 0
+        best: Optional[CrosswordSnapshot] = None
+
+        _shared.update(crossword=crossword, word_list=word_list, deadline=deadline)
+        pool = multiprocessing.get_context('fork').Pool(self.processes)
+        try:
+            results = pool.imap_unordered(_solve_member, self.configs)
+            for _ in self.configs:
+                remaining = None if deadline is None else max(deadline + DEADLINE_GRACE - time.monotonic(), 0.0)
+                try:
+                    solution, counters = results.next(timeout=remaining)
+                except multiprocessing.TimeoutError:
+                    break
+                self.finished += 1
+                for name, value in counters.items():
+                    self.counters[name] = self.counters.get(name, 0) + value
+                if solution is None:
+                    continue
+                if best is None or _score(solution) > _score(best):
+                    best = solution
+                if first_success:
+                    break
+        finally:
+            # Members still running are cancelled
+            pool.terminate()
+            pool.join()
+            _shared.clear()
+
+        if best is None:
+            return None
+        self.score = best.score
+        crossword.restore(best, word_list)
+        return crossword
@@ -0,0 +1,58 @@
+"""
+Module: restarts
+Defines the cutoff schedules of restarted solves: the Luby sequence and a geometric one.
+"""
+from enum import Enum
+from itertools import count
+from typing import Iterator
+
+
+class RestartStrategy(Enum):
+    """Schedule of the failed word cutoffs of restarted solves."""
+    LUBY = "luby"
+    GEOMETRIC = "geometric"
+
+
+def luby(index: int) -> int:
+    """
+    Returns the index-th term (from 1) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, ...
+
+    Raises:
+        ValueError: If the index is not positive.
+    """
+    if index < 1:
+        raise ValueError(f"Luby sequence starts at 1, got {index}")
+    while True:
+        # The sequence up to 2^k - 1 is twice the sequence up to 2^(k-1) - 1 followed by 2^(k-1)
+        k = index.bit_length()
+        if index == (1 << k) - 1:
+            return 1 << (k - 1)
+        index -= (1 << (k - 1)) - 1
+
+
+def restart_cutoffs(strategy: RestartStrategy, unit: int, factor: float = 1.5) -> Iterator[int]:
+    """
+    Yields the failed word cutoffs of the restarts, endlessly.
+
+    Args:
+        strategy: schedule of the cutoffs
+        unit: cutoff of the first restart, the Luby sequence is scaled by it
+        factor: growth of the geometric cutoffs
+
+    Raises:
+        ValueError: If the unit is not positive or the geometric factor is below 1.
+    """
+    if unit < 1:
+        raise ValueError(f"Restart unit has to be positive, got {unit}")
+    if strategy == RestartStrategy.LUBY:
+        for index in count(1):
+            yield unit * luby(index)
+    elif strategy == RestartStrategy.GEOMETRIC:
+        if factor < 1:
+            raise ValueError(f"Geometric restart factor has to be at least 1, got {factor}")
+        cutoff = float(unit)
+        while True:
+            yield round(cutoff)
+            cutoff *= factor
+    else:
+        raise ValueError(f"Unknown restart strategy: {strategy}")
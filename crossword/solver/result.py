@@ -0,0 +1,68 @@
+"""
+Module: result
+Defines the limits of a solve and its structured result: why it stopped, the fills found and its counters.
+"""
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Optional, Protocol
+
+from crossword.objects import Word, WordSpace
+
+
+class Cancellation(Protocol):
+    """Cancellation token of a solve, threading.Event and multiprocessing.Event are ones."""
+
+    def is_set(self) -> bool:
+        """Returns True once the solve is to be cancelled."""
+
+
+class StopReason(Enum):
+    """Why a solve stopped."""
+    SOLVED = "solved"
+    # No solution with the initial word
+    EXHAUSTED = "exhausted"
+    FAILED_WORDS = "failed_words"
+    DEADLINE = "deadline"
+    CANCELLED = "cancelled"
+
+
+@dataclass
+class SolveLimits:
+    """Limits of a solve, checked at every step."""
+    max_failed_words: int = 2000
+    # time.monotonic() to stop at
+    deadline: Optional[float] = None
+    cancel: Optional[Cancellation] = None
+
+    def exceeded(self, failed_words: int) -> Optional[StopReason]:
+        """Returns the reason to stop, None if no limit is exceeded."""
+        if failed_words > self.max_failed_words:
+            return StopReason.FAILED_WORDS
+        if self.cancel is not None and self.cancel.is_set():
+            return StopReason.CANCELLED
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return StopReason.DEADLINE
+        return None
+
+
+Fill = dict[WordSpace, Word]
+
+
+@dataclass
+class SolveResult:
+    """
+    Result of a solve, true if the crossword was solved.
+
+    The fill of the solution is also left bound to the crossword. The partial fill is the assignment
+    with the most word spaces filled during the search, the solution itself if there is one.
+    """
+    reason: StopReason
+    fill: Optional[Fill]
+    partial_fill: Fill
+    score: Optional[float]
+    elapsed: float
+    counters: dict[str, int] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return self.fill is not None
@@ -1,20 +1,46 @@
 import random
 import time
+from collections import Counter
 from typing import Optional
 
 import numpy as np
 
-from crossword.objects import WordList, WordSpace
+from crossword.objects import Word, WordList, WordSpace
+from crossword.objects.bitmap import Bitmap
+from crossword.objects.topology import grid_links
+
+from .arc_consistency import ArcConsistency
+from .nogoods import NogoodTable
+from .restarts import RestartStrategy, restart_cutoffs
+from .result import SolveLimits, SolveResult, StopReason
+from .word_space_queue import WordSpaceQueue
 
 
 class Solver:
     """
     A backtracking crossword puzzles word filler that uses priority-based
     word space selection and constraint propagation.
+
+    By default, an assignment updates the possibilities of the crossing word spaces only.
+    With arc_consistency, AC-3 runs over all crosses after each assignment and an assignment
+    that wipes out the candidates of any word space is undone at once. Words are then chosen
+    among the arc consistent candidates only.
+
+    A dead end undoes the last assignment. With backjumping, it jumps back to the most recent assignment
+    to blame for it instead, see _conflict_set.
+
+    Letters on crosses that left a word space without options are learned as nogoods. Assignments
+    completing a nogood are undone at once, also in later solves of the same grid and word list.
+
+    A solve starts from the initial possibilities kept by the word space domains, so solve_with_restarts
+    restarts it on a cutoff schedule without rebuilding them.
+
+    Besides the failed words, a solve is limited by a deadline and a cancellation token, checked at every step.
+    It returns a SolveResult with the best complete and partial fills found by then.
     """
 
-    def __init__(self) -> None:
-        self.max_failed_words = 2000
+    def __init__(self, arc_consistency: bool = False, backjumping: bool = False) -> None:
+        self.limits = SolveLimits()
         self.t0: Optional[float]  = None
         self.t1: Optional[float]  = None
         self.score: Optional[int] = None
@@ -22,8 +48,13 @@ class Solver:
         self.counters: dict[str, int] = {}
         self.reset()
         self.randomize: float = 1.0
+        self.consistency = ArcConsistency() if arc_consistency else None
+        self.backjumping = backjumping
+        # Assigned word spaces to blame for the dead ends of a word space
+        self.conflicts: dict[WordSpace, set[WordSpace]] = {}
+        self.nogoods = NogoodTable()
 
-    def solve(self, crossword, word_list, max_failed_words=2000, randomize=0.5):
+    def solve(self, crossword, word_list, max_failed_words=2000, randomize=0.5, deadline=None, cancel=None):
         """
        Fill the crossword grid with know words using backtracking with priority-based selection.
 
@@ -32,26 +63,90 @@ class Solver:
             word_list: List of available words to use
             max_failed_words: Maximum number of failed attempts before giving up
             randomize: Probability of randomizing word space selection (0-1)
+            deadline: time.monotonic() to give up at
+            cancel: Token to give up once it is set
 
         Returns:
-            List of word spaces if solved, False if no solution found
+            Result of the solve, true if solved
         """
-        self._initialize_solve(crossword, max_failed_words, randomize)
+        self._initialize_solve(crossword, word_list, SolveLimits(max_failed_words, deadline, cancel), randomize)
+        self.nogoods.attach(word_list, crossword.word_spaces)
 
         # Get initial word spaces and assign first word if requested
         word_spaces = self._get_initial_word_spaces(crossword, word_list)
 
+        if self.consistency is not None:
+            if not self.consistency.establish(word_list, crossword.word_spaces):
+                # The initial word is never backtracked
+                self.counters['wipeout'] += 1
+                return self._finalize_solution(crossword, StopReason.EXHAUSTED, self._fill(crossword))
+
         # Main solving loop using backtracking
         return self._backtrack_solve(
             word_spaces, word_list, crossword
         )
 
-    def _initialize_solve(self, crossword, max_failed_words, randomize):
+    def solve_with_restarts(self, crossword, word_list, budget=500, max_solutions=1,
+                            strategy=RestartStrategy.LUBY, unit=25, factor=1.5, randomize=0.5,
+                            deadline=None, cancel=None):
+        """
+        Solve the crossword repeatedly with growing failed word cutoffs, keeping the best scoring solution.
+
+        Args:
+            crossword: The crossword puzzle grid, its possibility matrices built
+            word_list: List of available words to use
+            budget: Maximum number of failed attempts over all the solves
+            max_solutions: Number of solutions to find before stopping, the best of them is returned
+            strategy: Schedule of the cutoffs
+            unit: Cutoff of the first solve, see restart_cutoffs
+            factor: Growth of the geometric cutoffs
+            randomize: Probability of randomizing word space selection (0-1)
+            deadline: time.monotonic() to stop at, the best solution found by then is returned
+            cancel: Token to stop once it is set
+
+        Returns:
+            The crossword with the best solution bound, None if no solution was found
+        """
+        t0 = time.time()
+        counters = Counter(dict.fromkeys(self.counters, 0))
+        counters['restart'] = 0
+        best, solutions, spent = None, 0, 0
+        for cutoff in restart_cutoffs(strategy, unit, factor):
+            if spent >= budget or solutions >= max_solutions:
+                break
+            result = self.solve(crossword, word_list, max_failed_words=min(cutoff, budget - spent),
+                                randomize=randomize, deadline=deadline, cancel=cancel)
+            if result:
+                solutions += 1
+                if best is None or self.score > best.score:
+                    best = crossword.snapshot(self.score)
+            # A solve without failures still takes its share
+            spent += max(self.counters['failed'], 1)
+            counters.update(self.counters)
+            counters['restart'] += 1
+            if result.reason in (StopReason.DEADLINE, StopReason.CANCELLED):
+                break
+
+        self.counters = dict(counters)
+        self.t0, self.t1 = t0, time.time()
+        if best is None:
+            self.score, self.solution = None, None
+            return None
+        crossword.restore(best, word_list)
+        self.score, self.solution = best.score, crossword.word_spaces
+        return crossword
+
+    def _initialize_solve(self, crossword, word_list, limits, randomize):
         """Initialize solver state for a new solve attempt."""
         self.reset()
+        # The word spaces run on the topology of the whole grid
+        crossword.topology()
         crossword.reset()
+        # Unbound word spaces restore their initial possibilities from their domains
+        for word_space in crossword.word_spaces:
+            word_space.update_possibilities(word_list)
         self.randomize = randomize
-        self.max_failed_words = max_failed_words
+        self.limits = limits
         self.t0 = time.time()
 
     def _get_initial_word_spaces(self, crossword, word_list):
@@ -80,60 +175,69 @@ class Solver:
         """
         Main backtracking algorithm template for solving the crossword.
 
-        This implements intelligent backtracking search with:
-        - Priority-based variable ordering (word space selection)
+        This implements backtracking search with:
+        - Priority-based variable ordering (word space selection from a queue re-keyed on bind and unbind)
         - Constraint propagation after each assignment
-        - Multi-step backtracking to escape unpromising branches
-        - Branch jumping to avoid getting stuck in bad search paths
+        - Chronological backtracking, or conflict-directed backjumping to the most recent assignment
+          that caused a dead end
 
         Returns:
-            Solution (list of word spaces) if found, False otherwise
+            Result of the solve
         """
 
         assigned_stack = []  # Stack for backtracking: [(word_space, word), ...]
         current_word_space = None
+        word_spaces = WordSpaceQueue(word_spaces)
         best_remaining = len(word_spaces)
-        consecutive_backtracks = 0  # Track consecutive backtracking to detect stuck situations
+        partial_fill = self._fill(crossword)
+        self.conflicts = {}
 
         while word_spaces or current_word_space:
-            if self._should_terminate():
-                return self._finalize_solution(crossword, False)
+            reason = self.limits.exceeded(self.counters['failed'])
+            if reason is not None:
+                return self._finalize_solution(crossword, reason, partial_fill)
 
             # Select next word space if none is currently being processed
             if current_word_space is None:
                 current_word_space = self._select_next_word_space(word_spaces)
 
                 if current_word_space is None:
-                    # No valid word spaces available - backtrack (potentially multiple steps)
-                    current_word_space = self._backtrack(assigned_stack, word_spaces, word_list)
-                    consecutive_backtracks += 1
+                    # No valid word spaces available - backtrack chronologically
+                    current_word_space = self._backtrack(assigned_stack, word_spaces, word_list,
+                                                         {word_space for word_space, _ in assigned_stack})
                     continue
 
             # Try to assign a word to the current word space
-            best_word = current_word_space.find_best_option(word_list)
+            best_word = current_word_space.find_best_option(word_list, allowed=self._allowed_rows(current_word_space))
 
             if best_word is None:
-                # No valid word found - backtrack (potentially multiple steps)
-                current_word_space = self._backtrack(assigned_stack, word_spaces, word_list)
-                consecutive_backtracks += 1
-
-                # If we're backtracking too much, try more aggressive multi-step backtracking
-                if consecutive_backtracks > 10:
-                    current_word_space = self._backtrack(assigned_stack, word_spaces, word_list,
-                                                         max_backtrack_steps=min(5, len(assigned_stack)))
-                    consecutive_backtracks = 0  # Reset counter after aggressive backtrack
+                # No valid word found - backtrack, or jump back to the most recent assignment to blame
+                if current_word_space.failed_rows is None and \
+                        self.nogoods.learn_dead_end(current_word_space, word_list):
+                    self.counters['learned'] += 1
+                conflict_set = self._conflict_set(current_word_space, word_list, assigned_stack) \
+                    if self.backjumping else set()
+                current_word_space = self._backtrack(assigned_stack, word_spaces, word_list, conflict_set)
+                if current_word_space is None:
+                    # Nothing left to backtrack, there is no solution with the initial word
+                    return self._finalize_solution(crossword, StopReason.EXHAUSTED, partial_fill)
             else:
-                self._assign_word(
+                conflict_set = self._assign_word(
                     current_word_space, best_word, assigned_stack,
                     word_spaces, word_list, best_remaining
                 )
                 current_word_space = None
-                best_remaining = min(best_remaining, len(word_spaces))
-                consecutive_backtracks = 0  # Reset counter on successful assignment
+                if len(word_spaces) < best_remaining:
+                    best_remaining = len(word_spaces)
+                    partial_fill = self._fill(crossword)
 
-        return self._finalize_solution(crossword, True)
+                if conflict_set is not None:
+                    # Fail fast - undo the assignment that led to a dead end
+                    current_word_space = self._backtrack(assigned_stack, word_spaces, word_list, conflict_set)
 
-    def _select_next_word_space(self, word_spaces: list[WordSpace]) -> Optional[WordSpace]:
+        return self._finalize_solution(crossword, StopReason.SOLVED, self._fill(crossword))
+
+    def _select_next_word_space(self, word_spaces: WordSpaceQueue) -> Optional[WordSpace]:
         """
         Select the next word space to fill based on priority heuristics.
 
@@ -146,24 +250,14 @@ class Solver:
         if not word_spaces:
             return None
 
-        # Sort word spaces by solving priority
-        def solving_priority_key(word_space: WordSpace) -> int:
-            return word_space.solving_priority()
-
-        sorted_spaces = sorted(
-            word_spaces,
-            key=solving_priority_key,
-            reverse=False
-        )
-
         choice_index = 0
         # Apply randomization if enabled
         if self.randomize > 0 and random.random() < self.randomize:
             choice_index = np.random.poisson(lam=2)
-            if choice_index > len(sorted_spaces) - 1:
-                choice_index = random.randint(0, len(sorted_spaces) - 1)
+            if choice_index > len(word_spaces) - 1:
+                choice_index = random.randint(0, len(word_spaces) - 1)
 
-        selected_space = sorted_spaces[choice_index]
+        selected_space = word_spaces.smallest(choice_index + 1)[choice_index]
         selected_space.reset_failed_words()
         return selected_space
 
@@ -175,12 +269,13 @@ class Solver:
             word_space: The word space to assign to
             word: The word to assign
             assigned_stack: Stack of assignments for backtracking
-            word_spaces: List of remaining word spaces
+            word_spaces: Queue of remaining word spaces
             word_list: Available words
             best_remaining: Best remaining count so far
 
         Returns:
-            None (indicating to select next word space)
+            Conflict set if the assignment wiped out the candidates of a word space (arc consistency)
+            or completed a nogood, None otherwise
         """
         # Bind word to space and get affected spaces
         affected_spaces = word_space.bind(word)
@@ -189,32 +284,55 @@ class Solver:
         # Update tracking
         assigned_stack.append((word_space, word))
         word_spaces.remove(word_space)
+        word_spaces.touch(affected_spaces)
         self.counters['assign'] += 1
 
         # Progress reporting
         if self.counters['assign'] % 100 == 0:
             self._report_progress(len(word_spaces), best_remaining)
 
+        nogood = self.nogoods.violated(word_space)
+        if nogood is not None:
+            self.counters['nogood'] += 1
+            if self.consistency is not None:
+                self.consistency.push()
+            return self.nogoods.binders(nogood)
+
+        if self.consistency is not None and not self.consistency.assign(word_space, affected_spaces):
+            self.counters['wipeout'] += 1
+            wiped_out = self.consistency.wiped_out
+            if wiped_out is not None and self.nogoods.learn_wipe_out(wiped_out, self.consistency):
+                self.counters['learned'] += 1
+            region = self.consistency.wipe_out_region(wiped_out) \
+                if self.backjumping and wiped_out is not None else None
+            if region is None:
+                # Without a proof, any earlier assignment may share the blame
+                return {assigned_space for assigned_space, _ in assigned_stack}
+            # Only the letters on the crosses of the region are needed for the wipe-out
+            return {binder for region_space in region for binder in self._binders(region_space)}
+        return None
+
     @staticmethod
     def _update_possibilities_affected(affected_word_spaces: list[WordSpace], word_list: WordList):
         """ Propagate constraints to affected spaces """
         for affected_space in affected_word_spaces:
             affected_space.update_possibilities(word_list)
 
-    def _backtrack(self, assigned_stack, word_spaces, word_list, max_backtrack_steps=5):
+    def _backtrack(self, assigned_stack, word_spaces, word_list, conflict_set):
         """
-        Perform intelligent backtracking when no valid assignment is found.
+        Undo the last assignment when no valid assignment is found, or with backjumping,
+        perform conflict-directed backjumping.
 
-        This method can backtrack multiple steps to escape unpromising branches:
-        - Single step: Normal backtracking
-        - Multiple steps: When we detect we're in a bad branch (consecutive failures)
-        - Branch jumping: Skip back to a more promising point in the search tree
+        Assignments after the most recent one in the conflict set did not cause the dead end,
+        they are undone without being marked as failed. The word of the most recent one is marked
+        as failed and the rest of the conflict set is merged into its own, so a later dead end
+        of that word space jumps back further.
 
         Args:
             assigned_stack: Stack of previous assignments
-            word_spaces: List of remaining word spaces
+            word_spaces: Queue of remaining word spaces
             word_list: Available words
-            max_backtrack_steps: Maximum number of steps to backtrack in one go
+            conflict_set: Assigned word spaces that caused the dead end
 
         Returns:
             WordSpace to retry or None if backtracking failed
@@ -225,144 +343,122 @@ class Solver:
             # No more assignments to backtrack - puzzle is unsolvable
             return None
 
-        # Determine how many steps to backtrack based on failure patterns
-        steps_to_backtrack = self._calculate_backtrack_steps(assigned_stack, max_backtrack_steps)
-
-        backtracked_spaces = []
-
-        # Perform multi-step backtracking
-        for _step in range(steps_to_backtrack):
-            if not assigned_stack:
-                break
+        culprit_level = len(assigned_stack) - 1
+        if self.backjumping:
+            levels = {word_space: level for level, (word_space, _word) in enumerate(assigned_stack)}
+            # Without a known culprit, fall back to chronological backtracking
+            culprit_level = max((levels[word_space] for word_space in conflict_set if word_space in levels),
+                                default=culprit_level)
 
+        while len(assigned_stack) > culprit_level:
             # Pop assignment
-            failed_word_space, failed_word = assigned_stack.pop()
+            word_space, word = assigned_stack.pop()
+            if self.consistency is not None:
+                self.consistency.unassign()
 
             # Unbind the word and get affected spaces
-            affected_spaces = failed_word_space.unbind()
-
-            # Mark this word as failed for this space
-            failed_word_space.failed_words_index_list.append(failed_word.index)
-
-            self._update_possibilities_affected([failed_word_space] + affected_spaces, word_list)
-
-            # Add the failed word space back to the list
-            word_spaces.append(failed_word_space)
-            backtracked_spaces.append(failed_word_space)
-
-            self.counters['failed'] += 1
-
-        # Return the earliest backtracked space to retry
-        # This gives us a better chance of finding alternative paths
-        return backtracked_spaces[-1] if backtracked_spaces else None
-
-    def _calculate_backtrack_steps(self, assigned_stack, max_steps):
-        """
-        Calculate how many steps to backtrack based on failure patterns.
-
-        Strategies for detecting unpromising branches:
-        1. Consecutive failures: If recent assignments keep failing
-        2. Low possibility count: If current branch has very few options
-        3. Deep search: If we've gone deep without progress
-
-        Args:
-            assigned_stack: Current assignment stack
-            max_steps: Maximum allowed backtrack steps
-
-        Returns:
-            Number of steps to backtrack (1 to max_steps)
-        """
-        if len(assigned_stack) < 2:
-            return 1
-
-        # Strategy 1: Check for consecutive failures
-        consecutive_failures = self._count_consecutive_failures()
-
-        # Strategy 2: Check depth vs progress ratio
-        current_depth = len(assigned_stack)
-        failure_rate = self.counters['failed'] / max(1, self.counters['assign'])
-
-        # Strategy 3: Check if recent assignments have very few alternatives
-        recent_low_options = self._count_recent_low_option_assignments(assigned_stack)
-
-        # Determine backtrack steps based on heuristics
-        steps = 1  # Default single step
-
-        # Increase steps based on failure patterns
-        if consecutive_failures >= 3:
-            steps = min(3, max_steps)
-        elif failure_rate > 0.3 and current_depth > 10:
-            steps = min(2, max_steps)
-        elif recent_low_options >= 2:
-            steps = min(2, max_steps)
-
-        # Adaptive: backtrack more aggressively as failures increase
-        if self.counters['failed'] > 100:
-            steps = min(steps + 1, max_steps)
-
-        return min(steps, len(assigned_stack), max_steps)
+            affected_spaces = word_space.unbind()
+            self._update_possibilities_affected([word_space] + affected_spaces, word_list)
+            word_spaces.append(word_space)
+            word_spaces.touch([word_space] + affected_spaces)
+
+            if len(assigned_stack) > culprit_level:
+                # Jumped over, its failures were found under different assignments
+                self.conflicts.pop(word_space, None)
+                word_space.reset_failed_words()
+                self.counters['backjump'] += 1
+            else:
+                # Mark this word as failed for this space
+                word_space.add_failed_word(word_list, word)
+                self.conflicts.setdefault(word_space, set()).update(conflict_set - {word_space})
+                self.counters['failed'] += 1
+                return word_space
+        return None
+
+    def _allowed_rows(self, word_space: WordSpace) -> Optional[Bitmap]:
+        """Returns the candidate rows kept by arc consistency for the word space, None without arc consistency."""
+        if self.consistency is None:
+            return None
+        return self.consistency.candidates(word_space)
 
-    def _count_consecutive_failures(self):
+    def _conflict_set(self, word_space: WordSpace, word_list: WordList,
+                      assigned_stack: list[tuple[WordSpace, Word]]) -> set[WordSpace]:
         """
-        Count recent consecutive backtracking events.
-        This helps detect when we're stuck in a bad branch.
+        Returns the assigned word spaces that left the word space without options: those crossing it bind
+        its pattern, those crossing the unbound neighbours whose possibilities removed its last words
+        (see _wiping_neighbours) bind these possibilities. The conflicts merged from its earlier
+        failures are taken over. If words were left, arc consistency removed them and all assignments are to blame.
         """
-        # This is a simplified version - in practice you might want to
-        # track failure history more sophisticated
-        return min(self.counters['backtrack'] % 10, 5)
+        conflict_set = self.conflicts.pop(word_space, set())
+        wiping = self._wiping_neighbours(word_space, word_list)
+        if wiping is None:
+            return conflict_set | {assigned_space for assigned_space, _ in assigned_stack}
+        for constrained in [word_space] + wiping:
+            conflict_set |= self._binders(constrained)
+        return conflict_set
 
     @staticmethod
-    def _count_recent_low_option_assignments(assigned_stack, lookback=3):
+    def _wiping_neighbours(word_space: WordSpace, word_list: WordList) -> Optional[list[WordSpace]]:
         """
-        Count how many recent assignments were made to word spaces with very few options.
-        This indicates we might be in an over-constrained branch.
+        List the unbound neighbours whose possibilities removed the words fitting the pattern of the word space
+        that did not fail, leaving no option.
 
-        Args:
-            assigned_stack: Current assignments
-            lookback: How many recent assignments to check
+        Crosses are taken in order, a neighbour is listed only if its possibilities removed some word
+        the previous ones left. Empty if the pattern and the failed words leave no word at all.
 
         Returns:
-            Count of recent low-option assignments
+            The neighbours, None if some word is left on all the crosses
         """
-        if len(assigned_stack) < lookback:
-            return 0
-
-        low_option_count = 0
-        # Check the last few assignments
-        for i in range(min(lookback, len(assigned_stack))):
-            word_space, _word = assigned_stack[-(i + 1)]
-            # Heuristic: if a word space had very few failed words,
-            # it probably had few options when we assigned to it
-            if len(word_space.failed_words_index_list) <= 2:
-                low_option_count += 1
+        word_indices = word_list.pattern_words_without_failed(word_space.pattern.key(),
+                                                              failed_rows=word_space.failed_rows)
+        wiping = []
+        links = grid_links(word_space)
+        for neighbour, position, other_slot in zip(links.neighbours, links.positions, links.other_slots):
+            if len(word_indices) == 0:
+                break
+            if neighbour.occupied_by is not None or neighbour.possibility_matrix is None:
+                continue
+            possibilities = neighbour.possibility_matrix[other_slot]  # type: ignore
+            possible = possibilities[word_list.chars_at(word_indices, position)] > 0  # type: ignore
+            if not possible.all():  # type: ignore
+                wiping.append(neighbour)
+                word_indices = word_indices[possible]  # type: ignore
+        return wiping if len(word_indices) == 0 else None
 
-        return low_option_count
+    @staticmethod
+    def _binders(word_space: WordSpace) -> set[WordSpace]:
+        """Returns the assigned word spaces crossing the word space, they bind the letters on its crosses."""
+        return {neighbour for neighbour in grid_links(word_space).neighbours if neighbour.occupied_by is not None}
 
-    def _should_terminate(self):
-        """Check if solving should be terminated due to too many failures."""
-        return self.counters['failed'] > self.max_failed_words
+    @staticmethod
+    def _fill(crossword):
+        """Returns the words bound to the word spaces of the crossword."""
+        return {word_space: word_space.occupied_by for word_space in crossword.word_spaces
+                if word_space.occupied_by is not None}
 
-    def _finalize_solution(self, crossword, solution_found):
+    def _finalize_solution(self, crossword, reason, partial_fill):
         """
         Finalize the solving process and return results.
 
         Args:
             crossword: The crossword object
-            solution_found: Whether a solution was found
+            reason: Why the solve stopped
+            partial_fill: Fill with the most word spaces filled during the solve
 
         Returns:
-            Solution or False
+            Result of the solve
         """
         self.t1 = time.time()
 
-        if solution_found:
+        if reason == StopReason.SOLVED:
             self.score = crossword.evaluate_score()
             self.solution = crossword.word_spaces
-            return crossword.word_spaces
-
-        self.score = None
-        self.solution = None
-        return False
+        else:
+            self.score = None
+            self.solution = None
+        return SolveResult(reason=reason, fill=partial_fill if reason == StopReason.SOLVED else None,
+                           partial_fill=partial_fill, score=self.score, elapsed=self.time_elapsed(),
+                           counters=dict(self.counters))
 
     def _report_progress(self, remaining_spaces, best_remaining):
         """Report solving progress."""
@@ -384,4 +480,5 @@ class Solver:
         """Reset solver state for a new solving attempt."""
         self.score = 0
         self.solution = None
-        self.counters = {'assign': 0, 'backtrack': 0, 'failed': 0}
+        self.counters = {'assign': 0, 'backtrack': 0, 'backjump': 0, 'failed': 0,
+                         'wipeout': 0, 'learned': 0, 'nogood': 0}
@@ -0,0 +1,140 @@
+"""
+Module: word_space_queue
+Defines the WordSpaceQueue class, open word spaces of a crossword ordered by their solving priority.
+"""
+import heapq
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from crossword.objects import WordSpace
+from crossword.objects.topology import grid_links
+
+
+class WordSpaceQueue:
+    """
+    Open word spaces in a heap keyed by their solving priority, lowest first.
+
+    A priority changes only when the possibilities of a crossing word space are updated, so only word spaces
+    touched by a bind or unbind are re-keyed. A re-keyed word space gets a new version and a new heap entry,
+    entries with an older version are skipped when popped.
+
+    The priority is that of WordSpace.solving_priority, computed from the row maxima of the possibility matrices
+    cached per matrix version. Word spaces are numbered when first seen and handled by their numbers after.
+    """
+
+    def __init__(self, word_spaces: Iterable[WordSpace] = ()) -> None:
+        self.word_spaces: list[WordSpace] = []
+        self.indices: dict[WordSpace, int] = {}
+        # Entries (priority, version, index of the word space), the version breaks ties in insertion order
+        self.heap: list[tuple[int, int, int]] = []
+        # Version of the current entry of every word space, 0 if it is not open
+        self.versions: list[int] = []
+        self.version = 0
+        self.size = 0
+        # (neighbour, row of the cross in its possibility matrix) of every cross of a word space
+        self.neighbours: list[Optional[list[tuple[int, int]]]] = []
+        # (possibility matrix version, row maxima) of every word space
+        self.maxima: list[tuple[int, Optional[npt.NDArray[np.int32]]]] = []
+        for word_space in word_spaces:
+            self.append(word_space)
+
+    def append(self, word_space: WordSpace) -> None:
+        """Open the word space."""
+        index = self._index(word_space)
+        if not self.versions[index]:
+            self.size += 1
+        self._push(index)
+
+    def remove(self, word_space: WordSpace) -> None:
+        """
+        Close the word space, its entry is left in the heap.
+
+        Raises:
+            ValueError: If the word space is not open.
+        """
+        index = self.indices.get(word_space)
+        if index is None or not self.versions[index]:
+            raise ValueError(f"WordSpace {word_space} is not open")
+        self.versions[index] = 0
+        self.size -= 1
+
+    def touch(self, updated_spaces: Iterable[WordSpace]) -> None:
+        """Re-key the open word spaces among the updated ones and their neighbours."""
+        touched = set()
+        for updated_space in updated_spaces:
+            index = self._index(updated_space)
+            touched.add(index)
+            touched.update(neighbour for neighbour, _row in self._neighbours(index))
+        for index in touched:
+            if self.versions[index]:
+                self._push(index)
+
+    def smallest(self, count: int) -> list[WordSpace]:
+        """Returns up to count open word spaces of the lowest priority, in priority order."""
+        entries: list[tuple[int, int, int]] = []
+        while self.heap and len(entries) < count:
+            entry = heapq.heappop(self.heap)
+            if self.versions[entry[2]] == entry[1]:
+                entries.append(entry)
+        for entry in entries:
+            heapq.heappush(self.heap, entry)
+        return [self.word_spaces[index] for _priority, _version, index in entries]
+
+    def _index(self, word_space: WordSpace) -> int:
+        index = self.indices.get(word_space)
+        if index is None:
+            index = self.indices[word_space] = len(self.word_spaces)
+            self.word_spaces.append(word_space)
+            self.versions.append(0)
+            self.neighbours.append(None)
+            self.maxima.append((-1, None))
+        return index
+
+    def _neighbours(self, index: int) -> list[tuple[int, int]]:
+        neighbours = self.neighbours[index]
+        if neighbours is None:
+            links = grid_links(self.word_spaces[index])
+            neighbours = self.neighbours[index] = [
+                (self._index(neighbour), other_slot)
+                for neighbour, other_slot in zip(links.neighbours, links.other_slots)
+            ]
+        return neighbours
+
+    def _push(self, index: int) -> None:
+        self.version += 1
+        self.versions[index] = self.version
+        heapq.heappush(self.heap, (self._priority(index), self.version, index))
+        if len(self.heap) > 4 * self.size + 16:
+            # Drop the outdated entries
+            self.heap = [entry for entry in self.heap if self.versions[entry[2]] == entry[1]]
+            heapq.heapify(self.heap)
+
+    def _priority(self, index: int) -> int:
+        """Returns the least of the maximum possibilities of the unbound neighbours on their crosses."""
+        priorities = [int(self._maxima(neighbour)[row]) for neighbour, row in self._neighbours(index)  # type: ignore
+                      if self.word_spaces[neighbour].occupied_by is None]
+        return min(priorities, default=0)
+
+    def _maxima(self, index: int) -> npt.NDArray[np.int32]:
+        """Returns the row maxima of the possibility matrix of the word space."""
+        word_space = self.word_spaces[index]
+        version, maxima = self.maxima[index]
+        if version != word_space.possibility_matrix_version or maxima is None:
+            assert word_space.possibility_matrix is not None
+            maxima = word_space.possibility_matrix.max(axis=1, initial=0)  # type: ignore
+            self.maxima[index] = word_space.possibility_matrix_version, maxima  # type: ignore
+        return maxima  # type: ignore
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[WordSpace]:
+        return iter([self.word_spaces[index] for index, version in enumerate(self.versions) if version])
+
+    def __contains__(self, word_space: object) -> bool:
+        if not isinstance(word_space, WordSpace):
+            return False
+        index = self.indices.get(word_space)
+        return index is not None and bool(self.versions[index])
@@ -2,7 +2,6 @@
 
 import cProfile
 import json
-import pickle
 import time
 from pathlib import Path
 
@@ -18,12 +17,11 @@ Path("cache").mkdir(parents=True, exist_ok=True)
 
 start = time.perf_counter()
 wordlist_filename = Path('individual_words.pickle.gzip')
-word_list_cache = Path("cache",f"wordlist_{wordlist_filename.stem}.pkl")
+word_list_cache = Path("cache",f"wordlist_{wordlist_filename.stem}.idx")
 word_list = None
 if word_list_cache.exists() and word_list_cache.is_file():
     print(f"Loading WordList from cache {word_list_cache}")
-    with word_list_cache.open('rb') as f:
-        word_list = pickle.load(f)
+    word_list = WordList.from_file(word_list_cache)
 else:
     words_df = pd.read_pickle(wordlist_filename, compression='gzip')
     # words_df = pd.read_pickle('./words/cs/general_words_matrix.pickle.gzip', compression='gzip')  # 'cs'
@@ -41,9 +39,7 @@ else:
     start = time.perf_counter()
     # Build WordList from Dataframe
     word_list = WordList(words_df=words_df, language='cs')
-
-    with word_list_cache.open('wb') as f:
-        pickle.dump(word_list, f, protocol=pickle.HIGHEST_PROTOCOL)
+    word_list.save(word_list_cache)
 
 print(f"  WordList in {round(-start + (time.perf_counter()), 2)}s")
 
@@ -90,40 +86,39 @@ original_word_spaces = crossword.word_spaces
 
 
 max_score = -99999
-max_crossword = None
+# Words of the best solution, restored to the crossword at the end
+best_snapshot = None
 times_to_solve = []
 success_counter = 0
 failure_counter = 0
 for i in range(30):
     start = time.perf_counter()
-    #cProfile.run('word_spaces = solver.solve(crossword, word_list, randomize=0, max_failed_words=200)', 'profiles/restats_13005e_20h')
-    word_spaces = solver.solve(crossword, word_list, randomize=1.0, max_failed_words=200)
+    #cProfile.run('result = solver.solve(crossword, word_list, randomize=0, max_failed_words=200)', 'profiles/restats_13005e_20h')
+    result = solver.solve(crossword, word_list, randomize=1.0, max_failed_words=200)
     time_to_solve = -start + (time.perf_counter())
     times_to_solve.append(time_to_solve)
-    if crossword.is_success():
+    if result:
         success_counter += 1
-        print(f"Success, Score: {solver.score}")
-        if crossword.evaluate_score() > max_score:
-            max_score = crossword.evaluate_score()
-            max_crossword = crossword.get_copy()
+        print(f"Success, Score: {result.score}")
+        if result.score > max_score:
+            max_score = result.score
+            best_snapshot = crossword.snapshot(max_score)
     else:
         failure_counter += 1
-        print(f"Failed: {solver.score}")
-
-    crossword.reset()
-    crossword.build_possibility_matrix(word_list)
+        print(f"Failed: {result.reason.value}, {len(result.partial_fill)} of {len(crossword.word_spaces)} filled")
 
 
 average_time_to_solve = np.average(np.array(times_to_solve))
 print(f"{success_counter} from {success_counter + failure_counter} ok")
 print(f"Average time to solve {average_time_to_solve}")
 
-if max_crossword is None:
+if best_snapshot is None:
     print(crossword)
     print(f"No solutions found")
 else:
-    print(f"Score: {max_crossword.evaluate_score()}")
-    print(max_crossword)
-    # print(f"As json", max_crossword.to_json(True))
+    crossword.restore(best_snapshot, word_list)
+    print(f"Score: {crossword.evaluate_score()}")
+    print(crossword)
+    # print(f"As json", crossword.to_json(True))
     with open('out_crossword.json', 'w') as json_out:
         json_out.write(json.dumps(json.loads(crossword.to_json()), sort_keys=True, indent=4))
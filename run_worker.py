@@ -14,7 +14,9 @@ from faktory import Worker
 
 from config import ENV
 from crossword.objects import Crossword, WordList
+from crossword.objects.snapshot import PropagationCache
 from crossword.solver import Solver
+from crossword.solver.portfolio import Portfolio
 
 
 # Quick and dirty description filter
@@ -48,11 +50,19 @@ logger.info("Server starting: loading general_words_matrix")
 lang = 'cs'
 # general_words_matrix: word_id, word, description, meta...
 general_words_matrix_path = Path('words', lang, 'general_words_matrix.pickle.gzip')
-general_words_matrix = pd.read_pickle(general_words_matrix_path, compression='gzip')
+# WordList index built from the general words matrix, memory-mapped and shared by all workers on the host
+word_list_cache = Path('cache', f'general_words_matrix_{lang}.idx')
+word_list = None
+if word_list_cache.is_file() and word_list_cache.stat().st_mtime >= general_words_matrix_path.stat().st_mtime:
+    start = time.perf_counter()
+    word_list = WordList.from_file(word_list_cache)
+    logger.debug(f"  General wordlist opened from {word_list_cache} in {round(-start + (time.perf_counter()), 2)}s")
+else:
+    general_words_matrix = pd.read_pickle(general_words_matrix_path, compression='gzip')
 
-general_words_matrix = general_words_matrix.apply(shorten_description_row, axis=1)
-general_words_matrix = general_words_matrix[general_words_matrix['word_description_text'] != ""]
-logger.info("Server starting: general_words_matrix loaded")
+    general_words_matrix = general_words_matrix.apply(shorten_description_row, axis=1)
+    general_words_matrix = general_words_matrix[general_words_matrix['word_description_text'] != ""]
+    logger.info("Server starting: general_words_matrix loaded")
 
 logger.info("Server starting: loading general_categorization_matrix")
 # general_categorization_matrix: word_id, categorization
@@ -64,11 +74,17 @@ logger.info("Server starting: general_categorization_matrix loaded")
 # general_words_matrix = general_words_matrix.sample(10000, random_state=1)
 # general_categorization_matrix = general_categorization_matrix.sample(10000, random_state=1)
 
-logger.info("Server starting: parsing General wordlist")
-start = time.perf_counter()
-word_list = WordList(words_df=general_words_matrix, language='cs')
-logger.debug(f"  General wordlist loaded in {round(-start + (time.perf_counter()), 2)}s")
+if word_list is None:
+    logger.info("Server starting: parsing General wordlist")
+    start = time.perf_counter()
+    word_list = WordList(words_df=general_words_matrix, language='cs')
+    logger.debug(f"  General wordlist loaded in {round(-start + (time.perf_counter()), 2)}s")
+    word_list_cache.parent.mkdir(parents=True, exist_ok=True)
+    word_list.save(word_list_cache)
+word_list.pattern_cache.resize(int(ENV.get('CROSSWORD_PATTERN_CACHE_MB') or 64) * 2 ** 20)
 logger.info("Server starting: General wordlist ready")
+# Possibilities of the grids solved before, restored for tasks on the same grid
+propagation_cache = PropagationCache()
 
 ##############################
 logger.info("Server ready")
@@ -88,35 +104,54 @@ def generate_crossword(crossword_task):
     start = time.perf_counter()
     # individual score (vector of wordScore)
     individual_score = general_categorization_matrix.loc[:, user_vector.index].dot(user_vector).rename('score')
-    # individual score with word id (vector of wordId,wordScore)
-    individual_score_df = pd.concat([general_categorization_matrix.loc[:, 'word_concept_id'], individual_score],
-                                    axis=1).set_index('word_concept_id')
-    logger.debug(f"  individual_score_df in {round(-start + (time.perf_counter()), 2)}s")
+    # individual score indexed by word id (vector of wordId,wordScore)
+    individual_score.index = general_categorization_matrix['word_concept_id']
+    logger.debug(f"  individual_score in {round(-start + (time.perf_counter()), 2)}s")
 
     start = time.perf_counter()
-    word_list.use_score_vector(individual_score_df)
-    logger.debug(f"word_list.use_score_vector in {round(-start + (time.perf_counter()), 2)}s")
+    # Scores of this task only, the shared word_list keeps its own
+    task_word_list = word_list.with_scores(individual_score)
+    logger.debug(f"word_list.with_scores in {round(-start + (time.perf_counter()), 3)}s")
 
     start = time.perf_counter()
-    for ws in crossword.word_spaces:
-        ws.build_possibility_matrix(word_list)
-    logger.debug(f"build_possibility_matrix in {round(-start + (time.perf_counter()), 2)}s")
-
-    max_score = -99999
-    max_crossword = None
-    for i in range(int(ENV['CROSSWORD_REGENERATE_COUNT']) or 10):
-        start = time.perf_counter()
-        word_spaces = solver.solve(crossword,
-                                   word_list,
-                                   randomize=0.05,
-                                   max_failed_words=int(ENV['CROSSWORD_MAX_FAILED_WORDS']) or 50
-                                   )
-        logger.debug(f"Score: {solver.score} in {round(-start + (time.perf_counter()), 2)}s")
-
-        if crossword.is_success() and crossword.evaluate_score() > max_score:
-            max_score = crossword.evaluate_score()
-            max_crossword = crossword.get_copy()
-        crossword.reset()
+    restored = propagation_cache.build(crossword.word_spaces, task_word_list)
+    logger.debug(f"build_possibility_matrix in {round(-start + (time.perf_counter()), 2)}s"
+                 f"{' (restored)' if restored else ''}")
+
+    regenerate_count = int(ENV['CROSSWORD_REGENERATE_COUNT']) or 10
+    max_failed_words = int(ENV['CROSSWORD_MAX_FAILED_WORDS']) or 50
+    portfolio_processes = int(ENV.get('CROSSWORD_PORTFOLIO_PROCESSES') or 1)
+    # Stop solving in time to send the result before the Faktory reservation expires
+    solve_timeout = float(ENV.get('CROSSWORD_SOLVE_TIMEOUT') or 0) or None
+    start = time.perf_counter()
+    if portfolio_processes > 1:
+        # Differently seeded solvers race on all cores, sharing the budget
+        portfolio = Portfolio(Portfolio.diversified(portfolio_processes,
+                                                    budget=regenerate_count * max_failed_words,
+                                                    max_solutions=regenerate_count,
+                                                    randomize=0.05),
+                              processes=portfolio_processes)
+        max_crossword = portfolio.solve(crossword, task_word_list, timeout=solve_timeout, first_success=False)
+        max_score = portfolio.score
+        logger.debug(f"Score: {max_score} from {portfolio.finished} solvers "
+                     f"in {round(-start + (time.perf_counter()), 2)}s")
+    else:
+        # Restarts share one budget of failed words, the first ones are cut off early
+        max_crossword = solver.solve_with_restarts(crossword,
+                                                   task_word_list,
+                                                   budget=regenerate_count * max_failed_words,
+                                                   max_solutions=regenerate_count,
+                                                   unit=max(max_failed_words // 2, 1),
+                                                   randomize=0.05,
+                                                   deadline=(time.monotonic() + solve_timeout
+                                                             if solve_timeout is not None else None)
+                                                   )
+        max_score = solver.score
+        logger.debug(f"Score: {max_score} after {solver.counters['restart']} restarts "
+                     f"in {round(-start + (time.perf_counter()), 2)}s")
+    cache = word_list.pattern_cache
+    logger.debug(f"Pattern cache: {len(cache)} entries, {round(cache.size_bytes / 2 ** 20, 1)}MiB, "
+                 f"hit rate {round(cache.stats.hit_rate(), 3)}, {cache.stats.evictions} evictions")
     # Send the crossword back
     if 'webhook' in crossword_task:
         url = crossword_task['webhook']
@@ -0,0 +1,15 @@
+import pytest
+
+from tests.helpers import SQUARE_LABELS, square, word_list_of
+
+
+@pytest.fixture
+def square_words():
+    """Two letter words of SQUARE_LABELS."""
+    return word_list_of(SQUARE_LABELS)
+
+
+@pytest.fixture
+def square_crossword(square_words):
+    """2x2 square crossword with possibility matrices built from square_words."""
+    return square(square_words)
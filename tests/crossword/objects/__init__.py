@@ -1,2 +1,12 @@
+from .test_bitmap import TestBitmap
 from .test_cross import TestCross
+from .test_domain import TestDomain
+from .test_hunspell import TestHunspell
+from .test_pattern import TestPattern
+from .test_pattern_cache import TestPatternCache
+from .test_snapshot import TestSnapshot
+from .test_split import TestSplit
+from .test_topology import TestTopology
+from .test_word_list import TestWordList
+from .test_word_list_writer import TestWordListWriter
 from .test_word_space import TestWordSpace
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from crossword.objects import bitmap
+
+
+class TestBitmap:
+    """Test suite for packed bitmaps."""
+
+    @pytest.mark.parametrize("size", [1, 63, 64, 65, 200])
+    def test_pack_roundtrip(self, size):
+        """Test packed flags unpack to the same indices."""
+        flags = np.zeros(size, dtype=bool)
+        flags[::3] = True
+        flags[-1] = True
+
+        packed = bitmap.pack(flags)
+
+        assert packed.dtype == np.uint64
+        assert packed.shape == (-(-size // 64),)
+        indices = bitmap.bit_indices(packed, np.arange(packed.size))
+        assert indices.tolist() == np.flatnonzero(flags).tolist()
+
+    def test_pack_last_axis(self):
+        """Test only the last axis is packed."""
+        flags = np.zeros((2, 3, 70), dtype=bool)
+        flags[1, 2, 69] = True
+
+        packed = bitmap.pack(flags)
+
+        assert packed.shape == (2, 3, 2)
+        assert packed[1, 2, 1] == 1 << 5
+        assert packed.sum() == 1 << 5
+
+    def test_and_indices(self):
+        """Test intersection of several bitmaps."""
+        rng = np.random.default_rng(0)
+        flags = rng.random((3, 500)) < 0.5
+        flags[0, 400:] = False
+
+        indices = bitmap.and_indices(bitmap.pack(flags))
+
+        assert indices.tolist() == np.flatnonzero(flags.all(axis=0)).tolist()
+
+    def test_and_indices_empty(self):
+        """Test intersection of disjoint bitmaps."""
+        flags = np.zeros((2, 100), dtype=bool)
+        flags[0, :50] = True
+        flags[1, 50:] = True
+
+        assert bitmap.and_indices(bitmap.pack(flags)).size == 0
+
+    @pytest.mark.parametrize("size", [1, 64, 130])
+    def test_unset_bits(self, size):
+        """Test set bits are told apart from the unset ones, in any order of the indices."""
+        words = bitmap.empty(size)
+        for index in {0, size // 2, size - 1}:
+            bitmap.set_bit(words, index)
+
+        indices = np.arange(size)[::-1]
+        unset = bitmap.unset_bits(words, indices)
+
+        assert sorted(indices[~unset].tolist()) == sorted({0, size // 2, size - 1})
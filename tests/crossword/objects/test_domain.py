@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from crossword.objects import Direction, Word, WordList, WordSpace
+from crossword.objects.length_index import LengthIndex
+from tests.helpers import cross_pattern, words_frame
+
+
+class TestDomain:
+    """Test suite for the incremental candidates of a WordSpace."""
+
+    LABELS = ['abc', 'abd', 'bad', 'bcd', 'cab', 'cad', 'dab', 'dad', 'ace', 'bee', 'dec', 'cee', 'eba', 'ebb']
+
+    @pytest.fixture
+    def words_df(self):
+        """Sample DataFrame of three letter words."""
+        return words_frame(self.LABELS)
+
+    @pytest.fixture
+    def grid(self):
+        """Horizontal WordSpace crossed by three vertical ones."""
+        horizontal = WordSpace((0, 1), 3, Direction.HORIZONTAL)
+        verticals = [WordSpace((x, 0), 3, Direction.VERTICAL) for x in range(3)]
+        for vertical in verticals:
+            horizontal.add_cross(vertical)
+            vertical.add_cross(horizontal)
+        return horizontal, verticals
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_random_bind_unbind(self, words_df, grid, seed):
+        """Test the candidates and the matrix follow binds and unbinds in any order."""
+        word_list = WordList(words_df, language="en")
+        reference = WordList(words_df, language="en")
+        horizontal, verticals = grid
+        horizontal.build_possibility_matrix(word_list)
+        rng = random.Random(seed)
+
+        for _ in range(40):
+            vertical = rng.choice(verticals)
+            if vertical.occupied_by is None:
+                vertical.bind(Word(rng.choice(self.LABELS)))
+            else:
+                vertical.unbind()
+            horizontal.update_possibilities(word_list)
+
+            mask, chars = cross_pattern(horizontal)
+            length_index = word_list.length_index(3)
+            rows = LengthIndex.bitmap_rows(horizontal.domain.rows)
+            assert sorted(length_index.word_indices[rows].tolist()) == sorted(
+                reference.words_indices(mask, chars).tolist())
+            # Rows of the bound crosses are not updated
+            unbound = [index for index, vertical in enumerate(verticals) if vertical.occupied_by is None]
+            assert (horizontal.possibility_matrix[unbound] ==
+                    reference.candidate_char_vectors(mask, chars, tuple(unbound))).all()
+
+        for vertical in verticals:
+            if vertical.occupied_by is not None:
+                vertical.unbind()
+        horizontal.update_possibilities(word_list)
+        assert horizontal.domain.trail == []
+        assert (horizontal.possibility_matrix == reference.candidate_char_vectors(*cross_pattern(horizontal),
+                                                                                   (0, 1, 2))).all()
+
+    def test_unknown_char(self, words_df, grid):
+        """Test a char out of the alphabet leaves no candidates."""
+        word_list = WordList(words_df, language="en")
+        horizontal, verticals = grid
+        horizontal.build_possibility_matrix(word_list)
+
+        verticals[0].bind(Word('xyz'))
+        horizontal.update_possibilities(word_list)
+
+        assert not horizontal.domain.rows.any()
+        assert not horizontal.possibility_matrix[1:].any()
@@ -0,0 +1,72 @@
+import pytest
+
+from crossword.objects.language import Affixes, hunspell_words, read_dictionary
+
+AFFIXES = """SET UTF-8
+FLAG char
+
+# Nouns
+SFX A Y 2
+SFX A 0 y .
+SFX A a y [^ch]a
+
+SFX B N 1
+SFX B 0 em [^aeiouy]
+
+PFX N Y 1
+PFX N 0 ne .
+"""
+
+DICTIONARY = """4
+chata/A
+hrad/ABN
+dobrý/N
+1\\/2
+"""
+
+
+class TestHunspell:
+    """Test suite for reading Hunspell dictionaries."""
+
+    @pytest.fixture
+    def dictionary(self, tmp_path):
+        """Paths of a small .dic and .aff file."""
+        (tmp_path / "test.aff").write_text(AFFIXES, encoding="utf-8")
+        (tmp_path / "test.dic").write_text(DICTIONARY, encoding="utf-8")
+        return tmp_path / "test.dic", tmp_path / "test.aff"
+
+    def test_read_dictionary(self, dictionary):
+        """Test entries are read without the count line, with escaped slashes."""
+        dic_path, _aff_path = dictionary
+
+        assert list(read_dictionary(dic_path)) == [('chata', 'A'), ('hrad', 'ABN'), ('dobrý', 'N'), ('1/2', '')]
+
+    def test_expand(self, dictionary):
+        """Test suffixes, prefixes and their cross product, with conditions and stripping."""
+        affixes = Affixes.read(dictionary[1])
+
+        assert affixes.expand('chata', 'A') == ['chata', 'chatay', 'chaty']
+        assert affixes.expand('hrad', 'ABN') == ['hrad', 'hrady', 'hradem', 'nehrad', 'nehrady']
+        assert affixes.expand('dobrý', 'N') == ['dobrý', 'nedobrý']
+        assert affixes.expand('dobrý', '') == ['dobrý']
+
+    def test_split_flags(self):
+        """Test flags are split according to the flag type."""
+        assert Affixes('utf-8', 'char', {}).split_flags('AB') == ['A', 'B']
+        assert Affixes('utf-8', 'long', {}).split_flags('AaBb') == ['Aa', 'Bb']
+        assert Affixes('utf-8', 'num', {}).split_flags('1,20') == ['1', '20']
+
+    def test_hunspell_words(self, dictionary):
+        """Test only suitable forms are read, sharing the concept of their stem."""
+        words = list(hunspell_words(*dictionary, locale_code='cs', max_length=6))
+
+        assert ('chaty', 'chata', 0) in words
+        assert ('nehrad', 'hrad', 1) in words
+        # Too long, and with letters out of the alphabet
+        assert all(label != 'nehrady' and label != '1/2' for label, _description, _concept_id in words)
+
+    def test_hunspell_words_without_affixes(self, dictionary):
+        """Test only the stems are read without the .aff file."""
+        words = list(hunspell_words(dictionary[0], None, locale_code='cs'))
+
+        assert words == [('chata', 'chata', 0), ('hrad', 'hrad', 1), ('dobrý', 'dobrý', 2)]
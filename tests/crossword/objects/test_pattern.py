@@ -0,0 +1,60 @@
+from crossword.objects import Direction, Mask, Word, WordSpace
+from crossword.objects.pattern import (Pattern, key_length, key_positions,
+                                       pattern_key)
+from tests.helpers import cross_pattern
+
+
+class TestPattern:
+    """Test suite for pattern keys."""
+
+    def test_pattern_key(self):
+        """Test the key holds the length, bound positions and chars."""
+        key = pattern_key(Mask([False, True, False, True]), Word(['c', 'h']))
+
+        assert key == (0b11010, ('c', 'h'))
+        assert key_length(key) == 4
+        assert key_positions(key).tolist() == [1, 3]
+
+    def test_set_char(self):
+        """Test the key follows bound and unbound chars."""
+        pattern = Pattern(4)
+        assert pattern.key() == pattern_key(Mask([False] * 4), Word([]))
+
+        pattern.set_char(3, 'x')
+        pattern.set_char(0, 'ch')
+        assert pattern.key() == pattern_key(Mask([True, False, False, True]), Word(['ch', 'x']))
+
+        pattern.set_char(0, None)
+        assert pattern.key() == pattern_key(Mask([False, False, False, True]), Word(['x']))
+
+    def test_key_is_reused(self):
+        """Test the key is built once until a char changes."""
+        pattern = Pattern(3)
+        pattern.set_char(1, 'a')
+
+        assert pattern.key() is pattern.key()
+
+    def test_word_space_pattern(self):
+        """Test word space patterns follow binds and unbinds of crossing word spaces."""
+        horizontal = WordSpace((0, 1), 3, Direction.HORIZONTAL)
+        first = WordSpace((0, 0), 3, Direction.VERTICAL)
+        second = WordSpace((2, 0), 3, Direction.VERTICAL)
+        for vertical in (first, second):
+            horizontal.add_cross(vertical)
+            vertical.add_cross(horizontal)
+
+        def assert_patterns():
+            for word_space in (horizontal, first, second):
+                assert word_space.pattern.key() == pattern_key(*cross_pattern(word_space))
+
+        first.bind(Word('abc'))
+        assert horizontal.pattern.key() == pattern_key(Mask([True, False, False]), Word(['b']))
+        assert_patterns()
+        horizontal.bind(Word('bed'))
+        assert_patterns()
+        first.unbind()
+        assert first.pattern.key() == pattern_key(Mask([False, True, False]), Word(['b']))
+        assert_patterns()
+        horizontal.unbind()
+        assert_patterns()
+        assert horizontal.pattern.key() == pattern_key(Mask([False] * 3), Word([]))
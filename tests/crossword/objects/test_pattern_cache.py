@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from crossword.objects.pattern_cache import ENTRY_OVERHEAD_BYTES, PatternCache
+
+
+class TestPatternCache:
+    """Test suite for the size-bounded pattern cache."""
+
+    @staticmethod
+    def array(size):
+        """Array taking size bytes."""
+        return np.zeros(size, dtype=np.uint8)
+
+    def test_get_computes_once(self):
+        """Test a value is computed on the first lookup only."""
+        cache = PatternCache()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return self.array(10)
+
+        first = cache.get('key', compute)
+        second = cache.get('key', compute)
+
+        assert first is second
+        assert len(calls) == 1
+        assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+        assert cache.stats.hit_rate() == 0.5
+        assert not first.flags.writeable
+
+    def test_evicts_least_recently_used(self):
+        """Test entries over the size limit are evicted from the least recently used."""
+        cache = PatternCache(max_bytes=3 * (ENTRY_OVERHEAD_BYTES + 100))
+        for key in ['a', 'b', 'c']:
+            cache.put(key, self.array(100))
+        cache.get('a', lambda: self.array(100))
+
+        cache.put('d', self.array(100))
+
+        assert 'b' not in cache
+        assert all(key in cache for key in ['a', 'c', 'd'])
+        assert cache.stats.evictions == 1
+        assert cache.size_bytes == 3 * (ENTRY_OVERHEAD_BYTES + 100)
+
+    def test_views_count_overhead_only(self):
+        """Test views of other arrays are counted without their data."""
+        cache = PatternCache()
+        base = self.array(1000)
+
+        cache.put('view', base[:500])
+
+        assert cache.size_bytes == ENTRY_OVERHEAD_BYTES
+
+    def test_too_large_value_is_not_cached(self):
+        """Test a value larger than the whole cache is returned but not kept."""
+        cache = PatternCache(max_bytes=100)
+
+        value = cache.get('key', lambda: self.array(1000))
+
+        assert value.size == 1000
+        assert len(cache) == 0
+
+    def test_resize_and_clear(self):
+        """Test shrinking the cache evicts entries and clearing keeps the counters."""
+        cache = PatternCache()
+        for key in range(4):
+            cache.get(key, lambda: self.array(100))
+
+        cache.resize(2 * (ENTRY_OVERHEAD_BYTES + 100))
+        assert len(cache) == 2
+        assert cache.stats.evictions == 2
+
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.size_bytes == 0
+        assert cache.stats.misses == 4
+
+    def test_negative_size(self):
+        """Test a negative size limit raises ValueError."""
+        with pytest.raises(ValueError, match="must not be negative"):
+            PatternCache(max_bytes=-1)
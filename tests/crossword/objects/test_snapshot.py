@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+
+from crossword.objects import Crossword, Direction, WordSpace
+from crossword.objects.snapshot import PropagationCache
+from crossword.solver import Solver
+from tests.helpers import square
+
+
+class TestSnapshot:
+    """Test suite for the snapshots of crosswords and the cached propagation states."""
+
+    @pytest.fixture
+    def solved(self, square_words):
+        """Solved 2x2 square crossword."""
+        crossword = square()
+        PropagationCache().build(crossword.word_spaces, square_words)
+        assert Solver().solve(crossword, square_words, randomize=0)
+        return crossword
+
+    def test_restore(self, square_words, solved):
+        """Test a restored snapshot binds the same words, and exports as the solved crossword."""
+        exported = solved.as_json(export_occupied_by=True)
+        snapshot = solved.snapshot(solved.evaluate_score())
+
+        assert solved.snapshot_json(snapshot, square_words) == exported
+        solved.reset()
+        assert not solved.is_success()
+        solved.restore(snapshot, square_words)
+
+        assert solved.is_success()
+        assert solved.as_json(export_occupied_by=True) == exported
+        assert snapshot.score == solved.evaluate_score()
+
+    def test_unbound(self, square_words, solved):
+        """Test the snapshot of an unbound crossword."""
+        solved.reset()
+        snapshot = solved.snapshot()
+
+        assert (snapshot.word_indices == -1).all()
+        assert snapshot.words(solved.word_spaces, square_words) == [None] * 4
+
+    def test_different_word_spaces(self, square_words, solved):
+        """Test a snapshot is not restored to other word spaces."""
+        snapshot = solved.snapshot()
+        other = Crossword(solved.word_spaces[::-1])
+
+        with pytest.raises(ValueError):
+            other.restore(snapshot, square_words)
+
+    def test_cache_hit(self, square_words):
+        """Test the restored possibilities equal the built ones, for any scores of the word list."""
+        cache = PropagationCache()
+        built = square()
+        restored = square()
+
+        assert not cache.build(built.word_spaces, square_words)
+        assert Solver().solve(built, square_words, randomize=0)
+        assert cache.build(restored.word_spaces, square_words.with_scores(pd.Series([3.0], index=[1])))
+
+        fresh = square()
+        for word_space in fresh.word_spaces:
+            word_space.build_possibility_matrix(square_words)
+        for restored_space, fresh_space in zip(restored.word_spaces, fresh.word_spaces):
+            assert restored_space.occupied_by is None
+            assert (restored_space.possibility_matrix == fresh_space.possibility_matrix).all()
+            assert list(restored_space.domain.rows) == list(fresh_space.domain.rows)
+
+    def test_cache_capacity(self, square_words):
+        """Test the least recently used state is evicted."""
+        cache = PropagationCache(capacity=1)
+        grid = square()
+        other = Crossword([WordSpace((0, 0), 2, Direction.HORIZONTAL)])
+
+        assert not cache.build(grid.word_spaces, square_words)
+        assert not cache.build(other.word_spaces, square_words)
+        assert not cache.build(grid.word_spaces, square_words)
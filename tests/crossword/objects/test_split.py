@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from crossword.objects.language import alphabet, split, split_codes
+
+
+class TestSplit:
+    """Test suite for splitting words to alphabet atoms."""
+
+    @pytest.mark.parametrize("word, expected", [
+        ('chata', ['ch', 'a', 't', 'a']),
+        ('hrách', ['h', 'r', 'á', 'ch']),
+        ('cihla', ['c', 'i', 'h', 'l', 'a']),
+        ('', []),
+    ])
+    def test_split_czech(self, word, expected):
+        """Test Czech 'ch' is split as one atom, lone 'c' and 'h' are kept."""
+        assert split(word, 'cs') == expected
+
+    def test_split_unknown_letter(self):
+        """Test an unknown letter is reported with the rest of the word."""
+        with pytest.raises(ValueError, match="Unknown letter encountered in word: ßen"):
+            split('straßen', 'cs')
+
+    def test_split_codes(self):
+        """Test the bulk split matches splitting the words one by one."""
+        words = pd.Series(['chata', 'a', 'hrách', 'cihla'])
+        codes, lengths = split_codes(words, 'cs')
+
+        expected = [split(word, 'cs') for word in words]
+        cs_alphabet = alphabet('cs')
+        assert lengths.tolist() == [len(atoms) for atoms in expected]
+        assert [cs_alphabet[code] for code in codes] == [atom for atoms in expected for atom in atoms]
+
+    def test_split_codes_empty(self):
+        """Test the bulk split of no words."""
+        codes, lengths = split_codes([], 'en')
+
+        assert codes.size == 0
+        assert lengths.size == 0
+        assert codes.dtype == np.int16
+
+    def test_split_codes_unknown_letter(self):
+        """Test the bulk split raises the error of the first bad word."""
+        with pytest.raises(ValueError, match="Unknown letter encountered in word: ßen"):
+            split_codes(['chata', 'straßen', 'x\ny'], 'cs')
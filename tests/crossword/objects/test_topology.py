@@ -0,0 +1,60 @@
+from pathlib import Path
+
+import pytest
+
+from crossword.objects import Crossword, Direction, WordSpace
+from crossword.objects.topology import Topology, grid_links
+
+
+class TestTopology:
+    """Test suite for the grid compiled to arrays."""
+
+    @staticmethod
+    def corner():
+        """Horizontal word space crossed by two vertical ones, the last one not crossed yet."""
+        horizontal = WordSpace((1, 1), 3, Direction.HORIZONTAL)
+        left = WordSpace((1, 1), 3, Direction.VERTICAL)
+        right = WordSpace((3, 1), 2, Direction.VERTICAL)
+        horizontal.add_cross(left)
+        left.add_cross(horizontal)
+        return horizontal, left, right
+
+    def test_links_match_crosses(self):
+        """Test the links of every word space describe its crosses in their order."""
+        crossword = Crossword.from_grid(Path(__file__).parents[3] / 'benchmark' / 'crossword.20b.dat')
+        topology = crossword.topology()
+
+        assert len(topology.cross_coordinates) * 2 == len(topology.slots)
+        for index, word_space in enumerate(crossword.word_spaces):
+            links = word_space.links
+            assert links is not None and links.topology is topology and links.index == index
+            assert len(links.neighbours) == len(word_space.crosses)
+            for slot, cross in enumerate(word_space.crosses):
+                neighbour = links.neighbours[slot]
+                assert neighbour is cross.other(word_space)
+                assert links.coordinates[slot] == cross.coordinates
+                assert links.positions[slot] == cross.cross_index(word_space)
+                assert links.other_positions[slot] == cross.cross_index(neighbour)
+                assert neighbour.crosses.index(cross) == links.other_slots[slot]
+        assert crossword.topology() is topology
+
+    def test_compiled_again_after_add_cross(self):
+        """Test a new cross drops the compiled topology and the next one includes it."""
+        horizontal, left, right = self.corner()
+        assert grid_links(horizontal).neighbours == (left,)
+        topology = horizontal.links.topology
+
+        horizontal.add_cross(right)
+        right.add_cross(horizontal)
+        assert left.links is None
+        links = grid_links(horizontal)
+        assert links.topology is not topology
+        assert links.neighbours == (left, right)
+        assert links.positions == (0, 2)
+        assert grid_links(right).other_slots == (1,)
+
+    def test_compile_fails_on_outside_word_space(self):
+        """Test compiling fails if a word space crosses one out of the topology."""
+        horizontal, _, _ = self.corner()
+        with pytest.raises(ValueError):
+            Topology.compile([horizontal])
@@ -0,0 +1,282 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from crossword.objects import (Crossword, Direction, Mask, Word, WordList,
+                               WordSpace)
+from crossword.objects.pattern_cache import ENTRY_OVERHEAD_BYTES
+from tests.helpers import words_frame
+
+
+class TestWordList:
+    """Test suite for WordList lookups."""
+
+    @pytest.fixture
+    def sample_words_df(self):
+        """Sample DataFrame for WordList creation."""
+        return words_frame(['abc', 'abd', 'bcd', 'cat', 'dog', 'dogs', 'cats'], range(1, 8))
+
+    @pytest.fixture
+    def word_list(self, sample_words_df):
+        """WordList fixture for testing."""
+        return WordList(sample_words_df, language="en")
+
+    @staticmethod
+    def brute_force_indices(words_df, mask, chars):
+        """Indices of words matching the mask, computed the slow way."""
+        matching = []
+        for index, label in enumerate(words_df['word_label_text']):
+            if len(label) != mask.length:
+                continue
+            bound = [char for char, is_bound in zip(label, mask.mask) if is_bound]
+            if bound == list(chars):
+                matching.append(index)
+        return matching
+
+    @pytest.mark.parametrize("mask,chars", [
+        ([False, False, False], []),
+        ([True, False, False], ['a']),
+        ([False, True, False], ['a']),
+        ([True, True, False], ['a', 'b']),
+        ([True, False, True], ['d', 'g']),
+        ([False, False, False, False], []),
+        ([False, False, False, True], ['s']),
+        ([True, False, False], ['z']),
+    ])
+    def test_words_indices(self, word_list, sample_words_df, mask, chars):
+        """Test words_indices matches a brute force search."""
+        result = word_list.words_indices(Mask(mask), Word(chars))
+
+        assert sorted(result.tolist()) == self.brute_force_indices(sample_words_df, Mask(mask), chars)
+
+    def test_words_indices_unknown_length(self, word_list):
+        """Test words_indices for a length without words raises ValueError."""
+        with pytest.raises(ValueError, match="No word suitable"):
+            word_list.words_indices(Mask([False] * 7), Word([]))
+
+    def test_candidate_char_vector(self, word_list):
+        """Test counting of characters on a position of matching words."""
+        a_index = word_list.alphabet.index('a')
+        o_index = word_list.alphabet.index('o')
+        b_index = word_list.alphabet.index('b')
+
+        counts = word_list.candidate_char_vector(Mask([False, False, False]), Word([]), 1)
+
+        assert counts.shape == (len(word_list.alphabet),)
+        assert counts[a_index] == 1
+        assert counts[b_index] == 2
+        assert counts[o_index] == 1
+        assert counts.sum() == 5
+
+    def test_candidate_char_vector_bound(self, word_list):
+        """Test counting characters with some characters bound."""
+        c_index = word_list.alphabet.index('c')
+        d_index = word_list.alphabet.index('d')
+
+        counts = word_list.candidate_char_vector(Mask([True, False, False]), Word(['a']), 2)
+
+        assert counts[c_index] == 1
+        assert counts[d_index] == 1
+        assert counts.sum() == 2
+
+    def test_pair_counts(self, word_list):
+        """Test precomputed counts of single-bound masks match counting of the matching words."""
+        length_index = word_list.length_indexes[4]
+        for bound_index in range(4):
+            for char_code, char in enumerate(word_list.alphabet):
+                mask = Mask([index == bound_index for index in range(4)])
+                word_indices = word_list.words_indices(mask, Word([char]))
+                for char_index in range(4):
+                    expected = np.bincount(word_list.chars_at(word_indices, char_index),
+                                           minlength=len(word_list.alphabet))
+                    assert np.array_equal(length_index.pair_counts[bound_index, char_code, char_index], expected)
+
+    def test_candidate_char_vector_two_bound(self, word_list):
+        """Test masks with more bound characters are counted from the matching words."""
+        t_index = word_list.alphabet.index('t')
+
+        counts = word_list.candidate_char_vector(Mask([True, True, False]), Word(['c', 'a']), 2)
+
+        assert counts[t_index] == 1
+        assert counts.sum() == 1
+
+    @pytest.mark.parametrize("mask, chars", [
+        ([False, False, False, False], []),
+        ([False, True, False, False], ['a']),
+        ([True, False, False, True], ['d', 's']),
+        ([False, False, True, False], ['x']),
+    ])
+    def test_candidate_char_vectors(self, word_list, sample_words_df, mask, chars):
+        """Test the batched counts match counting the matching labels position by position."""
+        counts = word_list.candidate_char_vectors(Mask(mask), Word(chars), (3, 0, 2))
+
+        labels = sample_words_df['word_label_text']
+        matching = [labels[index] for index in self.brute_force_indices(sample_words_df, Mask(mask), chars)]
+        assert counts.shape == (3, len(word_list.alphabet))
+        for row, char_index in enumerate((3, 0, 2)):
+            for char_code, char in enumerate(word_list.alphabet):
+                assert counts[row, char_code] == sum(label[char_index] == char for label in matching)
+
+    def test_pattern_cache(self, word_list):
+        """Test lookups are cached per WordList and warm-up fills the cache."""
+        mask, chars = Mask([True, False, False]), Word(['a'])
+        word_list.warm_up([(mask, chars)])
+
+        word_list.words_indices(mask, Word(['a']))
+
+        assert word_list.pattern_cache.stats.misses == 1
+        assert word_list.pattern_cache.stats.hits == 1
+        other = WordList(words_frame(['abc'], [1]), language="en")
+        assert len(other.pattern_cache) == 0
+
+    def test_pattern_cache_views(self, word_list):
+        """Test words of a pattern without a bound letter are cached as a view of the length index."""
+        word_list.words_indices(Mask([False, False, False]), Word([]))
+
+        assert word_list.pattern_cache.size_bytes == ENTRY_OVERHEAD_BYTES
+
+    def test_length_indexes(self, word_list):
+        """Test per-length character code matrices."""
+        assert sorted(word_list.length_indexes.keys()) == [3, 4]
+        assert word_list.length_indexes[4].word_indices.tolist() == [5, 6]
+
+        dogs = word_list.length_indexes[4].char_matrix[0]
+        assert [word_list.alphabet[code] for code in dogs] == ['d', 'o', 'g', 's']
+
+    def test_lazy_length_indexes(self, word_list):
+        """Test length indexes are built on the first lookup of their length."""
+        assert word_list.length_indexes.loaded() == []
+        assert 4 in word_list.length_indexes
+
+        word_list.words_indices(Mask([False, False, False]), Word([]))
+
+        assert word_list.length_indexes.loaded() == [3]
+        assert word_list.word(5) == Word('dogs')
+        assert word_list.length_indexes.loaded() == [3, 4]
+
+    def test_crossword_preload(self, word_list):
+        """Test a crossword loads exactly the lengths of its word spaces, lengths without words are skipped."""
+        crossword = Crossword([WordSpace((0, 0), 4, Direction.HORIZONTAL), WordSpace((0, 0), 5, Direction.VERTICAL)])
+
+        crossword.preload(word_list)
+
+        assert word_list.length_indexes.loaded() == [4]
+
+    def test_word(self, word_list):
+        """Test a Word object is built from the stored word."""
+        word = word_list.word(3)
+
+        assert word == Word('cat')
+        assert word.index == 3
+        assert word.description == 'Test cat'
+        assert word.word_concept_id == 4
+        assert word.score is None
+        assert word.get_score() == 0.0
+
+    def test_use_score_vector(self, word_list):
+        """Test scores are mapped by the concept id."""
+        score_vector = pd.DataFrame({'score': [0.5, 2.0]}, index=pd.Index([6, 1], name='word_concept_id'))
+        word_list.use_score_vector(score_vector)
+
+        assert word_list.word(5).score == 0.5
+        assert word_list.word(0).score == 2.0
+        assert word_list.word_score(5) == 0.5
+        assert word_list.word_score(3) == 0.0
+
+    @pytest.mark.parametrize("big_id", [7, 7 * 10 ** 9])
+    def test_score_array_shared_concepts(self, big_id):
+        """Test every word of a concept gets the concept score, for compact and sparse concept ids."""
+        words_df = words_frame(['abc', 'abd', 'bcd', 'cat'], [big_id, 3, big_id, 1])
+        word_list = WordList(words_df, language="en")
+
+        scores = word_list.score_array(pd.Series([1.5, -1.0, 4.0], index=[big_id, 1, 99]))
+
+        assert scores.dtype == np.float32
+        assert scores[[0, 2, 3]].tolist() == [1.5, 1.5, -1.0]
+        assert np.isnan(scores[1])
+
+    def test_with_scores(self, word_list):
+        """Test a score overlay leaves the shared WordList unchanged."""
+        overlay = word_list.with_scores(pd.Series([3.0], index=[4]))
+
+        assert overlay.word(3).score == 3.0
+        assert overlay.word_scores(np.array([3, 0])).tolist() == [3.0, 0.0]
+        assert word_list.store.scores is None
+        assert word_list.word(3).score is None
+        assert overlay.length_indexes is word_list.length_indexes
+        assert overlay.pattern_cache is word_list.pattern_cache
+
+    def test_score_order(self, word_list):
+        """Test rows are ordered by descending score, ties in row order, and reordered by new scores."""
+        assert word_list.score_order(3) is None
+        overlay = word_list.with_scores(pd.Series([1.0, 3.0, 3.0, -1.0], index=[1, 2, 4, 5]))
+
+        score_order = overlay.score_order(3)
+        assert score_order.rows.tolist() == [1, 3, 0, 2, 4]
+        assert score_order.ranks.tolist() == [2, 0, 3, 1, 4]
+        assert overlay.score_order(3) is score_order
+
+        overlay.use_score_vector(pd.Series([5.0], index=[5]))
+        assert overlay.score_order(3).rows.tolist() == [4, 0, 1, 2, 3]
+
+    def test_czech_digraph(self):
+        """Test Czech 'ch' is a single character of the word."""
+        words_df = pd.DataFrame([
+            ('chata', 'Chata', 1),
+            ('hrách', 'Hrách', 2),
+        ], columns=['word_label_text', 'word_description_text', 'word_concept_id'])
+        word_list = WordList(words_df, language="cs")
+        ch_index = word_list.alphabet.index('ch')
+
+        assert sorted(word_list.length_indexes.keys()) == [4]
+        assert word_list.length_indexes[4].char_matrix[0][0] == ch_index
+        assert word_list.length_indexes[4].char_matrix[1][3] == ch_index
+        assert np.array_equal(word_list.words_indices(Mask([True, False, False, False]), Word(['ch'])), [0])
+
+    def test_save_and_from_file(self, word_list, sample_words_df, tmp_path):
+        """Test a stored WordList answers lookups like the original."""
+        index_path = tmp_path / "words.idx"
+        word_list.save(index_path)
+
+        loaded = WordList.from_file(index_path)
+
+        assert loaded.alphabet == word_list.alphabet
+        assert hash(loaded) == hash(word_list)
+        for mask, chars in [([False, False, False], []), ([True, False, False], ['a']),
+                            ([False, False, False, True], ['s'])]:
+            assert np.array_equal(loaded.words_indices(Mask(mask), Word(chars)),
+                                  word_list.words_indices(Mask(mask), Word(chars)))
+        assert np.array_equal(loaded.candidate_char_vector(Mask([False, False, False]), Word([]), 1),
+                              word_list.candidate_char_vector(Mask([False, False, False]), Word([]), 1))
+        assert isinstance(loaded.length_indexes[3].char_matrix, np.memmap)
+        for word_len in word_list.length_indexes:
+            for name in ('word_indices', 'char_matrix', 'position_bitmaps', 'position_counts', 'pair_counts'):
+                assert np.array_equal(getattr(loaded.length_indexes[word_len], name),
+                                      getattr(word_list.length_indexes[word_len], name))
+
+        labels = [loaded.store.labels[index] for index in range(len(loaded.store))]
+        assert labels == sample_words_df['word_label_text'].tolist()
+        assert loaded.word(5) == Word('dogs')
+        assert loaded.word(5).description == 'Test dogs'
+
+    def test_empty_label(self, tmp_path):
+        """Test a word without a letter is stored but kept out of the length indexes."""
+        word_list = WordList(words_frame(['ab', '', 'cd']), language="cs")
+        index_path = tmp_path / "words.idx"
+
+        word_list.save(index_path)
+        loaded = WordList.from_file(index_path)
+
+        for stored in (word_list, loaded):
+            assert sorted(stored.length_indexes.keys()) == [2]
+            assert stored.length_indexes[2].word_indices.tolist() == [0, 2]
+            assert stored.store.labels[1] == ''
+            assert stored.word(2) == Word('cd')
+
+    def test_from_file_not_an_index(self, tmp_path):
+        """Test opening another file raises ValueError."""
+        index_path = tmp_path / "words.idx"
+        index_path.write_bytes(b"word_label_text\nabc\n")
+
+        with pytest.raises(ValueError, match="not a WordList index"):
+            WordList.from_file(index_path)
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from crossword.objects import Mask, Word, WordList
+from crossword.objects.word_list_file import read_arrays
+from crossword.objects.word_list_writer import write_word_list
+
+
+class TestWordListWriter:
+    """Test suite for writing WordList index files in chunks."""
+
+    @pytest.fixture
+    def sample_words_df(self):
+        """Words of several lengths, more of them than a chunk."""
+        labels = [f'{prefix}{suffix}' for prefix in ('a', 'bc', 'ch', 'dog') for suffix in ('', 'a', 'ta', 'ech')] * 20
+        return pd.DataFrame({
+            'word_label_text': labels,
+            'word_description_text': [f'Test {label}' for label in labels],
+            'word_concept_id': range(len(labels)),
+        })
+
+    def test_same_as_save(self, sample_words_df, tmp_path):
+        """Test the written index has the arrays of the WordList built from a DataFrame."""
+        WordList(sample_words_df, language="cs").save(tmp_path / "saved.idx")
+        words = sample_words_df.itertuples(index=False, name=None)
+
+        write_word_list(tmp_path / "written.idx", words, language="cs", chunk_size=64)
+
+        _saved_metadata, saved = read_arrays(tmp_path / "saved.idx")
+        _written_metadata, written = read_arrays(tmp_path / "written.idx")
+        assert saved.keys() == written.keys()
+        for name, array in saved.items():
+            assert np.array_equal(array, written[name]), name
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["saved.idx", "written.idx"]
+
+    def test_empty_label(self, tmp_path):
+        """Test a word without a letter is written like WordList.save does."""
+        words_df = pd.DataFrame({
+            'word_label_text': ['ab', '', 'cd'],
+            'word_description_text': ['Test ab', 'Test', 'Test cd'],
+            'word_concept_id': range(3),
+        })
+        WordList(words_df, language="cs").save(tmp_path / "saved.idx")
+
+        write_word_list(tmp_path / "written.idx", words_df.itertuples(index=False, name=None), language="cs")
+
+        _saved_metadata, saved = read_arrays(tmp_path / "saved.idx")
+        _written_metadata, written = read_arrays(tmp_path / "written.idx")
+        for name, array in saved.items():
+            assert np.array_equal(array, written[name]), name
+        assert written['lengths'].tolist() == [2]
+
+    def test_unordered_concepts(self, sample_words_df, tmp_path):
+        """Test words are found by the concept id in any order."""
+        sample_words_df['word_concept_id'] = sample_words_df['word_concept_id'] % 7
+        words = sample_words_df.itertuples(index=False, name=None)
+
+        write_word_list(tmp_path / "written.idx", words, language="cs", chunk_size=64)
+
+        word_list = WordList.from_file(tmp_path / "written.idx")
+        scores = word_list.score_array(pd.Series([1.0], index=[3]))
+        assert np.flatnonzero(scores == 1.0).tolist() == np.flatnonzero(sample_words_df['word_concept_id'] == 3).tolist()
+        assert np.array_equal(word_list.words_indices(Mask([True, False]), Word(['ch'])),
+                              np.flatnonzero(sample_words_df['word_label_text'] == 'cha'))
+
+    def test_chunk_size(self, tmp_path):
+        """Test the chunk size must keep the bitmap words whole."""
+        with pytest.raises(ValueError, match="multiple of 64"):
+            write_word_list(tmp_path / "written.idx", [], language="cs", chunk_size=100)
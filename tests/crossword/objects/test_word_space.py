@@ -5,6 +5,8 @@ import pandas as pd
 import pytest
 
 from crossword.objects import Cross, Direction, Word, WordList, WordSpace
+from crossword.objects.word_space import SCORED_OPTIONS
+from tests.helpers import words_frame
 
 
 class TestWordSpace:
@@ -13,14 +15,7 @@ class TestWordSpace:
     @pytest.fixture
     def sample_words_df(self):
         """Sample DataFrame for WordList creation."""
-        return pd.DataFrame([
-            ('abc', 'Test abc', 1),
-            ('bcd', 'Test bcd', 2),
-            ('def', 'Test def', 3),
-            ('xyz', 'Test xyz', 4),
-            ('cat', 'Test cat', 5),
-            ('dog', 'Test dog', 6),
-        ], columns=['word_label_text', 'word_description_text', 'word_concept_id'])
+        return words_frame(['abc', 'bcd', 'def', 'xyz', 'cat', 'dog'], range(1, 7))
 
     @pytest.fixture
     def word_list(self, sample_words_df):
@@ -56,7 +51,7 @@ class TestWordSpace:
         assert ws.occupied_by is None
         assert ws.possibility_matrix is None
         assert ws.crosses == []
-        assert ws.failed_words_index_list == []
+        assert ws.failed_rows is None
 
     def test_wordspace_initialization_vertical(self):
         """Test WordSpace initialization with vertical direction."""
@@ -95,21 +90,20 @@ class TestWordSpace:
         with pytest.raises(ValueError, match="Unknown WordSpace type"):
             ws.spaces()
 
-    def test_bind_word_success(self, horizontal_word_space):
+    def test_bind_word_success(self, crossed_word_spaces):
         """Test successful word binding."""
+        ws1, ws2 = crossed_word_spaces
         word = Word("abc")
 
-        # Mock a cross for testing affected spaces
-        mock_cross = Mock()
-        mock_cross.bound_value.return_value = None
-        mock_cross.other.return_value = Mock()
-        horizontal_word_space.crosses = [mock_cross]
-
-        affected = horizontal_word_space.bind(word)
+        affected = ws1.bind(word)
 
-        assert horizontal_word_space.occupied_by == word
-        assert len(affected) == 1
-        assert affected[0] == mock_cross.other.return_value
+        assert ws1.occupied_by == word
+        assert affected == [ws2]
+        # Chars of the crosses only
+        assert ws1.pattern.chars == [None, None, 'c']
+        assert ws2.pattern.chars == [None, 'c', None]
+        # The cross is bound already
+        assert ws2.bind(Word("dcx")) == []
 
     def test_bind_word_none_raises_error(self, horizontal_word_space):
         """Test binding None word raises ValueError."""
@@ -123,22 +117,26 @@ class TestWordSpace:
         with pytest.raises(ValueError, match="Length of word does not correspond"):
             horizontal_word_space.bind(word)
 
-    def test_unbind_word(self, horizontal_word_space):
+    def test_unbind_word(self, crossed_word_spaces):
         """Test unbinding word from WordSpace."""
-        word = Word("abc")
-        horizontal_word_space.occupied_by = word
+        ws1, ws2 = crossed_word_spaces
+        ws1.bind(Word("abc"))
 
-        # Mock crosses
-        mock_cross = Mock()
-        mock_cross.bound_value.return_value = None
-        mock_cross.other.return_value = Mock()
-        horizontal_word_space.crosses = [mock_cross]
+        affected = ws1.unbind()
 
-        affected = horizontal_word_space.unbind()
+        assert ws1.occupied_by is None
+        assert affected == [ws1, ws2]
+        assert ws1.pattern.chars == [None, None, None]
+        assert ws2.pattern.chars == [None, None, None]
 
-        assert horizontal_word_space.occupied_by is None
-        assert horizontal_word_space in affected
-        assert mock_cross.other.return_value in affected
+    def test_unbind_word_crossed_by_bound(self, crossed_word_spaces):
+        """Test unbinding keeps the chars of the bound crossing WordSpaces."""
+        ws1, ws2 = crossed_word_spaces
+        ws1.bind(Word("abc"))
+        ws2.bind(Word("dcx"))
+
+        assert ws1.unbind() == [ws1]
+        assert ws1.pattern.chars == [None, None, 'c']
 
     def test_add_cross_success(self, crossed_word_spaces):
         """Test successful cross addition."""
@@ -202,27 +200,27 @@ class TestWordSpace:
         with pytest.raises(ValueError, match="WordSpace .* is not occupied"):
             horizontal_word_space.char_at(1, 2)
 
-    def test_reset_failed_words(self, horizontal_word_space):
-        """Test resetting failed words list."""
-        horizontal_word_space.failed_words_index_list = [1, 2, 3]
+    def test_reset_failed_words(self, horizontal_word_space, word_list):
+        """Test resetting failed words."""
+        for word_index in (1, 2, 3):
+            horizontal_word_space.add_failed_word(word_list, word_list.word(word_index))
 
         horizontal_word_space.reset_failed_words()
 
-        assert horizontal_word_space.failed_words_index_list == []
+        assert horizontal_word_space.failed_rows is None
+        assert horizontal_word_space.failed_word_indices(word_list) == []
 
-    def test_build_possibility_matrix(self, horizontal_word_space, word_list):
+    def test_build_possibility_matrix(self, crossed_word_spaces, word_list):
         """Test building possibility matrix."""
-        # Add mock crosses
-        mock_cross = Mock()
-        mock_cross.bound_value.return_value = None  # Unbound cross
-        horizontal_word_space.crosses = [mock_cross]
+        ws1, _ = crossed_word_spaces
 
-        # Mock _index_of_cross to return an integer
-        with patch.object(horizontal_word_space, '_index_of_cross', return_value=0):
-            horizontal_word_space.build_possibility_matrix(word_list)
+        ws1.build_possibility_matrix(word_list)
 
-        assert horizontal_word_space.possibility_matrix is not None
-        assert horizontal_word_space.possibility_matrix.shape == (1, len(word_list.alphabet))
+        assert ws1.possibility_matrix is not None
+        assert ws1.possibility_matrix.shape == (1, len(word_list.alphabet))
+        # Last chars of the words: abc, bcd, def, xyz, cat, dog
+        assert ws1.possibility_matrix[0, word_list.char_to_index['d']] == 1
+        assert ws1.possibility_matrix[0, word_list.char_to_index['z']] == 1
 
     def test_update_possibilities_without_matrix_raises_error(self, horizontal_word_space, word_list):
         """Test updating possibilities without initialized matrix raises ValueError."""
@@ -231,34 +229,32 @@ class TestWordSpace:
 
     def test_solving_priority_no_unbounded_crosses(self, horizontal_word_space):
         """Test solving priority when no unbounded crosses."""
-        with patch.object(horizontal_word_space, '_get_unbounded_crosses', return_value=[]):
-            priority = horizontal_word_space.solving_priority()
-            assert priority == 0
+        priority = horizontal_word_space.solving_priority()
+        assert priority == 0
 
     def test_solving_priority_with_unbounded_crosses(self, horizontal_word_space):
         """Test solving priority with unbounded crosses."""
-        with patch.object(horizontal_word_space, '_get_unbounded_crosses', return_value=[Mock()]):
-            with patch.object(horizontal_word_space, '_count_candidate_crossings', return_value=[5, 3, 7]):
-                priority = horizontal_word_space.solving_priority()
-                assert priority == 3
+        with patch.object(horizontal_word_space, '_count_candidate_crossings', return_value=[5, 3, 7]):
+            priority = horizontal_word_space.solving_priority()
+            assert priority == 3
 
     def test_find_best_option_no_options(self, horizontal_word_space, word_list):
         """Test finding best option when no options available."""
-        with patch.object(horizontal_word_space, '_find_best_options', return_value=None):
+        with patch.object(horizontal_word_space, '_find_best_options', return_value=np.zeros(0, dtype=np.int32)):
             result = horizontal_word_space.find_best_option(word_list)
             assert result is None
 
     def test_find_best_option_with_randomization(self, horizontal_word_space, word_list):
         """Test finding best option with randomization."""
-        mock_df = pd.DataFrame({
-            'word_split': [Word("abc"), Word("def")],
-            'score': [10, 5]
-        })
+        best_options = np.array([0, 2], dtype=np.int32)
 
-        with patch.object(horizontal_word_space, '_find_best_options', return_value=mock_df):
+        with patch.object(horizontal_word_space, '_find_best_options', return_value=best_options):
             with patch('numpy.random.poisson', return_value=1):
                 result = horizontal_word_space.find_best_option(word_list, randomize=0.5)
                 assert result == Word("def")
+            with patch('numpy.random.poisson', return_value=5):
+                result = horizontal_word_space.find_best_option(word_list, randomize=0.5)
+                assert result == Word("def")
 
     def test_max_possibilities_on_cross(self, horizontal_word_space):
         """Test getting maximum possibilities on cross."""
@@ -332,51 +328,6 @@ class TestWordSpace:
         assert "occupied by" in str_repr
         assert "abc" in str_repr
 
-    def test_mask_current_no_crosses(self, horizontal_word_space):
-        """Test mask creation with no crosses."""
-        mask, chars = horizontal_word_space._mask_current()
-
-        assert mask.mask == [False, False, False]
-        assert len(chars) == 0
-
-    def test_mask_current_with_bound_crosses(self, horizontal_word_space):
-        """Test mask creation with bound crosses."""
-        mock_cross = Mock()
-        mock_cross.bound_value.return_value = 'a'
-        horizontal_word_space.crosses = [mock_cross]
-
-        with patch.object(horizontal_word_space, '_index_of_cross', return_value=1):
-            mask, chars = horizontal_word_space._mask_current()
-
-            assert mask.mask == [False, True, False]
-            assert chars == Word(['a'])
-
-    def test_get_unbounded_crosses(self, horizontal_word_space):
-        """Test getting unbounded crosses."""
-        mock_cross1 = Mock()
-        mock_cross1.bound_value.return_value = None
-        mock_cross2 = Mock()
-        mock_cross2.bound_value.return_value = 'a'
-
-        horizontal_word_space.crosses = [mock_cross1, mock_cross2]
-
-        unbounded = horizontal_word_space._get_unbounded_crosses()
-        assert len(unbounded) == 1
-        assert unbounded[0] == mock_cross1
-
-    def test_get_half_bound_and_unbound_crosses(self, horizontal_word_space):
-        """Test getting half-bound and unbound crosses."""
-        mock_cross1 = Mock()
-        mock_cross1.is_half_bound_or_unbound.return_value = True
-        mock_cross2 = Mock()
-        mock_cross2.is_half_bound_or_unbound.return_value = False
-
-        horizontal_word_space.crosses = [mock_cross1, mock_cross2]
-
-        half_bound = horizontal_word_space._get_half_bound_and_unbound_crosses()
-        assert len(half_bound) == 1
-        assert half_bound[0] == mock_cross1
-
     def test_find_best_options_integration(self, crossed_word_spaces, word_list):
         """Integration test for find_best_options method."""
         ws1, ws2 = crossed_word_spaces
@@ -392,10 +343,51 @@ class TestWordSpace:
         result = ws2._find_best_options(word_list)
 
         # Should find at least one option
-        assert result is not None
         assert len(result) >= 1
-        assert 'score' in result.columns
-        assert 'word_split' in result.columns
+        assert word_list.word(int(result[0])) == Word("bcd")
+
+    def test_find_best_options_top_k(self, word_list):
+        """Test the best options are ordered by the possibilities they leave, ties by word index."""
+        horizontal = WordSpace((0, 0), 3, Direction.HORIZONTAL)
+        verticals = [WordSpace((x, 0), 3, Direction.VERTICAL) for x in range(2)]
+        for vertical in verticals:
+            horizontal.add_cross(vertical)
+            vertical.add_cross(horizontal)
+        for word_space in [horizontal] + verticals:
+            word_space.build_possibility_matrix(word_list)
+        word_indices, scores = horizontal._option_scores(word_list)
+        expected = sorted(zip(word_indices.tolist(), scores.tolist()), key=lambda option: (-option[1], option[0]))
+
+        for count in range(1, len(expected) + 2):
+            assert horizontal._find_best_options(word_list, count).tolist() == \
+                [word_index for word_index, _ in expected[:count]]
+
+    @pytest.mark.parametrize("chunk", [1, 2, 64])
+    def test_find_best_options_scored(self, word_list, monkeypatch, chunk):
+        """Test the best scored options are ordered by the possibilities they leave, ties in score order."""
+        monkeypatch.setattr('crossword.objects.word_space.SCORE_WALK_CHUNK', chunk)
+        scored = word_list.with_scores(pd.Series([1.0, 6.0, 2.0, 5.0, 3.0, 4.0], index=[1, 2, 3, 4, 5, 6]))
+        horizontal = WordSpace((0, 0), 3, Direction.HORIZONTAL)
+        verticals = [WordSpace((x, 0), 3, Direction.VERTICAL) for x in range(2)]
+        for vertical in verticals:
+            horizontal.add_cross(vertical)
+            vertical.add_cross(horizontal)
+        for word_space in [horizontal] + verticals:
+            word_space.build_possibility_matrix(scored)
+        word_indices, support = horizontal._option_scores(scored)
+        by_score = sorted(zip(word_indices.tolist(), support.tolist()),
+                          key=lambda option: -scored.word_score(option[0]))
+        best_scored = by_score[:SCORED_OPTIONS]
+        expected = [word_index for word_index, _ in sorted(best_scored, key=lambda option: -option[1])]
+
+        assert horizontal._find_best_options(scored, 1).tolist() == expected[:1]
+        assert horizontal._find_best_options(scored, SCORED_OPTIONS).tolist() == expected
+
+        # Failed words are skipped, the next best scored ones are taken instead
+        horizontal.add_failed_word(scored, scored.word(expected[0]))
+        best_scored = [option for option in by_score if option[0] != expected[0]][:SCORED_OPTIONS]
+        assert horizontal._find_best_options(scored, SCORED_OPTIONS).tolist() == \
+            [word_index for word_index, _ in sorted(best_scored, key=lambda option: -option[1])]
 
     @pytest.mark.parametrize("direction,expected_spaces", [
         (Direction.HORIZONTAL, [(0, 0), (1, 0), (2, 0)]),
@@ -411,14 +403,36 @@ class TestWordSpace:
         assert hasattr(WordSpace, 'counter')
         assert WordSpace.counter == 1
 
-    def test_failed_words_index_list_operations(self, horizontal_word_space):
-        """Test operations on failed words index list."""
+    def test_failed_words_operations(self, horizontal_word_space, word_list):
+        """Test operations on failed words."""
         # Initially empty
-        assert horizontal_word_space.failed_words_index_list == []
+        assert horizontal_word_space.failed_word_indices(word_list) == []
 
-        # Add some failed indices
-        horizontal_word_space.failed_words_index_list = [1, 3, 5]
+        # Add some failed words, twice
+        for word_index in (5, 1, 3, 1):
+            horizontal_word_space.add_failed_word(word_list, word_list.word(word_index))
+        assert horizontal_word_space.failed_word_indices(word_list) == [1, 3, 5]
 
-        # Reset should clear the list
+        # Reset should clear them
         horizontal_word_space.reset_failed_words()
-        assert horizontal_word_space.failed_words_index_list == []
+        assert horizontal_word_space.failed_word_indices(word_list) == []
+
+    def test_failed_words_excluded(self, crossed_word_spaces, word_list):
+        """Test failed words are not options of the word space anymore."""
+        ws1, ws2 = crossed_word_spaces
+        ws1.build_possibility_matrix(word_list)
+        ws2.build_possibility_matrix(word_list)
+        all_options = ws1._bindable(word_list).tolist()
+
+        best = ws1.find_best_option(word_list)
+        assert best is not None
+        ws1.add_failed_word(word_list, best)
+
+        options = ws1._bindable(word_list).tolist()
+        assert best.index not in options
+        assert options == [word_index for word_index in all_options if word_index != best.index]
+        retry = ws1.find_best_option(word_list)
+        assert retry is None or retry.index != best.index
+
+        ws1.reset_failed_words()
+        assert ws1._bindable(word_list).tolist() == all_options
@@ -0,0 +1,6 @@
+from .test_arc_consistency import TestArcConsistency
+from .test_nogoods import TestNogoods
+from .test_portfolio import TestPortfolio
+from .test_restarts import TestRestarts
+from .test_solver import TestSolver
+from .test_word_space_queue import TestWordSpaceQueue
@@ -0,0 +1,96 @@
+import pandas as pd
+
+from crossword.objects import Direction, Word, WordSpace
+from crossword.objects.length_index import LengthIndex
+from crossword.solver.arc_consistency import ArcConsistency
+from tests.helpers import word_list_of
+
+
+class TestArcConsistency:
+    """Test suite for AC-3 propagation over the crosses."""
+
+    @staticmethod
+    def labels(consistency, word_list, word_space):
+        """Labels of the candidates of the word space."""
+        rows = LengthIndex.bitmap_rows(consistency.rows[consistency.indices[word_space]])
+        word_indices = word_list.length_index(2).word_indices[rows]
+        return sorted(str(word_list.word(int(word_index))) for word_index in word_indices)
+
+    def test_establish(self, square_words, square_crossword):
+        """Test establishing removes the candidates without a support."""
+        consistency = ArcConsistency()
+
+        assert consistency.establish(square_words, square_crossword.word_spaces)
+        top, bottom, left, right = square_crossword.word_spaces
+        # Top and left end with a char some word starts with
+        assert self.labels(consistency, square_words, top) == ['ab', 'ac']
+        assert self.labels(consistency, square_words, left) == ['ab', 'ac']
+        assert self.labels(consistency, square_words, bottom) == ['bd', 'cd', 'ce']
+        assert self.labels(consistency, square_words, right) == ['bd', 'cd', 'ce']
+
+    def test_assign_propagates_beyond_neighbours(self, square_words, square_crossword):
+        """Test an assignment narrows the word spaces it does not cross."""
+        consistency = ArcConsistency()
+        consistency.establish(square_words, square_crossword.word_spaces)
+        top, bottom, left, right = square_crossword.word_spaces
+
+        affected = top.bind(Word('ab'))
+        for word_space in affected:
+            word_space.update_possibilities(square_words)
+
+        assert consistency.assign(top, affected)
+        assert self.labels(consistency, square_words, left) == ['ab', 'ac']
+        assert self.labels(consistency, square_words, right) == ['bd']
+        # Bottom is not crossed by top, it has to end with 'd' as right does
+        assert self.labels(consistency, square_words, bottom) == ['bd', 'cd']
+
+    def test_assign_wipe_out_and_unassign(self, square_words, square_crossword):
+        """Test a wiped out domain fails the assignment and unassign restores the candidates."""
+        consistency = ArcConsistency()
+        consistency.establish(square_words, square_crossword.word_spaces)
+        top, _bottom, left, right = square_crossword.word_spaces
+
+        affected = top.bind(Word('xy'))
+        for word_space in affected:
+            word_space.update_possibilities(square_words)
+
+        # No word starts with 'y'
+        assert not consistency.assign(top, affected)
+
+        consistency.unassign()
+        for word_space in top.unbind():
+            word_space.update_possibilities(square_words)
+        assert self.labels(consistency, square_words, left) == ['ab', 'ac']
+        assert self.labels(consistency, square_words, right) == ['bd', 'cd', 'ce']
+
+    def test_options_among_candidates(self):
+        """Test the options are chosen among the candidates, also when the crosses alone would allow more."""
+        word_list = word_list_of(['abc', 'def', 'pxq', 'ad', 'cf', 'pr', 'qs'])
+        # 3x2 rectangle: top, bottom, left, right
+        word_spaces = [
+            WordSpace((0, 0), 3, Direction.HORIZONTAL),
+            WordSpace((0, 1), 3, Direction.HORIZONTAL),
+            WordSpace((0, 0), 2, Direction.VERTICAL),
+            WordSpace((2, 0), 2, Direction.VERTICAL),
+        ]
+        for horizontal in word_spaces[:2]:
+            for vertical in word_spaces[2:]:
+                horizontal.add_cross(vertical)
+                vertical.add_cross(horizontal)
+        for word_space in word_spaces:
+            word_space.build_possibility_matrix(word_list)
+        top = word_spaces[0]
+        consistency = ArcConsistency()
+        assert consistency.establish(word_list, word_spaces)
+
+        # 'pxq' crosses 'pr' and 'qs', no bottom word goes from 'r' to 's'
+        allowed = consistency.candidates(top)
+        options = {str(word_list.word(int(index))) for index in top._find_best_options(word_list, 8)}
+        allowed_options = {str(word_list.word(int(index))) for index in top._find_best_options(word_list, 8, allowed)}
+        assert options == {'abc', 'pxq'}
+        assert allowed_options == {'abc'}
+        assert str(top.find_best_option(word_list, allowed=allowed)) == 'abc'
+
+        scored = word_list.with_scores(pd.Series([1.0, 9.0], index=[0, 2]))
+        assert str(top.find_best_option(scored)) == 'pxq'
+        assert str(top.find_best_option(scored, allowed=allowed)) == 'abc'
@@ -0,0 +1,79 @@
+from crossword.objects import Word
+from crossword.solver.arc_consistency import ArcConsistency
+from crossword.solver.nogoods import NogoodTable
+from tests.helpers import SQUARE_LABELS, word_list_of
+
+
+class TestNogoods:
+    """Test suite for the nogood table."""
+
+    @staticmethod
+    def bind(word_space, label, word_list):
+        """Bind the word and update the possibilities of the affected word spaces."""
+        affected = word_space.bind(Word(label))
+        for affected_space in affected:
+            affected_space.update_possibilities(word_list)
+        return affected
+
+    def test_learn_wipe_out(self, square_words, square_crossword):
+        """Test a wipe-out is learned from the letters proving it around the word space that was wiped out."""
+        consistency = ArcConsistency()
+        consistency.establish(square_words, square_crossword.word_spaces)
+        nogoods = NogoodTable()
+        nogoods.attach(square_words, square_crossword.word_spaces)
+        top, _bottom, left, _right = square_crossword.word_spaces
+
+        # 'xy' is not arc consistent on the left
+        assert not consistency.assign(top, self.bind(top, 'xy', square_words))
+        assert consistency.wiped_out == left
+        # Left would have to be 'xy' and no word starts with 'y' on the bottom
+        assert nogoods.learn_wipe_out(left, consistency)
+        assert list(nogoods.nogoods) == [frozenset({((0, 0), 'x')})]
+
+    def test_violated(self, square_words, square_crossword):
+        """Test a nogood is violated when all its letters are bound."""
+        nogoods = NogoodTable()
+        nogoods.attach(square_words, square_crossword.word_spaces)
+        top, bottom, left, right = square_crossword.word_spaces
+        nogood = frozenset({((1, 0), 'b'), ((0, 1), 'c')})
+        nogoods.add(nogood)
+
+        self.bind(top, 'ab', square_words)
+        assert nogoods.violated(top) is None
+
+        self.bind(bottom, 'cd', square_words)
+        assert nogoods.violated(bottom) == nogood
+        assert nogoods.binders(nogood) == {top, bottom}
+
+        bottom.unbind()
+        self.bind(left, 'ac', square_words)
+        assert nogoods.violated(left) == nogood
+        assert nogoods.binders(nogood) == {top, left}
+        assert right.occupied_by is None
+
+    def test_capacity(self, square_words, square_crossword):
+        """Test the least recently hit nogood is dropped when the table is full."""
+        nogoods = NogoodTable(capacity=2)
+        nogoods.attach(square_words, square_crossword.word_spaces)
+        first, second, third = (frozenset({((1, 0), char)}) for char in 'abc')
+
+        nogoods.add(first)
+        nogoods.add(second)
+        # A hit makes the first one the most recent
+        assert not nogoods.add(first)
+        nogoods.add(third)
+
+        assert set(nogoods.nogoods) == {first, third}
+        assert nogoods.by_letter[((1, 0), 'b')] == set()
+
+    def test_attach(self, square_words, square_crossword):
+        """Test the nogoods are kept for the same grid and word list only."""
+        nogoods = NogoodTable()
+        nogoods.attach(square_words, square_crossword.word_spaces)
+        nogoods.add(frozenset({((1, 0), 'y')}))
+
+        nogoods.attach(square_words, square_crossword.word_spaces)
+        assert len(nogoods.nogoods) == 1
+
+        nogoods.attach(word_list_of(SQUARE_LABELS), square_crossword.word_spaces)
+        assert len(nogoods.nogoods) == 0
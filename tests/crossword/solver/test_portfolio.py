@@ -0,0 +1,45 @@
+import pytest
+
+from crossword.solver.portfolio import Portfolio, SolverConfig
+from tests.helpers import square, word_list_of
+
+
+class TestPortfolio:
+    """Test suite for the solvers racing in forked processes."""
+
+    def test_solution_bound_to_crossword(self):
+        """Test the solution of a member is bound to the crossword of the caller."""
+        word_list = word_list_of(['ab', 'ac', 'bd', 'cd', 'ce'])
+        crossword = square(word_list)
+        portfolio = Portfolio(Portfolio.diversified(4), processes=2)
+
+        assert portfolio.solve(crossword, word_list) is crossword
+        assert crossword.is_success()
+        assert portfolio.score == crossword.evaluate_score()
+        assert portfolio.finished >= 1
+        assert portfolio.counters['assign'] >= 3
+
+    def test_best_of_all(self):
+        """Test waiting for all the members of an unsolvable crossword."""
+        word_list = word_list_of(['ab', 'cd', 'ef'])
+        crossword = square(word_list)
+        configs = [SolverConfig(seed=seed, budget=3, unit=1) for seed in range(3)]
+        portfolio = Portfolio(configs, processes=2)
+
+        assert portfolio.solve(crossword, word_list, timeout=60, first_success=False) is None
+        assert portfolio.score is None
+        assert portfolio.finished == 3
+        assert portfolio.counters['restart'] == 3 * 3
+
+    def test_diversified_budget(self):
+        """Test the members share the failed-word budget."""
+        configs = Portfolio.diversified(4, budget=10)
+
+        assert [config.budget for config in configs] == [3, 3, 2, 2]
+        assert [config.arc_consistency for config in configs] == [False, True, False, True]
+        assert len({config.seed for config in configs}) == 4
+
+    def test_no_configs(self):
+        """Test a portfolio without members."""
+        with pytest.raises(ValueError):
+            Portfolio([])
@@ -0,0 +1,68 @@
+import time
+from itertools import islice
+
+import pytest
+
+from crossword.solver import Solver
+from crossword.solver.restarts import RestartStrategy, luby, restart_cutoffs
+from crossword.solver.result import SolveLimits
+from tests.helpers import square, word_list_of
+
+
+class TestRestarts:
+    """Test suite for the restart schedules and the restarted solves."""
+
+    def test_luby(self):
+        """Test the Luby sequence."""
+        assert [luby(index) for index in range(1, 16)] == [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
+        with pytest.raises(ValueError):
+            luby(0)
+
+    def test_cutoffs(self):
+        """Test the cutoffs are scaled by the unit."""
+        assert list(islice(restart_cutoffs(RestartStrategy.LUBY, 10), 7)) == [10, 10, 20, 10, 10, 20, 40]
+        assert list(islice(restart_cutoffs(RestartStrategy.GEOMETRIC, 10, 2.0), 4)) == [10, 20, 40, 80]
+        with pytest.raises(ValueError):
+            next(restart_cutoffs(RestartStrategy.GEOMETRIC, 10, 0.5))
+        with pytest.raises(ValueError):
+            next(restart_cutoffs(RestartStrategy.LUBY, 0))
+
+    def test_solve_restores_initial_possibilities(self, square_words, square_crossword):
+        """Test a solve after another one starts from the built possibilities."""
+        built = [word_space.possibility_matrix.copy() for word_space in square_crossword.word_spaces]
+        solver = Solver()
+
+        assert solver.solve(square_crossword, square_words, randomize=0)
+        solver._initialize_solve(square_crossword, square_words, SolveLimits(10), 0)
+
+        assert solver.limits.exceeded(11) is not None
+        for word_space, matrix in zip(square_crossword.word_spaces, built):
+            assert (word_space.possibility_matrix == matrix).all()
+
+    def test_solve_with_restarts(self, square_words, square_crossword):
+        """Test the solves stop after the requested solutions and their counters are summed."""
+        solver = Solver()
+
+        best = solver.solve_with_restarts(square_crossword, square_words, budget=100, max_solutions=3, unit=1)
+
+        assert best is square_crossword and best.is_success()
+        assert solver.score == best.evaluate_score()
+        assert solver.counters['restart'] == 3
+        assert solver.counters['assign'] >= 3 * 3
+
+    def test_budget(self):
+        """Test the solves stop when the failed words exceed the budget."""
+        word_list = word_list_of(['ab', 'cd', 'ef'])
+        solver = Solver()
+
+        assert solver.solve_with_restarts(square(word_list), word_list, budget=5, unit=2) is None
+        assert solver.score is None and solver.solution is None
+        # The initial word leaves no options, every solve takes a share of one
+        assert solver.counters['restart'] == 5
+
+    def test_deadline(self, square_words, square_crossword):
+        """Test the restarts stop at the deadline."""
+        solver = Solver()
+
+        assert solver.solve_with_restarts(square_crossword, square_words, budget=100, deadline=time.monotonic()) is None
+        assert solver.counters['restart'] == 1
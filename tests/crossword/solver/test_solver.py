@@ -0,0 +1,195 @@
+import threading
+import time
+
+import pytest
+
+from crossword.objects import Crossword, Direction, WordSpace
+from crossword.solver import Solver
+from crossword.solver.result import StopReason
+from crossword.solver.word_space_queue import WordSpaceQueue
+from tests.helpers import word_list_of
+
+
+class TestSolver:
+    """Test suite for the Solver backtracking."""
+
+    LABELS = ['abc', 'acd', 'dog', 'cat']
+
+    @pytest.fixture
+    def word_list(self):
+        """Sample three letter words."""
+        return word_list_of(self.LABELS)
+
+    @pytest.fixture
+    def grid(self, word_list):
+        """Horizontal word space crossed by a vertical one, and a word space crossing neither."""
+        horizontal = WordSpace((0, 0), 3, Direction.HORIZONTAL)
+        vertical = WordSpace((0, 0), 3, Direction.VERTICAL)
+        separate = WordSpace((5, 5), 3, Direction.HORIZONTAL)
+        horizontal.add_cross(vertical)
+        vertical.add_cross(horizontal)
+        for word_space in (horizontal, vertical, separate):
+            word_space.build_possibility_matrix(word_list)
+        return horizontal, vertical, separate
+
+    def test_backjump_to_culprit(self, word_list, grid):
+        """Test a dead end jumps over the assignments that do not constrain the failed word space."""
+        horizontal, vertical, separate = grid
+        solver = Solver(backjumping=True)
+        assigned_stack = []
+        for word_space, label in ((vertical, 'cat'), (separate, 'dog')):
+            word = word_list.word(self.LABELS.index(label))
+            word_space.bind(word)
+            assigned_stack.append((word_space, word))
+        word_spaces = WordSpaceQueue([horizontal])
+        # 'cat' is the only word starting with 'c'
+        horizontal.add_failed_word(word_list, word_list.word(self.LABELS.index('cat')))
+
+        conflict_set = solver._conflict_set(horizontal, word_list, assigned_stack)
+        assert conflict_set == {vertical}
+
+        retry = solver._backtrack(assigned_stack, word_spaces, word_list, conflict_set)
+
+        assert retry == vertical
+        assert assigned_stack == []
+        assert vertical.occupied_by is None and separate.occupied_by is None
+        assert vertical.failed_word_indices(word_list) == [self.LABELS.index('cat')]
+        # The jumped over word is not to blame
+        assert separate.failed_rows is None
+        assert set(word_spaces) == {horizontal, vertical, separate}
+        assert solver.counters['backjump'] == 1
+        assert solver.counters['failed'] == 1
+
+    def test_backtrack_chronologically(self, word_list, grid):
+        """Test a dead end undoes the last assignment by default, whatever the conflict set."""
+        horizontal, vertical, separate = grid
+        solver = Solver()
+        assigned_stack = []
+        for word_space, label in ((vertical, 'cat'), (separate, 'dog')):
+            word = word_list.word(self.LABELS.index(label))
+            word_space.bind(word)
+            assigned_stack.append((word_space, word))
+
+        retry = solver._backtrack(assigned_stack, WordSpaceQueue([horizontal]), word_list, {vertical})
+
+        assert retry == separate
+        assert assigned_stack == [(vertical, word_list.word(self.LABELS.index('cat')))]
+        assert separate.failed_word_indices(word_list) == [self.LABELS.index('dog')]
+        assert solver.counters['backjump'] == 0
+
+    def test_conflicts_merge_into_culprit(self, word_list, grid):
+        """Test the culprit takes over the rest of the conflict set."""
+        horizontal, vertical, separate = grid
+        solver = Solver(backjumping=True)
+        assigned_stack = []
+        for word_space, label in ((separate, 'dog'), (vertical, 'abc')):
+            word = word_list.word(self.LABELS.index(label))
+            word_space.bind(word)
+            assigned_stack.append((word_space, word))
+
+        retry = solver._backtrack(assigned_stack, WordSpaceQueue([horizontal]), word_list, {separate, vertical})
+
+        assert retry == vertical
+        assert assigned_stack == [(separate, word_list.word(self.LABELS.index('dog')))]
+        assert solver.conflicts[vertical] == {separate}
+        assert solver._conflict_set(vertical, word_list, assigned_stack) == {separate}
+
+    # Fill the ladder with 'abc', 'ag', 'dog', 'cd' and 'dog', no two letter word ends with 'c'
+    LADDER_LABELS = ['abc', 'cat', 'dog', 'ag', 'cd']
+
+    @pytest.fixture
+    def ladder_words(self):
+        """Sample words of the ladder."""
+        return word_list_of(self.LADDER_LABELS)
+
+    @pytest.fixture
+    def ladder(self, ladder_words):
+        """
+        Horizontal word space whose ends are crossed by two short verticals,
+        the bottoms of which are crossed by a horizontal each, on the left and on the right.
+        """
+        top = WordSpace((2, 0), 3, Direction.HORIZONTAL)
+        left = WordSpace((2, 0), 2, Direction.VERTICAL)
+        right = WordSpace((4, 0), 2, Direction.VERTICAL)
+        bottom_left = WordSpace((0, 1), 3, Direction.HORIZONTAL)
+        bottom_right = WordSpace((4, 1), 3, Direction.HORIZONTAL)
+        for horizontal, vertical in ((top, left), (top, right), (bottom_left, left), (bottom_right, right)):
+            horizontal.add_cross(vertical)
+            vertical.add_cross(horizontal)
+        word_spaces = [top, left, right, bottom_left, bottom_right]
+        for word_space in word_spaces:
+            word_space.build_possibility_matrix(ladder_words)
+        return word_spaces
+
+    def ladder_word(self, label, word_list):
+        """Word of the ladder words."""
+        return word_list.word(self.LADDER_LABELS.index(label))
+
+    def test_conflict_set_of_wiping_neighbours(self, ladder_words, ladder):
+        """Test a dead end blames the binders of the neighbours whose possibilities removed its words only."""
+        top, left, _right, bottom_left, bottom_right = ladder
+        solver = Solver()
+        assigned_stack = []
+        for word_space, label in ((bottom_right, 'dog'), (bottom_left, 'abc')):
+            word = self.ladder_word(label, ladder_words)
+            for affected_space in word_space.bind(word):
+                affected_space.update_possibilities(ladder_words)
+            assigned_stack.append((word_space, word))
+
+        # Nothing is left to the left end of the top
+        assert solver._wiping_neighbours(top, ladder_words) == [left]
+        assert solver._conflict_set(top, ladder_words, assigned_stack) == {bottom_left}
+
+        # Words left to the top would have been removed otherwise, e.g. by arc consistency
+        for affected_space in bottom_left.unbind():
+            affected_space.update_possibilities(ladder_words)
+        assert solver._wiping_neighbours(top, ladder_words) is None
+        assert solver._conflict_set(top, ladder_words, assigned_stack) == {bottom_left, bottom_right}
+
+    def test_conflict_set_of_wipe_out(self, ladder_words, ladder):
+        """Test an arc consistency wipe-out blames the binders of the region proving it only."""
+        _top, left, _right, bottom_left, bottom_right = ladder
+        solver = Solver(arc_consistency=True, backjumping=True)
+        solver.nogoods.attach(ladder_words, ladder)
+        assert solver.consistency.establish(ladder_words, ladder)
+        assigned_stack = []
+        word_spaces = WordSpaceQueue(ladder)
+
+        conflict_sets = [solver._assign_word(word_space, self.ladder_word(label, ladder_words), assigned_stack,
+                                             word_spaces, ladder_words, len(ladder))
+                         for word_space, label in ((bottom_right, 'dog'), (bottom_left, 'abc'))]
+
+        assert solver.consistency.wiped_out == left
+        assert conflict_sets == [None, {bottom_left}]
+
+    def test_solved_result(self, word_list, grid):
+        """Test the result of a solved crossword holds its fill."""
+        crossword = Crossword(list(grid))
+        solver = Solver()
+
+        result = solver.solve(crossword, word_list, randomize=0)
+
+        assert result and result.reason == StopReason.SOLVED
+        assert result.fill == {word_space: word_space.occupied_by for word_space in grid}
+        assert result.partial_fill == result.fill
+        assert result.score == solver.score
+        assert result.counters['assign'] == 2
+
+    @pytest.mark.parametrize("reason", [StopReason.DEADLINE, StopReason.CANCELLED])
+    def test_stopped_result(self, word_list, grid, reason):
+        """Test a passed deadline or a set cancellation stops the solve after the initial word."""
+        crossword = Crossword(list(grid))
+        solver = Solver()
+        cancel = threading.Event()
+        cancel.set()
+
+        if reason == StopReason.DEADLINE:
+            result = solver.solve(crossword, word_list, randomize=0, deadline=time.monotonic())
+        else:
+            result = solver.solve(crossword, word_list, randomize=0, cancel=cancel)
+
+        assert not result and result.reason == reason
+        assert result.fill is None and result.score is None
+        # The initial word is bound before the first step
+        assert result.partial_fill == {grid[0]: grid[0].occupied_by}
+        assert result.counters['assign'] == 0
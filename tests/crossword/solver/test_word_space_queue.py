@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from crossword.objects import Direction, Word, WordSpace
+from crossword.solver.word_space_queue import WordSpaceQueue
+from tests.helpers import word_list_of
+
+
+class TestWordSpaceQueue:
+    """Test suite for the priority queue of open word spaces."""
+
+    LABELS = ['abc', 'abd', 'bad', 'bcd', 'cab', 'cad', 'dab', 'dad', 'ace', 'bee', 'dec', 'cee', 'eba', 'ebb']
+
+    @pytest.fixture
+    def word_list(self):
+        """Sample three letter words."""
+        return word_list_of(self.LABELS)
+
+    @pytest.fixture
+    def grid(self, word_list):
+        """3x3 square of word spaces, every horizontal crossing every vertical."""
+        horizontals = [WordSpace((0, y), 3, Direction.HORIZONTAL) for y in range(3)]
+        verticals = [WordSpace((x, 0), 3, Direction.VERTICAL) for x in range(3)]
+        for horizontal in horizontals:
+            for vertical in verticals:
+                horizontal.add_cross(vertical)
+                vertical.add_cross(horizontal)
+        for word_space in horizontals + verticals:
+            word_space.build_possibility_matrix(word_list)
+        return horizontals + verticals
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_order_follows_binds(self, word_list, grid, seed):
+        """Test the re-keyed queue orders the open word spaces as sorting them by priority does."""
+        queue = WordSpaceQueue(grid)
+        rng = random.Random(seed)
+
+        for _ in range(30):
+            word_space = rng.choice(grid)
+            if word_space.occupied_by is None:
+                affected_spaces = word_space.bind(Word(rng.choice(self.LABELS)))
+                queue.remove(word_space)
+            else:
+                affected_spaces = word_space.unbind()
+                queue.append(word_space)
+            for affected_space in affected_spaces:
+                affected_space.update_possibilities(word_list)
+            queue.touch(affected_spaces)
+
+            open_spaces = [word_space for word_space in grid if word_space.occupied_by is None]
+            assert set(queue) == set(open_spaces)
+            priorities = [word_space.solving_priority() for word_space in queue.smallest(len(grid))]
+            assert priorities == sorted(word_space.solving_priority() for word_space in open_spaces)
+
+    def test_remove_closed(self, grid):
+        """Test removing a word space that is not open."""
+        queue = WordSpaceQueue(grid[1:])
+
+        with pytest.raises(ValueError):
+            queue.remove(grid[0])
+        assert len(queue) == len(grid) - 1
+        assert queue.smallest(0) == []
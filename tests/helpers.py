@@ -0,0 +1,54 @@
+"""
+Word lists and grids shared by the test suites.
+"""
+from typing import Iterable, Optional
+
+import pandas as pd
+
+from crossword.objects import (Crossword, Direction, Mask, Word, WordList,
+                               WordSpace)
+
+# Two letter words filling a 2x2 square in several ways, 'xy' fits nowhere and no word starts with 'y'
+SQUARE_LABELS = ['ab', 'ac', 'bd', 'cd', 'ce', 'xy']
+
+
+def words_frame(labels: Iterable[str], concept_ids: Optional[Iterable[int]] = None) -> pd.DataFrame:
+    """Words DataFrame of the labels, described as 'Test <label>', concept ids counted from 0 unless given."""
+    labels = list(labels)
+    concept_ids = range(len(labels)) if concept_ids is None else concept_ids
+    return pd.DataFrame([(label, f'Test {label}', concept_id) for label, concept_id in zip(labels, concept_ids)],
+                        columns=['word_label_text', 'word_description_text', 'word_concept_id'])
+
+
+def word_list_of(labels: Iterable[str], language: str = "en") -> WordList:
+    """WordList of the labels, see words_frame."""
+    return WordList(words_frame(labels), language=language)
+
+
+def square(word_list: Optional[WordList] = None) -> Crossword:
+    """
+    2x2 square crossword, its word spaces being top, bottom, left and right.
+    Possibility matrices are built if a word list is given.
+    """
+    word_spaces = [
+        WordSpace((0, 0), 2, Direction.HORIZONTAL),
+        WordSpace((0, 1), 2, Direction.HORIZONTAL),
+        WordSpace((0, 0), 2, Direction.VERTICAL),
+        WordSpace((1, 0), 2, Direction.VERTICAL),
+    ]
+    for horizontal in word_spaces[:2]:
+        for vertical in word_spaces[2:]:
+            horizontal.add_cross(vertical)
+            vertical.add_cross(horizontal)
+    if word_list is not None:
+        for word_space in word_spaces:
+            word_space.build_possibility_matrix(word_list)
+    return Crossword(word_spaces)
+
+
+def cross_pattern(word_space: WordSpace) -> tuple[Mask, Word]:
+    """Mask and chars of the word space read from the bound values of its crosses."""
+    chars = [None] * word_space.length
+    for cross in word_space.crosses:
+        chars[cross.cross_index(word_space)] = cross.bound_value()
+    return Mask([char is not None for char in chars]), Word([char for char in chars if char is not None])